@@ -1,8 +1,111 @@
+import atexit
+import os
+
 import streamlit as st
 from components.sidebar import render_sidebar
 from components.results import render_results
-from components.plots import render_magnetization_curve, render_capability_curve
-from models.system import GeneratorSystem
+from components.plots import render_magnetization_curve, render_capability_curve, render_transient
+from models.cache import SolveCache
+from models.surrogate import build_surrogate, find_surrogate, surrogate_path
+from models.transient import Event, SwingSimulator
+from solvers.method_selector import MethodSelector, set_method_selector
+
+# Superficies de respuesta precalculadas (una por pareja de máquinas)
+SURROGATE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "surrogates")
+
+# Estadísticas del selector de métodos (compartidas con cli.py)
+SOLVER_STATS = os.path.join(os.path.dirname(os.path.abspath(__file__)), "solver_stats.json")
+
+# Intervalo mínimo entre escrituras de las estadísticas (s)
+SOLVER_STATS_INTERVAL = 60.0
+
+@st.cache_resource
+def get_solve_cache():
+    """Caché de soluciones compartida entre las re-ejecuciones de Streamlit"""
+    return SolveCache(maxsize=32)
+
+@st.cache_resource
+def install_method_selector():
+    """
+    Instala el selector de métodos global con las estadísticas guardadas
+    (una vez por servidor); lo pendiente se guarda al terminar el proceso
+    """
+    selector = MethodSelector(SOLVER_STATS)
+    set_method_selector(selector)
+    atexit.register(selector.save_pending)
+    return selector
+
+def solve(params):
+    """
+    Resuelve con la caché de soluciones; lo aprendido por el selector se
+    guarda como máximo cada SOLVER_STATS_INTERVAL segundos (los aciertos
+    de la caché no cambian las estadísticas y no escriben nada)
+    """
+    selector = install_method_selector()
+    system, results = get_solve_cache().solve(params)
+    selector.save_pending(SOLVER_STATS_INTERVAL)
+    return system, results
+
+@st.cache_resource
+def get_surrogate(key, _params):
+    """Superficie de respuesta de las máquinas (None si no se ha construido)"""
+    return find_surrogate(SURROGATE_DIR, _params)
+
+def render_preview(params):
+    """
+    Vista previa instantánea del punto de operación con la superficie de
+    respuesta precalculada; "Calcular" sigue resolviendo el sistema exacto
+    """
+    surrogate = get_surrogate(surrogate_path(SURROGATE_DIR, params), params)
+    if surrogate is None:
+        if st.button("Precalcular vista previa para estas máquinas"):
+            with st.spinner("Construyendo superficie de respuesta..."):
+                os.makedirs(SURROGATE_DIR, exist_ok=True)
+                build_surrogate(params, surrogate_path(SURROGATE_DIR, params))
+                get_surrogate.clear()
+            st.rerun()
+        return
+
+    preview = surrogate.evaluate(params)
+    if preview is None:
+        st.caption("Vista previa: el punto está fuera del rango precalculado")
+        return
+
+    st.subheader("Vista previa (aproximada)")
+    columns = st.columns(3)
+    for k, column in enumerate(columns[:2], start=1):
+        with column:
+            for name, label, unit in (("p", "P", "W"), ("q", "Q", "VAr")):
+                value, error = preview[f"g{k}_{name}"]
+                st.metric(f"{label} G{k}", f"{value:.0f} {unit}", f"± {error:.0f} {unit}", delta_color="off")
+    with columns[2]:
+        value, error = preview["vt"]
+        st.metric("|VT|", f"{value:.2f} V", f"± {error:.2g} V", delta_color="off")
+
+def render_transient_panel(params):
+    """Simulación de un escalón de carga o de una falla en el bus"""
+    with st.expander("⚡ Simulación transitoria"):
+        event = st.radio("Evento", ["Escalón de carga", "Falla en el bus"], horizontal=True)
+        col1, col2 = st.columns(2)
+        with col1:
+            t_end = st.number_input("Tiempo simulado (s)", value=2.0, min_value=0.1, key="t_end")
+        if event == "Escalón de carga":
+            with col2:
+                factor = st.number_input("Nueva carga (% de la admitancia actual)", value=150.0,
+                                         min_value=1.0, key="load_step")
+            events = [Event(0.1, r_load=params["load"]["r_load"] * 100 / factor,
+                            x_load=params["load"]["x_load"] * 100 / factor)]
+        else:
+            with col2:
+                clearing = st.number_input("Tiempo de despeje (s)", value=0.15, min_value=0.1, key="t_clear")
+            events = [Event(0.1, y_fault=1e4), Event(clearing, y_fault=0.0)]
+
+        if st.button("Simular"):
+            with st.spinner("Simulando..."):
+                system, _ = solve(params)
+                simulator = SwingSimulator(system.generators, system.load)
+                result = simulator.simulate(t_end, events, method="adaptive")
+            render_transient(result, simulator.omega_s)
 
 def main():
     st.set_page_config(
@@ -46,14 +149,16 @@ def main():
     
     # Cargar parámetros desde la barra lateral
     params = render_sidebar()
+
+    render_preview(params)
     
-    # Inicializar el sistema con los parámetros
-    system = GeneratorSystem(params)
+    render_transient_panel(params)
     
     # Resolver el sistema cuando se presione el botón
+    # (si los parámetros no cambiaron se reutiliza la solución en caché)
     if st.button("Calcular"):
         with st.spinner("Calculando..."):
-            results = system.solve()
+            system, results = solve(params)
             
             # Mostrar resultados
             render_results(results)
@@ -0,0 +1,81 @@
+"""
+Curva de capacidad: construcción, reutilización y consultas por lotes.
+
+Mide el tiempo de calcular los límites y el contorno de la región
+admisible (la primera vez y desde la caché del generador) y el número
+de puntos P-Q por segundo que clasifica contains().
+
+Antes comprueba que la curva y el solver usan la misma convención: la
+meta de potencia por defecto (0.9 p_motor / 3 por fase) no supera el
+límite del motor primario, el punto resuelto con los valores por
+defecto cumple todos los límites (potencia en terminales) y uno
+sobreexcitado (IF por encima de la curva medida) viola el de campo.
+Termina con código 1 si no es así.
+
+Uso: python benchmarks/bench_capability.py [puntos]
+"""
+import sys
+import time
+
+import numpy as np
+
+from common import DEFAULT_GENERATOR_PARAMS, default_params, timeit
+from models.generator import SynchronousGenerator
+from models.system import GeneratorSystem
+
+def build(generator):
+    generator._capability = None
+    curve = generator.get_capability_curve()
+    curve.armature(), curve.field(), curve.stability(), curve.prime_mover(), curve.envelope()
+
+def solved_margins(if_op):
+    """Márgenes de G1 en el punto que entrega solve() con IF = if_op"""
+    params = default_params()
+    params["generator1"]["if_op"] = if_op
+    system = GeneratorSystem(params)
+    return system.check_feasibility(system.solve())["g1"]["margins"]
+
+def check_convention():
+    """Lista de fallas de la comparación entre la curva y solve()"""
+    failures = []
+    generator = SynchronousGenerator(default_params()["generator1"])
+    p_max = generator.get_capability_curve().p_max
+    print(f"meta de P: {generator.power_target:.0f} W/fase, motor primario: {p_max:.0f} W/fase")
+    if generator.power_target > p_max:
+        failures.append("la meta de potencia por defecto supera el límite del motor primario")
+    margins = solved_margins(DEFAULT_GENERATOR_PARAMS["if_op"])
+    print("punto por defecto: " + ", ".join(f"{k} {float(v):.0f}" for k, v in margins.items()))
+    failures += [f"el punto por defecto viola {name}" for name, v in margins.items() if v < 0]
+
+    if_op = 1.2 * max(DEFAULT_GENERATOR_PARAMS["if_values"])
+    margins = solved_margins(if_op)
+    print(f"IF = {if_op:.1f} A:        " + ", ".join(f"{k} {float(v):.0f}" for k, v in margins.items()))
+    if margins["field"] >= 0:
+        failures.append(f"el punto con IF = {if_op:.1f} A no viola el límite de campo")
+    return failures
+
+def main():
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 10000000
+    failures = check_convention()
+    for failure in failures:
+        print(f"FALLA {failure}")
+    generator = SynchronousGenerator(default_params()["generator1"])
+
+    print(f"curvas y contorno: {timeit(lambda: build(generator), 200) * 1e6:.0f} µs")
+    print(f"desde la caché:    {timeit(generator.get_capability_curve, 10000) * 1e6:.2f} µs")
+
+    curve = generator.get_capability_curve()
+    rng = np.random.default_rng(0)
+    p = rng.uniform(-1.5, 1.5, n) * generator.s_nom / 3
+    q = rng.uniform(-1.5, 1.5, n) * generator.s_nom / 3
+    out = np.empty(n, dtype=bool)
+    curve.contains(p[:1000], q[:1000])
+    start = time.perf_counter()
+    curve.contains(p, q, out=out)
+    elapsed = time.perf_counter() - start
+    print(f"contains: {n} puntos en {elapsed:.3f} s ({n / elapsed / 1e6:.1f} M puntos/s), "
+          f"{out.mean():.1%} dentro")
+    return 1 if failures else 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,84 @@
+"""
+Despacho económico para muchos niveles de carga.
+
+Resuelve el reparto de mínimo costo entre los dos generadores para una
+serie de niveles de carga, con y sin arranque desde la solución
+anterior, y verifica que resolver el sistema con el despacho aplicado
+reproduce la tensión del bus.
+
+Antes comprueba que todo despacho que converge, incluidos los que
+quedan en el límite de armadura, de campo o del motor primario, cumple
+la curva de capacidad según check_feasibility. Termina con código 1 si
+alguno no la cumple.
+
+Uso: python benchmarks/bench_dispatch.py [niveles]
+"""
+import sys
+import time
+
+import numpy as np
+
+from common import default_params
+from models.capability import check_feasibility
+from models.dispatch import EconomicDispatch
+from models.system import GeneratorSystem
+
+# Costo (c0 + c1 P + c2 P²) de cada generador, P mecánica en W
+COSTS = [[10.0, 0.020, 2e-6], [5.0, 0.022, 1e-6]]
+
+def check_feasible(system):
+    """Lista de fallas de los despachos convergidos que violan la curva de capacidad"""
+    failures = []
+    y_load = system.load.calculate_admittance()
+    solved = 0
+    # Cargas inductivas y capacitivas hasta más allá de la capacidad, con
+    # la corriente de campo máxima medida y con una que limita la EA
+    for if_max in (None, 2.55):
+        options = {} if if_max is None else {"if_max": if_max}
+        dispatch = EconomicDispatch(system.generators, system.load, COSTS, **options)
+        for reactive in (0.5, 0.0, -0.8, -1.5):
+            for scale in np.linspace(0.2, 11.0, 25):
+                results = dispatch.solve(y_load * scale * complex(1.0, reactive))
+                if not results["success"]:
+                    continue
+                solved += 1
+                report = check_feasibility(system.generators, results, **options)
+                if not report["feasible"]:
+                    violated = sorted({name for k in range(1, len(system.generators) + 1)
+                                       for name, v in report[f"g{k}"]["violations"].items() if v})
+                    failures.append(f"despacho con carga x{scale * complex(1.0, reactive):.2f} "
+                                    f"(IF máx {if_max}) viola {', '.join(violated)}")
+    print(f"factibilidad: {solved - len(failures)}/{solved} despachos convergidos dentro de la curva")
+    return failures
+
+def main():
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 500
+    system = GeneratorSystem(default_params())
+    failures = check_feasible(system)
+    for failure in failures:
+        print(f"FALLA {failure}")
+    dispatch = EconomicDispatch(system.generators, system.load, COSTS)
+    scales = np.linspace(0.5, 8.0, n)
+
+    for warm_start in (False, True):
+        dispatch.solve()
+        start = time.perf_counter()
+        results = dispatch.sweep(scales, warm_start=warm_start)
+        elapsed = time.perf_counter() - start
+        label = "con arranque previo" if warm_start else "sin arranque previo"
+        print(f"{label}: {n / elapsed:7.0f} niveles/s, "
+              f"{np.mean([r['nit'] for r in results]):.1f} iteraciones, "
+              f"{sum(r['success'] for r in results)}/{n} resueltos")
+
+    # Verificación con el solucionador del sistema
+    results = dispatch.solve()
+    dispatch.apply(results)
+    exact = system.solve()
+    print(f"VT despacho: {abs(results['vt']):.3f} V, VT resuelto: {abs(exact['vt']):.3f} V")
+    for k in (1, 2):
+        print(f"G{k}: P {results[f'g{k}_p']:8.1f} W (resuelto {exact[f'g{k}_p']:8.1f} W), "
+              f"IF {results[f'g{k}_if']:.3f} A")
+    return 1 if failures else 0
+
+if __name__ == "__main__":
+    sys.exit(main())
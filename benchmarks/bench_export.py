@@ -0,0 +1,57 @@
+"""
+Exportación por bloques de resultados de barridos.
+
+Escribe 1e5 y 1e6 puntos (el mismo lote de 1e5 puntos repetido) en
+Parquet y Arrow IPC, y 1e4 y 1e5 en CSV, y mide el tiempo y la memoria
+máxima asignada durante la escritura, que no debe crecer con el número
+de puntos. tracemalloc hace mucho más lenta la escritura de CSV, que
+formatea cada valor en Python.
+
+Uso: python benchmarks/bench_export.py
+"""
+import os
+import tempfile
+import time
+import tracemalloc
+
+import numpy as np
+
+from common import default_params
+from models.results_store import ResultsStore
+from models.system import GeneratorSystem
+from utils.export import ResultsWriter, _import_pyarrow
+
+def main():
+    n_batch = 100000
+    system = GeneratorSystem(default_params())
+    if_op = np.linspace(1.5, 2.5, n_batch)[:, None] * np.ones(2)
+    store = system.solve_batch(if_op=if_op, out=ResultsStore(n_batch))
+
+    pa = _import_pyarrow()
+    formats = ["parquet", "arrow", "csv"] if pa is not None else ["csv"]
+    directory = tempfile.mkdtemp()
+
+    print(f"{'formato':>8} {'puntos':>9} {'tiempo':>9} {'filas/s':>10} {'memoria máx.':>13} {'archivo':>9}")
+    for format in formats:
+        block = store if format != "csv" else store[:n_batch // 10]
+        for n_points in (len(block), 10 * len(block)):
+            path = os.path.join(directory, f"sweep.{format}")
+            tracemalloc.start()
+            arrow_peak = 0
+            start = time.perf_counter()
+            with ResultsWriter(path, format=format) as writer:
+                for _ in range(n_points // len(block)):
+                    writer.write(block)
+                    if pa is not None:
+                        arrow_peak = max(arrow_peak, pa.total_allocated_bytes())
+            elapsed = time.perf_counter() - start
+            _, peak = tracemalloc.get_traced_memory()
+            tracemalloc.stop()
+            peak_mb = (peak + arrow_peak) / 2**20
+            size_mb = os.path.getsize(path) / 2**20
+            print(f"{format:>8} {n_points:>9} {elapsed:>8.2f}s {n_points / elapsed:>10.0f} "
+                  f"{peak_mb:>11.1f}MB {size_mb:>7.1f}MB")
+            os.remove(path)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,80 @@
+"""
+Verificación de factibilidad de puntos P-Q por lotes.
+
+Clasifica puntos de operación aleatorios de los dos generadores contra
+sus curvas de capacidad (márgenes y máscaras de cada límite) y reporta
+los puntos por segundo.
+
+Antes comprueba que check_feasibility señala los puntos que debe: con
+solve_batch, el punto por defecto es factible y uno sobreexcitado viola
+el límite de campo; con el fasor EA = Vφ + Zs IA a tensión nominal, un
+ángulo de potencia mayor que δ_max viola el de estabilidad y uno menor
+no. Termina con código 1 si alguna comprobación falla.
+
+Uso: python benchmarks/bench_feasibility.py [puntos]
+"""
+import sys
+import time
+
+import numpy as np
+
+from common import default_params
+from models.capability import LIMITS, check_feasibility
+from models.system import GeneratorSystem
+
+def phasor_power(generator, ea, delta):
+    """P y Q por fase con tensión nominal en terminales y ángulo de potencia delta (rad)"""
+    v_phase = generator.v_nom / np.sqrt(3)
+    ia = (ea * np.exp(1j * delta) - v_phase) / complex(generator.ra, generator.xs)
+    s = v_phase * np.conj(ia)
+    return s.real, s.imag
+
+def check_flags(system):
+    """Lista de fallas de las violaciones que informa check_feasibility"""
+    failures = []
+    generators = system.generators
+    if_max = max(max(g.if_values) for g in generators)
+    if_op = np.array([[g.if_op for g in generators], [1.2 * if_max, generators[1].if_op]])
+    report = system.check_feasibility(system.solve_batch(if_op))
+    if not report["feasible"][0]:
+        failures.append("el punto por defecto no es factible")
+    if not report["g1"]["violations"]["field"][1]:
+        failures.append(f"IF = {if_op[1, 0]:.1f} A no viola el límite de campo")
+    if report["g2"]["violations"]["field"][1]:
+        failures.append("G2 sin cambios viola el límite de campo")
+
+    # Ángulos de 30° y 100° con la EA de operación (δ_max = 90°)
+    delta = np.radians([30.0, 100.0])[:, None]
+    ea = np.array([g.get_ea_from_if(g.if_op) for g in generators])
+    p, q = phasor_power(generators[0], ea, delta)
+    stability = check_feasibility(generators, p=p, q=q)["g1"]["violations"]["stability"]
+    if stability[0] or not stability[1]:
+        failures.append(f"límite de estabilidad: {stability.tolist()}, se espera [False, True]")
+    return failures
+
+def main():
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 2000000
+    system = GeneratorSystem(default_params())
+    failures = check_flags(system)
+    for failure in failures:
+        print(f"FALLA {failure}")
+
+    s_phase = np.array([g.s_nom / 3 for g in system.generators])
+    rng = np.random.default_rng(0)
+    p = rng.uniform(-0.2, 1.2, (n, len(s_phase))) * s_phase
+    q = rng.uniform(-1.2, 1.2, (n, len(s_phase))) * s_phase
+
+    check_feasibility(system.generators, p=p[:1000], q=q[:1000])
+    start = time.perf_counter()
+    report = check_feasibility(system.generators, p=p, q=q)
+    elapsed = time.perf_counter() - start
+
+    print(f"{n} puntos x {len(s_phase)} generadores en {elapsed:.3f} s "
+          f"({n / elapsed / 1e6:.2f} M puntos/s)")
+    print(f"factibles: {report['feasible'].mean():.1%}")
+    for name in LIMITS:
+        print(f"  {name:>14}: {report['g1']['violations'][name].mean():6.1%} violan (G1)")
+    return 1 if failures else 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,93 @@
+"""
+Biblioteca de máquinas en memmap: apertura y construcción bajo demanda.
+
+Escribe bibliotecas con curvas de magnetización de 3 a 10 puntos y mide
+el tiempo de abrirlas (independiente del número de máquinas), de buscar
+los parámetros de una máquina y de construir su SynchronousGenerator.
+
+Antes comprueba que modificar un generador retornado por la caché no
+altera los siguientes. Termina con código 1 si no es así.
+
+Uso: python benchmarks/bench_library.py [máquinas más grande]
+"""
+import os
+import sys
+import tempfile
+import time
+
+import numpy as np
+
+from common import DEFAULT_GENERATOR_PARAMS
+from models.library import MachineLibrary, write_library
+
+def random_machines(n, seed=0):
+    """Máquinas con valores nominales y curvas aleatorias"""
+    rng = np.random.default_rng(seed)
+    for i in range(n):
+        points = int(rng.integers(3, 11))
+        if_values = np.sort(rng.uniform(0.5, 6.0, points))
+        ea_values = 500.0 * np.tanh(if_values / 3.0) * rng.uniform(0.8, 1.2)
+        params = dict(DEFAULT_GENERATOR_PARAMS)
+        params.update(
+            ra=rng.uniform(0.005, 0.05),
+            xs=rng.uniform(0.05, 0.5),
+            s_nom=rng.uniform(5e3, 5e6),
+            if_values=if_values,
+            ea_values=ea_values
+        )
+        yield f"GEN-{i:07d}", params
+
+def check_isolation(library, machine_id):
+    """Lista de fallas al modificar un generador obtenido de la caché"""
+    library.generator(machine_id)
+    first = library.generator(machine_id)  # Desde la caché
+    original = (first.if_op, first.p_motor, len(first.if_values))
+    first.if_op, first.p_motor, first.if_values = 99.0, 1.0, [1.0, 2.0]
+    second = library.generator(machine_id)
+    failures = []
+    if (second.if_op, second.p_motor, len(second.if_values)) != original:
+        failures.append("los cambios en un generador retornado alteran la caché")
+    if second.magnetization is not library.generator(machine_id).magnetization:
+        failures.append("las copias no comparten la curva de magnetización")
+    return failures
+
+def main():
+    largest = int(sys.argv[1]) if len(sys.argv) > 1 else 100000
+    sizes = [n for n in (1000, 10000, 100000, 1000000) if n <= largest]
+    failures = []
+    print(f"{'máquinas':>10} {'escritura':>10} {'tamaño':>9} {'apertura':>10} "
+          f"{'params':>9} {'generador':>10}")
+    for n in sizes:
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "library")
+            start = time.perf_counter()
+            write_library(path, random_machines(n))
+            write_time = time.perf_counter() - start
+            size = sum(os.path.getsize(os.path.join(path, name)) for name in os.listdir(path))
+
+            start = time.perf_counter()
+            library = MachineLibrary(path, cache_size=0)
+            open_time = time.perf_counter() - start
+            if not failures:
+                failures = check_isolation(MachineLibrary(path), "GEN-0000000")
+
+            rng = np.random.default_rng(1)
+            ids = [f"GEN-{i:07d}" for i in rng.integers(0, n, 2000)]
+            start = time.perf_counter()
+            for machine_id in ids:
+                library.params(machine_id)
+            params_time = (time.perf_counter() - start) / len(ids)
+            start = time.perf_counter()
+            for machine_id in ids:
+                library.generator(machine_id)
+            generator_time = (time.perf_counter() - start) / len(ids)
+
+            print(f"{n:>10} {write_time:>9.2f}s {size / 1e6:>7.1f}MB {open_time * 1e3:>8.2f}ms "
+                  f"{params_time * 1e6:>7.1f}µs {generator_time * 1e6:>8.1f}µs")
+            del library
+    for failure in failures:
+        print(f"FALLA {failure}")
+    return 1 if failures else 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,68 @@
+"""
+Cascada de métodos fija frente a la ordenada por MethodSelector.
+
+Resuelve sistemas con parámetros aleatorios con el motor "scipy" (solo la
+cascada hybr -> lm -> ...), primero en el orden fijo y luego con un
+selector que aprende de las soluciones anteriores y se guarda en JSON.
+
+Uso: python benchmarks/bench_method_selector.py [sistemas]
+"""
+import os
+import sys
+import tempfile
+import time
+
+import numpy as np
+
+from common import default_params
+from models.system import GeneratorSystem
+from solvers.equation_system import solve_generators
+from solvers.method_selector import MethodSelector
+from solvers.telemetry import TelemetryCollector
+
+def random_systems(n, seed=0):
+    """Sistemas con potencias, excitaciones y cargas aleatorias"""
+    rng = np.random.default_rng(seed)
+    systems = []
+    for _ in range(n):
+        params = default_params()
+        for k in (1, 2):
+            params[f"generator{k}"]["p_motor"] *= rng.uniform(0.2, 2.0)
+            params[f"generator{k}"]["if_op"] *= rng.uniform(0.8, 1.3)
+        params["load"]["r_load"] *= rng.uniform(0.3, 2.0)
+        params["load"]["x_load"] *= rng.uniform(0.1, 3.0)
+        systems.append(GeneratorSystem(params))
+    return systems
+
+def run(systems, selector=None):
+    """Resuelve todos los sistemas y retorna (tiempo, intentos fallidos)"""
+    collector = TelemetryCollector(keep_records=False)
+    start = time.perf_counter()
+    for system in systems:
+        solve_generators(system.generators, system.load, engine="scipy",
+                         telemetry=collector, selector=selector)
+    elapsed = time.perf_counter() - start
+    failed = sum(stats["attempts"] - stats["successes"] for stats in collector.methods.values())
+    return elapsed, failed
+
+def main():
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 400
+    training, evaluation = random_systems(n, seed=0), random_systems(n, seed=1)
+    path = os.path.join(tempfile.mkdtemp(), "method_stats.json")
+
+    fixed_time, fixed_failed = run(evaluation)
+
+    selector = MethodSelector(path)
+    run(training, selector)
+    selector.save()
+    # Nueva sesión: el selector se reconstruye desde el archivo
+    selector = MethodSelector(path)
+    adaptive_time, adaptive_failed = run(evaluation, selector)
+
+    print(f"{n} sistemas, {len(selector.table)} regiones con historial")
+    print(f"{'cascada':>10} {'tiempo/sistema':>15} {'intentos fallidos':>18}")
+    print(f"{'fija':>10} {fixed_time / n * 1e6:>13.0f}µs {fixed_failed:>18}")
+    print(f"{'adaptada':>10} {adaptive_time / n * 1e6:>13.0f}µs {adaptive_failed:>18}")
+
+if __name__ == "__main__":
+    main()
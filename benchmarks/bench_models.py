@@ -0,0 +1,59 @@
+"""
+Costo de crear muchos modelos de generador.
+
+Compara 10^5 SynchronousGenerator (con __slots__ y curva de magnetización
+perezosa) con una GeneratorFleet de arreglos paralelos, en tiempo y en
+memoria reservada (tracemalloc).
+
+Uso: python benchmarks/bench_models.py [máquinas]
+"""
+import sys
+import time
+import tracemalloc
+
+import numpy as np
+
+from common import DEFAULT_GENERATOR_PARAMS
+from models.fleet import GeneratorFleet
+from models.generator import SynchronousGenerator
+from models.load import Load
+
+def measure(func):
+    """Retorna (resultado, tiempo, memoria reservada en bytes) de func()"""
+    # El tiempo se mide sin tracemalloc, que hace lentas las asignaciones
+    start = time.perf_counter()
+    func()
+    elapsed = time.perf_counter() - start
+    tracemalloc.start()
+    result = func()
+    current, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return result, elapsed, current
+
+def main():
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 100000
+    rng = np.random.default_rng(0)
+    machines = []
+    for ra in rng.uniform(0.005, 0.05, n):
+        # Curvas como listas, igual que las entrega la barra lateral
+        machines.append(dict(DEFAULT_GENERATOR_PARAMS, ra=ra))
+
+    print(f"{n} máquinas")
+    generators, elapsed, memory = measure(lambda: [SynchronousGenerator(p) for p in machines])
+    print(f"SynchronousGenerator:          {elapsed:6.3f} s  {memory / n:7.0f} B/máquina")
+    del generators
+    _, elapsed, memory = measure(lambda: [SynchronousGenerator(p).magnetization for p in machines[:1000]])
+    print(f"  con curva construida (1000): {elapsed:6.3f} s  {memory / 1000:7.0f} B/máquina")
+
+    fleet, elapsed, memory = measure(lambda: GeneratorFleet.from_params(machines))
+    print(f"GeneratorFleet.from_params:    {elapsed:6.3f} s  {memory / n:7.0f} B/máquina "
+          f"(datos: {fleet.nbytes / n:.0f} B/máquina)")
+
+    load = Load(100.0, 50.0)
+    start = time.perf_counter()
+    for _ in range(n):
+        load.calculate_admittance()
+    print(f"Load.calculate_admittance:     {(time.perf_counter() - start) / n * 1e9:6.0f} ns/llamada")
+
+if __name__ == "__main__":
+    main()
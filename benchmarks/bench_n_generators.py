@@ -0,0 +1,82 @@
+"""
+Escalamiento del sistema de N generadores en paralelo (N = 2 ... 500).
+
+Mide el tiempo por evaluación del residuo y de la jacobiana y el tiempo de
+una solución completa con el Newton-Raphson amortiguado.
+
+Antes compara la jacobiana analítica con diferencias finitas
+(check_jacobian) con N = 2 (densa) y N = 16 y 50 (dispersa), en la
+estimación inicial y en un punto perturbado. Termina con código 1 si el
+error relativo supera JACOBIAN_TOLERANCE.
+
+Uso: python benchmarks/bench_n_generators.py
+"""
+import sys
+import time
+
+import numpy as np
+
+from common import default_params, timeit
+from models.system import GeneratorSystem
+from solvers.equation_system import CompiledSystem, check_jacobian, default_initial_guess
+from solvers.newton_raphson import newton_raphson
+
+# Error relativo máximo aceptado entre la jacobiana analítica y la numérica
+JACOBIAN_TOLERANCE = 1e-6
+
+def fleet_params(n, seed=0):
+    """Parámetros de n generadores algo distintos sobre una carga proporcional"""
+    rng = np.random.default_rng(seed)
+    base = default_params()
+    generators = []
+    for _ in range(n):
+        params = dict(base["generator1"])
+        params["ra"] *= rng.uniform(0.8, 1.2)
+        params["xs"] *= rng.uniform(0.8, 1.2)
+        params["if_op"] *= rng.uniform(0.9, 1.1)
+        params["p_motor"] *= rng.uniform(0.5, 1.0)
+        generators.append(params)
+    load = {"r_load": base["load"]["r_load"] * 2 / n, "x_load": base["load"]["x_load"] * 2 / n}
+    return {"generators": generators, "load": load}
+
+def check_jacobians():
+    """Lista de fallas de la comparación con diferencias finitas"""
+    failures = []
+    rng = np.random.default_rng(1)
+    for n in (2, 16, 50):
+        system = GeneratorSystem(fleet_params(n))
+        x0 = default_initial_guess(system.generators)
+        points = {"estimación": x0, "perturbado": x0 * rng.uniform(0.5, 1.5, x0.size) + rng.normal(0, 0.3, x0.size)}
+        kind = "sparse" if CompiledSystem(system.generators, system.load).sparse else "dense"
+        for label, x in points.items():
+            error = check_jacobian(system.generators, system.load, x)
+            print(f"jacobiana N = {n:>3} ({kind}), {label}: error relativo {error:.1e}")
+            if error > JACOBIAN_TOLERANCE:
+                failures.append(f"jacobiana N = {n} ({kind}, {label}): error {error:.1e}")
+    return failures
+
+def main():
+    failures = check_jacobians()
+    for failure in failures:
+        print(f"FALLA {failure}")
+    print(f"{'N':>5} {'jac':>7} {'residuo':>10} {'jacobiana':>10} {'solución':>10} {'iter':>5}")
+    for n in (2, 5, 10, 20, 50, 100, 200, 500):
+        system = GeneratorSystem(fleet_params(n))
+        compiled = CompiledSystem(system.generators, system.load)
+        x0 = default_initial_guess(system.generators)
+
+        t_res = timeit(lambda: compiled.residual(x0), repeat=2000)
+        t_jac = timeit(lambda: compiled.jacobian(x0), repeat=2000)
+
+        start = time.perf_counter()
+        ordering = compiled.augmented_ordering() if compiled.sparse else None
+        result = newton_raphson(compiled.residual, x0, compiled.jacobian, ordering=ordering)
+        t_solve = time.perf_counter() - start
+
+        kind = "sparse" if compiled.sparse else "dense"
+        print(f"{n:>5} {kind:>7} {t_res * 1e6:>8.1f}us {t_jac * 1e6:>8.1f}us "
+              f"{t_solve * 1e3:>8.2f}ms {result.nit:>5}")
+    return 1 if failures else 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,66 @@
+"""
+Flujo de potencia en redes malladas de gran tamaño.
+
+Genera redes en anillo con líneas transversales locales, un generador
+cada diez barras y una carga en cada barra, y mide el tiempo de solución.
+
+Uso: python benchmarks/bench_network.py
+"""
+import time
+
+import numpy as np
+
+from common import DEFAULT_GENERATOR_PARAMS
+from models.generator import SynchronousGenerator
+from models.load import Load
+from models.network import Network
+
+def random_network(n_buses, seed=0):
+    """Red en anillo con cuerdas locales aleatorias y cargas distribuidas"""
+    rng = np.random.default_rng(seed)
+    network = Network()
+    for _ in range(n_buses):
+        network.add_bus()
+
+    for i in range(n_buses):
+        network.add_line(i, (i + 1) % n_buses, 0.002, 0.01)
+    # Cuerdas entre barras cercanas (las redes reales son casi planas)
+    for _ in range(n_buses // 5):
+        a = rng.integers(n_buses)
+        b = (a + rng.integers(2, 30)) % n_buses
+        network.add_line(a, b, rng.uniform(0.002, 0.01), rng.uniform(0.01, 0.04))
+
+    # Con poca carga por generador las barras quedan cerca de EA; la
+    # potencia de las cargas se estima con esa tensión
+    if_op = 2.6
+    v_bus = 0.995 * SynchronousGenerator(DEFAULT_GENERATOR_PARAMS).get_ea_from_if(if_op)
+    p_load = np.zeros(n_buses)
+    for i in range(n_buses):
+        load = Load(rng.uniform(80, 120), rng.uniform(20, 60))
+        network.add_load(i, load)
+        p_load[i] = load.calculate_power(v_bus).real
+
+    # Cada generador cubre aproximadamente las diez cargas vecinas; el
+    # despacho total coincide con la carga total para que el generador de
+    # referencia solo cubra las pérdidas
+    buses = np.arange(0, n_buses, 10)
+    factor = rng.uniform(0.95, 1.05, len(buses))
+    p_local = np.add.reduceat(p_load, buses) * factor
+    p_local *= p_load.sum() / p_local.sum()
+    for bus, p_gen in zip(buses, p_local):
+        params = dict(DEFAULT_GENERATOR_PARAMS, if_op=if_op, p_motor=3 * p_gen / 0.9)
+        network.add_generator(int(bus), SynchronousGenerator(params))
+    return network
+
+def main():
+    print(f"{'barras':>7} {'iter':>5} {'tiempo':>10} {'residuo':>10}")
+    for n_buses in (100, 1000, 5000, 10000):
+        network = random_network(n_buses)
+        start = time.perf_counter()
+        results = network.solve()
+        elapsed = time.perf_counter() - start
+        print(f"{n_buses:>7} {results['nit']:>5} {elapsed * 1e3:>8.1f}ms "
+              f"{results['residual_history'][-1]:>10.2e}")
+
+if __name__ == "__main__":
+    main()
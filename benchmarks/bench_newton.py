@@ -0,0 +1,25 @@
+"""
+Compara el Newton-Raphson amortiguado con la cascada de métodos de scipy
+sobre los parámetros por defecto de la barra lateral.
+
+Uso: python benchmarks/bench_newton.py
+"""
+import contextlib
+import io
+
+from common import default_params, timeit
+from models.system import GeneratorSystem
+from solvers.equation_system import solve_system
+
+def main():
+    system = GeneratorSystem(default_params())
+    args = (system.generator1, system.generator2, system.load)
+
+    for engine in ("scipy", "newton"):
+        # Se descarta la salida de print() de la cascada
+        with contextlib.redirect_stdout(io.StringIO()):
+            elapsed = timeit(lambda: solve_system(*args, engine=engine))
+        print(f"{engine:>8}: {elapsed * 1e3:8.3f} ms por solución")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,41 @@
+"""
+Memoria por punto: diccionarios de solve() frente a ResultsStore.
+
+Resuelve un lote de puntos con solve_batch y compara la memoria que
+ocupan sus resultados como lista de diccionarios (el formato de solve())
+y como contenedor columnar.
+
+Uso: python benchmarks/bench_results_store.py [puntos]
+"""
+import sys
+import time
+import tracemalloc
+
+import numpy as np
+
+from common import default_params
+from models.results_store import ResultsStore
+from models.system import GeneratorSystem
+
+def main():
+    n_points = int(sys.argv[1]) if len(sys.argv) > 1 else 100000
+    system = GeneratorSystem(default_params())
+    if_op = np.linspace(1.5, 2.5, n_points)[:, None] * np.ones(2)
+
+    start = time.perf_counter()
+    store = system.solve_batch(if_op=if_op, out=ResultsStore(n_points))
+    elapsed = time.perf_counter() - start
+    print(f"{n_points} puntos resueltos en {elapsed:.2f} s")
+
+    tracemalloc.start()
+    dicts = [store.to_results(i) for i in range(n_points)]
+    dict_bytes, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    print(f"{'formato':>20} {'bytes/punto':>12} {'total':>10}")
+    print(f"{'dict (solve)':>20} {dict_bytes / n_points:>12.0f} {dict_bytes / 2**20:>8.1f}MB")
+    print(f"{'ResultsStore':>20} {store.bytes_per_point:>12.0f} {store.nbytes / 2**20:>8.1f}MB")
+    del dicts
+
+if __name__ == "__main__":
+    main()
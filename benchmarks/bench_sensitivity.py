@@ -0,0 +1,72 @@
+"""
+Sensibilidades de la solución por diferenciación implícita.
+
+Compara el costo de solve(sensitivities=True), que obtiene las derivadas
+de P, Q, delta, IA y VT respecto a las 2N + 2 entradas con una sola
+factorización, con el de re-solver el sistema una vez por entrada
+perturbada (diferencias finitas hacia adelante desde la solución).
+
+Uso: python benchmarks/bench_sensitivity.py [repeticiones]
+"""
+import copy
+import sys
+
+import numpy as np
+
+from common import DEFAULT_GENERATOR_PARAMS, default_params, timeit
+from models.system import GeneratorSystem
+
+def build_system(n):
+    """Sistema con n generadores ligeramente distintos"""
+    rng = np.random.default_rng(n)
+    generators = []
+    for _ in range(n):
+        params = copy.deepcopy(DEFAULT_GENERATOR_PARAMS)
+        params["if_op"] = rng.uniform(1.8, 2.6)
+        params["xs"] = rng.uniform(0.08, 0.2)
+        generators.append(params)
+    load = default_params()["load"]
+    load["r_load"] /= n / 2
+    load["x_load"] /= n / 2
+    return GeneratorSystem({"generators": generators, "load": load})
+
+def finite_differences(system, step=1e-4):
+    """Una solución no lineal adicional por cada entrada"""
+    base = system.solve()
+    x0 = system.last_solution.x.copy()
+    targets = [(g, "if_op") for g in system.generators] + [(g, "p_motor") for g in system.generators]
+    targets += [(system.load, "r_load"), (system.load, "x_load")]
+    columns = []
+    for obj, name in targets:
+        value = getattr(obj, name)
+        setattr(obj, name, value * (1 + step))
+        perturbed = system.solve(initial_guess=x0)
+        setattr(obj, name, value)
+        columns.append((perturbed["g1_p"] - base["g1_p"]) / (value * step))
+    return columns
+
+def main():
+    repeat = int(sys.argv[1]) if len(sys.argv) > 1 else 50
+    for n in (2, 8, 32):
+        system = build_system(n)
+        solve = timeit(system.solve, repeat)
+        implicit = timeit(lambda: system.solve(sensitivities=True), repeat)
+        finite = timeit(lambda: finite_differences(system), max(repeat // 10, 1))
+        print(f"N={n:3d} ({2 * n + 2:3d} entradas): solve {solve * 1e3:7.2f} ms, "
+              f"con sensibilidades {implicit * 1e3:7.2f} ms, "
+              f"re-solviendo {finite * 1e3:8.2f} ms ({finite / implicit:5.1f}x)")
+
+    # Ejemplo: efecto de subir IF del generador 2 en el sistema de la barra lateral
+    params = default_params()
+    params["generator2"]["if_op"] = 2.5
+    params["generator2"]["xs"] = 0.2
+    sensitivities = GeneratorSystem(params).solve(sensitivities=True)["sensitivities"]
+    j = sensitivities["inputs"].index("g2_if")
+    for k in range(2):
+        print(f"dP{k + 1}/dIF2 = {sensitivities['p'][k, j]:10.1f} W/A, "
+              f"dQ{k + 1}/dIF2 = {sensitivities['q'][k, j]:10.1f} var/A, "
+              f"dδ{k + 1}/dIF2 = {sensitivities['delta'][k, j]:7.3f} °/A")
+    print(f"d|VT|/dIF2 = {sensitivities['vt_mag'][j]:.3f} V/A")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,88 @@
+"""
+Márgenes de estabilidad sobre una malla de puntos de operación.
+
+Resuelve una malla de cargas y corrientes de campo con solve_batch,
+calcula el margen hasta el ángulo de pérdida de sincronismo de todos los
+puntos y el tiempo crítico de despeje de una falla en el bus con la
+búsqueda por lotes (todos los puntos y candidatos simulados a la vez).
+
+Antes comprueba los criterios de estabilidad: dos generadores idénticos
+no se separan, pero una falla larga aleja su velocidad de la síncrona,
+de modo que su tiempo crítico debe ser finito; y la estabilidad y la
+desviación máxima no deben depender de dt_out, porque se evalúan en cada
+paso del integrador. Termina con código 1 si alguna comprobación falla.
+
+Uso: python benchmarks/bench_stability.py [nodos por eje]
+"""
+import sys
+import time
+
+import numpy as np
+
+from common import default_params
+from models.stability import critical_clearing_time, pull_out_margin
+from models.system import GeneratorSystem
+from models.transient import Event, SwingSimulator
+
+def check_criteria():
+    """Lista de fallas de los criterios de pérdida de estabilidad"""
+    failures = []
+    system = GeneratorSystem(default_params())
+    simulator = SwingSimulator(system.generators, system.load)
+    cct = {method: critical_clearing_time(simulator, method=method)[0] for method in ("rk4", "adaptive")}
+    print("tiempo crítico con generadores idénticos: "
+          + ", ".join(f"{method} {value * 1e3:.1f} ms" for method, value in cct.items()))
+    failures += [f"generadores idénticos sin tiempo crítico finito ({method})"
+                 for method, value in cct.items() if not np.isfinite(value)]
+
+    # Despejes justo antes y después del crítico, con salidas densas y escasas
+    events = [Event(0.0, y_fault=1e4), Event(cct["rk4"] + np.array([-2e-3, 2e-3]), y_fault=0.0)]
+    for method in ("rk4", "adaptive"):
+        dense, sparse = (simulator.simulate(1.0, events, dt_out=dt_out, method=method, store=False)
+                         for dt_out in (1e-2, 0.5))
+        if (dense.stable.tolist() != [True, False]
+                or sparse.stable.tolist() != dense.stable.tolist()
+                or not np.allclose(sparse.max_speed_deviation, dense.max_speed_deviation, rtol=1e-3)):
+            failures.append(f"{method}: estabilidad {dense.stable.tolist()} (dt_out = 10 ms) y "
+                            f"{sparse.stable.tolist()} (dt_out = 0.5 s), se espera [True, False]")
+    return failures
+
+def main():
+    nodes = int(sys.argv[1]) if len(sys.argv) > 1 else 20
+    failures = check_criteria()
+    for failure in failures:
+        print(f"FALLA {failure}")
+    params = default_params()
+    params["generator1"]["inertia"] = 0.5
+    params["generator2"].update(xs=0.2, p_motor=5000.0, inertia=5.0)
+    system = GeneratorSystem(params)
+
+    r_load = np.linspace(30.0, 200.0, nodes)
+    if_op2 = np.linspace(1.6, 2.6, nodes)
+    if_op = np.stack(np.broadcast_arrays(2.0, if_op2), axis=-1)
+
+    start = time.perf_counter()
+    results = system.solve_batch(if_op=if_op[None, :, :], r_load=r_load[:, None]).reshape(-1)
+    results = results[results["converged"]]
+    solve_time = time.perf_counter() - start
+
+    start = time.perf_counter()
+    margins = pull_out_margin(system.generators, results)
+    margin_time = time.perf_counter() - start
+
+    simulator = SwingSimulator.from_results(system.generators, results)
+    start = time.perf_counter()
+    cct = critical_clearing_time(simulator, t_max=1.0, tol=1e-3, chunk_size=512)
+    cct_time = time.perf_counter() - start
+
+    n = len(results)
+    print(f"{n} puntos convergidos de {nodes * nodes}")
+    print(f"solve_batch:        {solve_time:8.3f} s")
+    print(f"margen de ángulo:   {margin_time * 1e3:8.3f} ms "
+          f"(mínimo {min(margins['g1_angle_margin'].min(), margins['g2_angle_margin'].min()):.1f}°)")
+    print(f"tiempo crítico:     {cct_time:8.3f} s ({cct_time / n * 1e3:.1f} ms por punto), "
+          f"entre {np.min(cct) * 1e3:.1f} y {np.max(cct) * 1e3:.1f} ms")
+    return 1 if failures else 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,136 @@
+"""
+Tiempo de importación en frío de los módulos del proyecto.
+
+Importa cada módulo en un intérprete nuevo con python -X importtime y
+suma el tiempo acumulado del módulo y de sus paquetes padre (mediana de
+varias repeticiones). Compara el resultado con el presupuesto guardado en
+startup_budget.json y termina con código 1 si algún módulo lo excede o
+si un módulo del modelo carga una dependencia pesada (scipy.optimize,
+scipy.interpolate, ...), que debe importarse solo al usarla.
+
+Los módulos que no se pueden importar en el entorno (p. ej. app sin
+streamlit) se omiten.
+
+Uso: python benchmarks/bench_startup.py [repeticiones] [--update]
+    --update  guarda las mediciones actuales (con holgura) como presupuesto
+"""
+import json
+import os
+import subprocess
+import sys
+
+import numpy as np
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+BUDGET_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "startup_budget.json")
+
+MODULES = [
+    "models.generator",
+    "models.system",
+    "models.cache",
+    "models.surrogate",
+    "solvers.equation_system",
+    "utils.export",
+    "cli",
+    "components.plots",
+    "app"
+]
+
+# Dependencias que no deben cargarse al importar los módulos
+HEAVY = [
+    "scipy.optimize", "scipy.interpolate", "scipy.sparse", "scipy.linalg",
+    "streamlit", "plotly", "pandas", "pyarrow"
+]
+
+# Módulos de la interfaz: streamlit carga sus propias dependencias, por lo
+# que en ellos las dependencias pesadas solo se informan
+UI_MODULES = ("components.plots", "app")
+
+# Holgura del presupuesto respecto a la medición con --update
+SLACK = 2.0
+
+def import_time(module):
+    """
+    Tiempo de importación (ms) del módulo en un intérprete nuevo
+
+    Returns:
+    --------
+    float o None
+        None si el módulo no se puede importar
+    """
+    process = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        cwd=ROOT, capture_output=True, text=True
+    )
+    if process.returncode != 0:
+        return None
+    parents = {".".join(module.split(".")[:i]) for i in range(1, module.count(".") + 2)}
+    total = 0
+    for line in process.stderr.splitlines():
+        # "import time: <propio> | <acumulado> | <sangría por nivel><módulo>"
+        if not line.startswith("import time:"):
+            continue
+        _, cumulative, name = line[len("import time:"):].split("|")
+        if not cumulative.strip().isdigit():
+            continue
+        # Solo las entradas de primer nivel (sin sangría) del módulo y sus padres
+        name = name[1:]
+        if name in parents:
+            total += int(cumulative)
+    return total / 1000
+
+def loaded_heavy(module):
+    """Dependencias pesadas presentes en sys.modules después de importar el módulo"""
+    code = (f"import sys, {module}; "
+            f"print(','.join(m for m in {HEAVY!r} if m in sys.modules))")
+    process = subprocess.run([sys.executable, "-c", code], cwd=ROOT, capture_output=True, text=True)
+    return [m for m in process.stdout.strip().split(",") if m]
+
+def main():
+    args = [arg for arg in sys.argv[1:] if not arg.startswith("--")]
+    repeat = int(args[0]) if args else 5
+    update = "--update" in sys.argv
+
+    budget = {}
+    if os.path.exists(BUDGET_PATH):
+        with open(BUDGET_PATH) as file:
+            budget = json.load(file)
+    limits = budget.get("budget_ms", {})
+    baseline = budget.get("baseline_ms", {})
+
+    measured = {}
+    over = []
+    for module in MODULES:
+        times = [import_time(module) for _ in range(repeat)]
+        if times[0] is None:
+            print(f"{module:26s} no disponible en este entorno")
+            continue
+        median = float(np.median(times))
+        measured[module] = median
+        limit = limits.get(module)
+        status = ""
+        if limit is not None:
+            status = f"presupuesto {limit:6.1f} ms" + ("  EXCEDIDO" if median > limit else "")
+            if median > limit:
+                over.append(module)
+        if module in baseline:
+            status += f"  (antes {baseline[module]:6.1f} ms)"
+        heavy = loaded_heavy(module)
+        print(f"{module:26s} {median:7.1f} ms  {status}")
+        if heavy:
+            print(f"{'':26s} carga: {', '.join(heavy)}")
+            if module not in UI_MODULES:
+                over.append(module)
+
+    if update:
+        budget["python"] = sys.version.split()[0]
+        budget["budget_ms"] = {module: round(value * SLACK, 1) for module, value in measured.items()}
+        with open(BUDGET_PATH, "w") as file:
+            json.dump(budget, file, indent=2, sort_keys=True)
+            file.write("\n")
+        print(f"Presupuesto actualizado en {BUDGET_PATH}")
+        return 0
+    return 1 if over else 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,46 @@
+"""
+Superficie de respuesta precalculada frente a la solución exacta.
+
+Construye la superficie de la pareja de máquinas por defecto, la guarda y
+la abre como memmap, y compara el tiempo de una consulta con el de
+resolver el sistema. Muestra las cotas de error de cada salida.
+
+Uso: python benchmarks/bench_surrogate.py [nodos por eje]
+"""
+import sys
+import tempfile
+import time
+
+from common import default_params, timeit
+from models.surrogate import SURROGATE_OUTPUTS, build_surrogate, find_surrogate, surrogate_path
+from models.system import GeneratorSystem
+
+def main():
+    nodes = int(sys.argv[1]) if len(sys.argv) > 1 else 7
+    params = default_params()
+
+    with tempfile.TemporaryDirectory() as directory:
+        start = time.perf_counter()
+        build_surrogate(params, surrogate_path(directory, params), nodes=nodes)
+        build_time = time.perf_counter() - start
+
+        start = time.perf_counter()
+        surrogate = find_surrogate(directory, params)
+        load_time = time.perf_counter() - start
+
+        preview = timeit(lambda: surrogate.evaluate(params), 5000)
+        exact = timeit(lambda: GeneratorSystem(params).solve(), 500)
+
+        print(f"malla: {nodes}^6 = {surrogate.values.size // len(SURROGATE_OUTPUTS)} nodos, "
+              f"{surrogate.values.nbytes / 1e6:.1f} MB")
+        print(f"construcción: {build_time:.2f} s, apertura (memmap): {load_time * 1e3:.2f} ms")
+        print(f"consulta: {preview * 1e6:.0f} µs, solución exacta: {exact * 1e6:.0f} µs "
+              f"({exact / preview:.1f}x)")
+        print(f"\nerror ({surrogate.n_validation} puntos de validación)")
+        print(f"{'salida':>10} {'máximo':>12} {'p99':>12}")
+        for key in SURROGATE_OUTPUTS:
+            print(f"{key:>10} {surrogate.error_max[key]:12.4g} {surrogate.error_p99[key]:12.4g}")
+        del surrogate
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,100 @@
+"""
+Estudio Monte Carlo en paralelo con SweepRunner.
+
+Varía ra, xs y p_motor de ambos generadores y la carga R/X, y mide el
+número de puntos por segundo con 1, 2, 4, ... procesos (hasta los
+núcleos disponibles).
+
+Antes compara, en un solo proceso, los puntos encadenados de un bloque
+(cada uno parte de la solución del anterior, como en SweepRunner) con
+los mismos puntos resueltos en frío: las potencias y |VT| deben
+coincidir. Termina con código 1 si no es así.
+
+Uso: python benchmarks/bench_sweep.py [puntos]
+"""
+import os
+import sys
+import time
+
+import numpy as np
+
+from common import default_params
+from models.sweep import SweepRunner, solve_points, solve_with_overrides
+from models.system import GeneratorSystem
+
+# Diferencia máxima aceptada entre las soluciones encadenadas y en frío
+TOLERANCE = {"p": 1e-2, "q": 1e-1, "vt": 1e-2}
+
+def monte_carlo_overrides(n_points, seed=0):
+    """Cambios aleatorios de +-20% alrededor de los valores por defecto"""
+    rng = np.random.default_rng(seed)
+    base = default_params()
+    overrides = []
+    for _ in range(n_points):
+        point = {}
+        for k in (1, 2):
+            generator = base[f"generator{k}"]
+            for attribute in ("ra", "xs", "p_motor"):
+                point[f"generator{k}.{attribute}"] = generator[attribute] * rng.uniform(0.8, 1.2)
+        for attribute in ("r_load", "x_load"):
+            point[f"load.{attribute}"] = base["load"][attribute] * rng.uniform(0.8, 1.2)
+        overrides.append(point)
+    return overrides
+
+def check_warm_start(overrides):
+    """Lista de fallas de la comparación entre puntos encadenados y en frío"""
+    system = GeneratorSystem(default_params())
+    chunk = list(enumerate(overrides))
+    timings = {}
+    start = time.perf_counter()
+    cold = [solve_with_overrides(system, o) for o in overrides]
+    timings["en frío"] = time.perf_counter() - start
+    start = time.perf_counter()
+    warm = [point for _, point in solve_points(system, chunk)]
+    timings["encadenado"] = time.perf_counter() - start
+    for label, elapsed in timings.items():
+        print(f"{label:>11}: {len(overrides) / elapsed:7.0f} puntos/s (1 proceso)")
+
+    failures = []
+    deviation = {name: 0.0 for name in TOLERANCE}
+    for index, (a, b) in enumerate(zip(cold, warm)):
+        if (a is None) != (b is None):
+            failures.append(f"punto {index}: converge solo {'en frío' if b is None else 'encadenado'}")
+            continue
+        if a is None:
+            continue
+        for k in range(1, len(system.generators) + 1):
+            deviation["p"] = max(deviation["p"], abs(a[f"g{k}_p"] - b[f"g{k}_p"]))
+            deviation["q"] = max(deviation["q"], abs(a[f"g{k}_q"] - b[f"g{k}_q"]))
+        deviation["vt"] = max(deviation["vt"], abs(abs(a["vt"]) - abs(b["vt"])))
+    print("diferencia máxima: " + ", ".join(f"{name} {value:.2e}" for name, value in deviation.items()))
+    failures += [f"diferencia de {name} {deviation[name]:.2e} > {limit:.0e}"
+                 for name, limit in TOLERANCE.items() if deviation[name] > limit]
+    return failures
+
+def main():
+    n_points = int(sys.argv[1]) if len(sys.argv) > 1 else 2000
+    overrides = monte_carlo_overrides(n_points)
+    failures = check_warm_start(overrides[:500])
+    for failure in failures:
+        print(f"FALLA {failure}")
+    cores = os.cpu_count() or 1
+    workers = sorted({1, *[w for w in (2, 4, 8, 16) if w <= cores], cores})
+
+    print(f"{n_points} puntos, {cores} núcleos")
+    print(f"{'procesos':>9} {'puntos/s':>10} {'aceleración':>12} {'fallidos':>9}")
+    reference = None
+    for n_workers in workers:
+        with SweepRunner(default_params(), max_workers=n_workers) as runner:
+            if n_workers > 1:
+                runner.run(overrides[:n_workers])  # arranque de los procesos
+            start = time.perf_counter()
+            runner.run(overrides)
+            elapsed = time.perf_counter() - start
+        rate = n_points / elapsed
+        reference = reference or rate
+        print(f"{n_workers:>9} {rate:>10.0f} {rate / reference:>11.2f}x {runner.failed:>9}")
+    return 1 if failures else 0
+
+if __name__ == "__main__":
+    sys.exit(main())
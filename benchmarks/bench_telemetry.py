@@ -0,0 +1,41 @@
+"""
+Costo de la telemetría de solve_generators.
+
+Compara el tiempo de solve() sin telemetría, con un TelemetryCollector y
+con el callback log_record (logging desactivado), y muestra el resumen
+por método y el histograma de tiempos del recolector.
+
+Uso: python benchmarks/bench_telemetry.py
+"""
+import numpy as np
+
+from common import default_params, timeit
+from models.system import GeneratorSystem
+from solvers.telemetry import TelemetryCollector, log_record, telemetry
+
+def main():
+    system = GeneratorSystem(default_params())
+    repeat = 5000
+
+    disabled = min(timeit(system.solve, repeat) for _ in range(3))
+    collector = TelemetryCollector()
+    with telemetry(collector):
+        collected = min(timeit(system.solve, repeat) for _ in range(3))
+    with telemetry(log_record):
+        logged = min(timeit(system.solve, repeat) for _ in range(3))
+
+    print(f"{'telemetría':>20} {'solve()':>10} {'sobrecosto':>11}")
+    for name, elapsed in (("desactivada", disabled), ("TelemetryCollector", collected), ("log_record", logged)):
+        print(f"{name:>20} {elapsed * 1e6:>8.1f}µs {(elapsed - disabled) * 1e6:>9.2f}µs")
+
+    print()
+    for method, stats in collector.summary().items():
+        print(f"{method}: {stats['attempts']} intentos, victorias {stats['win_rate']:.0%}, "
+              f"{stats['mean_time'] * 1e6:.1f}µs, nfev medio {stats['mean_nfev']:.1f}")
+    counts, edges = collector.histogram()
+    for count, low, high in zip(counts, edges[:-1], edges[1:]):
+        if count:
+            print(f"  {low * 1e6:8.1f} - {high * 1e6:8.1f} µs: {count}")
+
+if __name__ == "__main__":
+    main()
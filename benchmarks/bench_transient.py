@@ -0,0 +1,36 @@
+"""
+Simulación transitoria por lotes: segundos simulados por segundo.
+
+Integra un escalón de carga con distintas magnitudes en lotes de
+escenarios, con RK4 de paso fijo y con Dormand-Prince adaptativo, y
+reporta los segundos simulados (sumados sobre los escenarios) por
+segundo de cómputo.
+
+Uso: python benchmarks/bench_transient.py [escenarios máx.]
+"""
+import sys
+
+import numpy as np
+
+from common import default_params
+from models.system import GeneratorSystem
+from models.transient import Event, SwingSimulator
+
+def main():
+    largest = int(sys.argv[1]) if len(sys.argv) > 1 else 10000
+    params = default_params()
+    params["generator2"].update(xs=0.2, if_op=2.3, p_motor=5000.0, inertia=5.0)
+    system = GeneratorSystem(params)
+    simulator = SwingSimulator(system.generators, system.load)
+    t_end = 2.0
+
+    print(f"{'escenarios':>10} {'método':>9} {'cómputo':>9} {'pasos':>7} {'s sim/s':>10}")
+    for b in [n for n in (1, 100, 1000, 10000) if n <= largest]:
+        events = [Event(0.1, r_load=np.linspace(20.0, 200.0, b))]
+        for method in ("rk4", "adaptive"):
+            result = simulator.simulate(t_end, events, method=method, store=False)
+            print(f"{b:>10} {method:>9} {result.wall_time:>8.3f}s {result.steps.mean():>7.0f} "
+                  f"{result.speed:>10.0f}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,46 @@
+import copy
+import os
+import sys
+import time
+
+# Permite ejecutar los benchmarks desde la raíz del repositorio
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+# Valores por defecto de la barra lateral (components/sidebar.py)
+DEFAULT_GENERATOR_PARAMS = {
+    "ra": 0.01,
+    "xs": 0.1,
+    "s_nom": 10000.0,
+    "v_nom": 440.0,
+    "fp_nom": 0.8,
+    "poles": 4,
+    "if_values": [1.0, 2.0, 3.0, 4.0, 5.0],
+    "ea_values": [100.0, 200.0, 300.0, 400.0, 500.0],
+    "f_sc": 60.0,
+    "if_op": 2.0,
+    "p_core": 100.0,
+    "p_friction": 50.0,
+    "p_misc": 30.0,
+    "p_motor": 8000.0
+}
+
+DEFAULT_LOAD_PARAMS = {
+    "r_load": 100.0,
+    "x_load": 50.0
+}
+
+def default_params():
+    """Retorna una copia de los parámetros por defecto de la barra lateral"""
+    return {
+        "generator1": copy.deepcopy(DEFAULT_GENERATOR_PARAMS),
+        "generator2": copy.deepcopy(DEFAULT_GENERATOR_PARAMS),
+        "load": copy.deepcopy(DEFAULT_LOAD_PARAMS)
+    }
+
+def timeit(func, repeat=200):
+    """Retorna el tiempo medio por llamada (en segundos) de func()"""
+    func()
+    start = time.perf_counter()
+    for _ in range(repeat):
+        func()
+    return (time.perf_counter() - start) / repeat
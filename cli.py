@@ -0,0 +1,396 @@
+"""
+Ejecución por lotes sin la interfaz de Streamlit
+
+Lee conjuntos de parámetros de generadores y carga (JSON, JSON Lines, CSV
+o Parquet), los resuelve con GeneratorSystem y escribe los resultados por
+bloques con ResultsWriter. Solo importa NumPy y SciPy (pyarrow únicamente
+si la entrada o la salida es Parquet/Arrow), por lo que arranca rápido y
+sirve para trabajos por lotes. Como la aplicación, ordena la cascada de
+métodos con un MethodSelector cuyas estadísticas se cargan de
+--solver-stats y se guardan al terminar.
+
+Cada registro usa las claves de render_sidebar, anidadas
+({"generator1": {"if_op": 2.0}, "load": {"r_load": 90.0}}) o planas como
+en GeneratorSystem.sweep ("generator1.if_op", "load.r_load"). Los
+registros modifican el sistema base (--base); sin él, el primer registro
+debe estar completo y hace de base. En CSV las curvas de magnetización
+se escriben como números separados por ";".
+
+Uso:
+    python cli.py puntos.csv -o resultados.parquet --base base.json --workers 4
+"""
+import argparse
+import copy
+import csv
+import json
+import os
+import sys
+import time
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+from models.results_store import ResultsStore
+from models.sweep import solve_with_overrides
+from models.system import GeneratorSystem
+from solvers.method_selector import MethodSelector, set_method_selector
+from utils.export import FORMATS, ResultsWriter, _import_pyarrow
+
+INPUT_FORMATS = {
+    ".json": "json",
+    ".jsonl": "jsonl",
+    ".ndjson": "jsonl",
+    ".csv": "csv",
+    ".parquet": "parquet",
+    ".pq": "parquet"
+}
+
+# Estadísticas del selector de métodos (compartidas con app.py)
+SOLVER_STATS = os.path.join(os.path.dirname(os.path.abspath(__file__)), "solver_stats.json")
+
+# Parámetros que cambian la curva de magnetización (requieren reconstruir el sistema)
+CURVE_KEYS = ("if_values", "ea_values", "magnetization_table_size")
+
+# Parámetros enteros: en CSV (y en columnas Parquet con nulos) llegan como float
+INTEGER_KEYS = ("poles", "magnetization_table_size")
+
+# Parámetros que admite --method batch (los demás deben coincidir con la base)
+BATCH_KEYS = ("if_op", "p_motor", "r_load", "x_load")
+
+def flatten_params(params, prefix=""):
+    """
+    Convierte parámetros anidados en claves planas "generatorK.attr"
+
+    La lista "generators" de GeneratorSystem se numera como generator1,
+    generator2, ...
+    """
+    flat = {}
+    for key, value in params.items():
+        if key == "generators" and isinstance(value, list):
+            for k, generator in enumerate(value, start=1):
+                flat.update(flatten_params(generator, f"{prefix}generator{k}."))
+        elif isinstance(value, dict):
+            flat.update(flatten_params(value, f"{prefix}{key}."))
+        elif value is not None:
+            flat[prefix + key] = value
+    return flat
+
+def unflatten_params(flat):
+    """Parámetros anidados (formato de render_sidebar) a partir de claves planas"""
+    params = {}
+    for key, value in flat.items():
+        owner, _, name = key.partition(".")
+        if not name:
+            raise ValueError(f"Clave inválida: {key} (se espera generatorK.atributo o load.atributo)")
+        params.setdefault(owner, {})[name] = value
+    return params
+
+def _parse_value(text):
+    """Valor de una celda CSV: número, lista separada por ";" o None si está vacía"""
+    text = text.strip()
+    if not text:
+        return None
+    try:
+        return float(text)
+    except ValueError:
+        return [float(value) for value in text.replace(";", " ").split()]
+
+def _cast_integers(record):
+    """Convierte a int los parámetros enteros (INTEGER_KEYS) de un registro con claves planas"""
+    for key, value in record.items():
+        if key.partition(".")[2] in INTEGER_KEYS and isinstance(value, float):
+            if not value.is_integer():
+                raise ValueError(f"{key} debe ser un entero: {value}")
+            record[key] = int(value)
+    return record
+
+def _chunked(records, chunk_size):
+    chunk = []
+    for record in records:
+        chunk.append(record)
+        if len(chunk) == chunk_size:
+            yield chunk
+            chunk = []
+    if chunk:
+        yield chunk
+
+def read_records(path, format=None, chunk_size=1024):
+    """
+    Lee los registros de parámetros por bloques
+
+    JSON Lines, CSV y Parquet se leen de forma incremental (la memoria no
+    depende del tamaño del archivo); un archivo JSON (un objeto o una
+    lista de objetos) se carga completo.
+
+    Parameters:
+    -----------
+    path : str
+        Archivo de entrada
+    format : str, optional
+        "json", "jsonl", "csv" o "parquet"; por defecto según la extensión
+    chunk_size : int
+        Registros por bloque
+
+    Yields:
+    -------
+    list of dict
+        Registros con claves planas
+    """
+    if format is None:
+        extension = os.path.splitext(path)[1].lower()
+        if extension not in INPUT_FORMATS:
+            raise ValueError(f"Formato de entrada desconocido: {extension}")
+        format = INPUT_FORMATS[extension]
+
+    if format == "json":
+        with open(path) as file:
+            data = json.load(file)
+        records = data if isinstance(data, list) else [data]
+        yield from _chunked((flatten_params(record) for record in records), chunk_size)
+    elif format == "jsonl":
+        with open(path) as file:
+            lines = (line for line in file if line.strip())
+            yield from _chunked((flatten_params(json.loads(line)) for line in lines), chunk_size)
+    elif format == "csv":
+        with open(path, newline="") as file:
+            rows = csv.DictReader(file)
+            yield from _chunked(
+                (_cast_integers({key: value for key, value in ((k, _parse_value(v)) for k, v in row.items())
+                                 if value is not None}) for row in rows),
+                chunk_size
+            )
+    elif format == "parquet":
+        pa = _import_pyarrow()
+        if pa is None:
+            raise ImportError("Se necesita pyarrow para leer archivos Parquet")
+        for batch in pa.parquet.ParquetFile(path).iter_batches(batch_size=chunk_size):
+            yield [_cast_integers(flatten_params(record)) for record in batch.to_pylist()]
+    else:
+        raise ValueError(f"Formato de entrada desconocido: {format}")
+
+def _same(a, b):
+    if a is None or b is None:
+        return a is b
+    if isinstance(a, (list, tuple, np.ndarray)) or isinstance(b, (list, tuple, np.ndarray)):
+        return np.array_equal(np.asarray(a, dtype=float), np.asarray(b, dtype=float))
+    return a == b
+
+# Estado del proceso de trabajo (construido una sola vez por el inicializador)
+_worker = None
+
+def _init_worker(base, method, stats_path=None):
+    """
+    Construye el GeneratorSystem base en el proceso de trabajo e instala un
+    selector de métodos con las estadísticas de stats_path, si se indica
+    """
+    global _worker
+    selector = None
+    if stats_path is not None:
+        selector = MethodSelector(stats_path)
+        set_method_selector(selector)
+    _worker = (GeneratorSystem(unflatten_params(base)), base, method, selector)
+
+def _changes(record, base):
+    """Claves del registro que difieren del sistema base"""
+    owners = {key.partition(".")[0] for key in base}
+    changes = {}
+    for key, value in record.items():
+        if key.partition(".")[0] not in owners:
+            raise ValueError(f"Parámetro desconocido: {key}")
+        if not _same(value, base.get(key)):
+            changes[key] = value
+    return changes
+
+def _solve_exact(system, base, records):
+    """Resuelve cada registro con GeneratorSystem.solve (None si no converge)"""
+    store = ResultsStore(len(records), len(system.generators))
+    for i, record in enumerate(records):
+        changes = _changes(record, base)
+        if any(key.partition(".")[2] in CURVE_KEYS for key in changes):
+            # Otra curva de magnetización: sistema nuevo para este registro
+            params = unflatten_params(dict(base, **changes))
+            try:
+                results = GeneratorSystem(params).solve()
+            except ValueError:
+                results = None
+        else:
+            results = solve_with_overrides(system, changes)
+        store.write(i, results)
+    return store
+
+def _solve_vectorized(system, base, records):
+    """Resuelve el bloque con un solo GeneratorSystem.solve_batch"""
+    generators = system.generators
+    b, n = len(records), len(generators)
+    if_op = np.tile([g.if_op for g in generators], (b, 1)).astype(float)
+    p_motor = np.tile([g.p_motor for g in generators], (b, 1)).astype(float)
+    r_load = np.full(b, float(system.load.r_load))
+    x_load = np.full(b, float(system.load.x_load))
+    loads = {"r_load": r_load, "x_load": x_load}
+    machines = {"if_op": if_op, "p_motor": p_motor}
+    p_motor_given = False
+
+    for i, record in enumerate(records):
+        for key, value in _changes(record, base).items():
+            owner, _, name = key.partition(".")
+            if owner == "load" and name in loads:
+                loads[name][i] = value
+            elif owner.startswith("generator") and name in machines:
+                machines[name][i, int(owner[len("generator"):]) - 1] = value
+                p_motor_given |= name == "p_motor"
+            else:
+                raise ValueError(
+                    f"--method batch solo admite cambios de {', '.join(BATCH_KEYS)} ({key})"
+                )
+
+    store = ResultsStore(b, n)
+    # Sin p_motor en los registros se conservan las metas actuales (p_target)
+    system.solve_batch(if_op, p_motor if p_motor_given else None, r_load, x_load, out=store)
+    return store
+
+def _solve_chunk(records):
+    system, base, method, _ = _worker
+    if method == "batch":
+        return _solve_vectorized(system, base, records)
+    return _solve_exact(system, base, records)
+
+def _table_delta(before, after):
+    """Estadísticas del selector acumuladas entre dos copias de su tabla"""
+    delta = {}
+    for region, stats in after.items():
+        for method, entry in stats.items():
+            previous = before.get(region, {}).get(method, [0, 0, 0.0])
+            if entry[0] != previous[0]:
+                delta.setdefault(region, {})[method] = [a - b for a, b in zip(entry, previous)]
+    return delta
+
+def _solve_chunk_reporting(records):
+    """_solve_chunk en un proceso de trabajo; retorna también lo aprendido por el selector"""
+    selector = _worker[3]
+    if selector is None:
+        return _solve_chunk(records), {}
+    before = copy.deepcopy(selector.table)
+    store = _solve_chunk(records)
+    return store, _table_delta(before, selector.table)
+
+def solve_chunks(chunks, base, method="exact", workers=1, selector=None):
+    """
+    Resuelve bloques de registros, en orden, en uno o varios procesos
+
+    Con varios procesos se mantienen como máximo 2 * workers bloques en
+    vuelo, de modo que la entrada se lee a medida que se resuelve. Cada
+    proceso de trabajo carga las estadísticas del selector desde su
+    archivo y devuelve lo aprendido con cada bloque, que se suma al
+    selector de este proceso.
+
+    Parameters:
+    -----------
+    chunks : iterable of list of dict
+        Bloques de registros (read_records)
+    base : dict
+        Parámetros del sistema base con claves planas
+    method : str
+        "exact" (GeneratorSystem.solve por punto) o "batch"
+        (GeneratorSystem.solve_batch por bloque)
+    workers : int
+        Número de procesos
+    selector : MethodSelector, optional
+        Selector de métodos que ordena la cascada de solve_generators y
+        acumula las estadísticas (se instala mientras dura el cálculo)
+
+    Yields:
+    -------
+    ResultsStore
+        Resultados de cada bloque
+    """
+    if workers <= 1:
+        previous = set_method_selector(selector)
+        try:
+            _init_worker(base, method)
+            for chunk in chunks:
+                yield _solve_chunk(chunk)
+        finally:
+            set_method_selector(previous)
+        return
+
+    def collect(future):
+        store, learned = future.result()
+        if selector is not None:
+            selector.merge(learned)
+        return store
+
+    stats_path = selector.path if selector is not None else None
+    with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker,
+                             initargs=(base, method, stats_path)) as executor:
+        pending = deque()
+        for chunk in chunks:
+            pending.append(executor.submit(_solve_chunk_reporting, chunk))
+            if len(pending) >= 2 * workers:
+                yield collect(pending.popleft())
+        while pending:
+            yield collect(pending.popleft())
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(
+        description="Resuelve por lotes conjuntos de parámetros de generadores síncronos en paralelo"
+    )
+    parser.add_argument("input", help="Archivo de parámetros (.json, .jsonl, .csv o .parquet)")
+    parser.add_argument("-o", "--output",
+                        help="Archivo de resultados (por defecto <entrada>_results.parquet)")
+    parser.add_argument("--base", help="JSON con el sistema base (formato de render_sidebar)")
+    parser.add_argument("--input-format", choices=sorted(set(INPUT_FORMATS.values())),
+                        help="Formato de entrada (por defecto según la extensión)")
+    parser.add_argument("--format", default="auto", choices=("auto",) + FORMATS,
+                        help="Formato de salida (auto: según la extensión, CSV si no hay pyarrow)")
+    parser.add_argument("--method", default="exact", choices=("exact", "batch"),
+                        help="exact: solve() por punto; batch: solve_batch() vectorizado por bloque "
+                             "(solo if_op, p_motor, r_load y x_load pueden variar)")
+    parser.add_argument("--chunk-size", type=int, default=1024, help="Registros por bloque")
+    parser.add_argument("--workers", type=int, default=1, help="Número de procesos")
+    parser.add_argument("--solver-stats", default=SOLVER_STATS,
+                        help="JSON con las estadísticas del selector de métodos, que se cargan "
+                             "al iniciar y se guardan al terminar (cadena vacía: no usar selector)")
+    parser.add_argument("-q", "--quiet", action="store_true", help="No mostrar el resumen")
+    args = parser.parse_args(argv)
+
+    chunks = read_records(args.input, args.input_format, args.chunk_size)
+    if args.base is not None:
+        with open(args.base) as file:
+            base = flatten_params(json.load(file))
+    else:
+        first = next(chunks, None)
+        if first is None:
+            parser.error("El archivo de entrada no tiene registros")
+        base = first[0]
+        chunks = _prepend(first, chunks)
+
+    output = args.output or os.path.splitext(args.input)[0] + "_results.parquet"
+    selector = MethodSelector(args.solver_stats) if args.solver_stats else None
+    start = time.perf_counter()
+    failed = 0
+    try:
+        with ResultsWriter(output, args.format, row_group_size=args.chunk_size) as writer:
+            for store in solve_chunks(chunks, base, args.method, args.workers, selector):
+                failed += int(np.count_nonzero(~store["converged"]))
+                writer.write(store)
+    except (ValueError, KeyError, ImportError) as error:
+        print(f"error: {error}", file=sys.stderr)
+        return 1
+    finally:
+        if selector is not None:
+            selector.save()
+    elapsed = time.perf_counter() - start
+
+    if not args.quiet:
+        rows = writer.rows_written
+        print(f"{rows} puntos ({failed} sin converger) en {elapsed:.2f} s "
+              f"({rows / max(elapsed, 1e-12):.0f} puntos/s) -> {writer.path} [{writer.format}]",
+              file=sys.stderr)
+    return 0
+
+def _prepend(first, chunks):
+    yield first
+    yield from chunks
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,5 +1,4 @@
 import streamlit as st
-import plotly.graph_objects as go
 import numpy as np
 
 def render_magnetization_curve(generator, op_point, title_prefix=""):
@@ -15,6 +14,8 @@ def render_magnetization_curve(generator, op_point, title_prefix=""):
     title_prefix : str
         Prefijo para el título (opcional)
     """
+    # plotly se importa al dibujar, no al cargar la aplicación
+    import plotly.graph_objects as go
     title = "Curva de Magnetización"
     if title_prefix:
         title = f"{title_prefix} - {title}"
@@ -27,7 +28,7 @@ def render_magnetization_curve(generator, op_point, title_prefix=""):
         max(generator.if_values) * 1.1, 
         100
     )
-    ea_range = [generator.get_ea_from_if(if_val) for if_val in if_range]
+    ea_range = generator.get_ea_from_if(if_range)
     
     # Crear figura de Plotly
     fig = go.Figure()
@@ -84,6 +85,11 @@ def render_magnetization_curve(generator, op_point, title_prefix=""):
     # Mostrar la figura
     st.plotly_chart(fig, use_container_width=True)
 
+def _clip_to_view(p, q, limit):
+    """Oculta (NaN) los puntos de una curva fuera del cuadrado |P|, |Q| <= limit"""
+    outside = (np.abs(p) > limit) | (np.abs(q) > limit)
+    return np.where(outside, np.nan, p), np.where(outside, np.nan, q)
+
 def render_capability_curve(generator, op_point, title_prefix=""):
     """
     Renderiza la curva de capacidad interactiva con el punto de operación usando Plotly
@@ -93,10 +99,11 @@ def render_capability_curve(generator, op_point, title_prefix=""):
     generator : SynchronousGenerator
         Generador síncrono
     op_point : dict
-        Punto de operación (contiene P y Q)
+        Punto de operación (contiene P y Q por fase)
     title_prefix : str
         Prefijo para el título (opcional)
     """
+    import plotly.graph_objects as go
     title = "Curva de Capacidad"
     if title_prefix:
         title = f"{title_prefix} - {title}"
@@ -111,43 +118,51 @@ def render_capability_curve(generator, op_point, title_prefix=""):
     # Crear figura de Plotly
     fig = go.Figure()
     
-    # Límites de la curva de capacidad
+    # Límites de la curva de capacidad (calculados y guardados por el generador)
+    capability = generator.get_capability_curve()
+    # Potencias por fase, la misma convención del punto de operación
+    view = 1.3 * capability.s_phase
+    
     # Límite de corriente de armadura (círculo)
-    p_range = np.linspace(-generator.s_nom, generator.s_nom, 200)
-    q_max = np.sqrt(generator.s_nom**2 - p_range**2)
-    q_min = -q_max
+    p_armature, q_armature = capability.armature()
     
-    # Límite de corriente de campo (semicírculo superior)
-    p_field_range = np.linspace(0, generator.s_nom, 100)
-    q_field_limit = np.sqrt((0.8*generator.s_nom)**2 - p_field_range**2)
+    # Límite de corriente de campo (círculo centrado en -Vφ²/Xs)
+    p_field, q_field = _clip_to_view(*capability.field(), view)
     
-    # Límite de estabilidad (línea vertical)
-    p_stability = 0.9 * generator.s_nom
-    q_stability = np.linspace(-generator.s_nom, generator.s_nom, 50)
+    # Límite de estabilidad (recta δ = δ_max desde el centro del círculo de campo)
+    p_stability, q_stability = _clip_to_view(*capability.stability(), view)
+    
+    # Límite del motor primario (recta vertical)
+    p_motor, q_motor = capability.prime_mover()
+    
+    # Región de operación admisible
+    p_envelope, q_envelope = capability.envelope()
     
-    # Añadir límite térmico (armadura)
     fig.add_trace(go.Scatter(
-        x=p_range,
-        y=q_max,
+        x=p_envelope,
+        y=q_envelope,
         mode='lines',
-        name='Límite térmico (armadura)',
-        line=dict(color=color_termica, width=2),
+        fill='toself',
+        fillcolor='rgba(0, 128, 0, 0.1)',
+        name='Región admisible',
+        line=dict(color='rgba(0, 128, 0, 0.3)', width=1),
         hoverinfo='none'
     ))
     
+    # Añadir límite térmico (armadura)
     fig.add_trace(go.Scatter(
-        x=p_range,
-        y=q_min,
+        x=p_armature,
+        y=q_armature,
         mode='lines',
-        showlegend=False,
+        name='Límite térmico (armadura)',
         line=dict(color=color_termica, width=2),
         hoverinfo='none'
     ))
     
     # Añadir límite de excitación
     fig.add_trace(go.Scatter(
-        x=p_field_range,
-        y=q_field_limit,
+        x=p_field,
+        y=q_field,
         mode='lines',
         name='Límite de excitación',
         line=dict(color=color_excitacion, width=2),
@@ -156,7 +171,7 @@ def render_capability_curve(generator, op_point, title_prefix=""):
     
     # Añadir límite de estabilidad
     fig.add_trace(go.Scatter(
-        x=[p_stability] * len(q_stability),
+        x=p_stability,
         y=q_stability,
         mode='lines',
         name='Límite de estabilidad',
@@ -164,9 +179,19 @@ def render_capability_curve(generator, op_point, title_prefix=""):
         hoverinfo='none'
     ))
     
+    # Añadir límite del motor primario
+    fig.add_trace(go.Scatter(
+        x=p_motor,
+        y=q_motor,
+        mode='lines',
+        name='Límite del motor primario',
+        line=dict(color='orange', width=2),
+        hoverinfo='none'
+    ))
+    
     # Añadir líneas de factor de potencia nominal
     fp_angle = np.arccos(generator.fp_nom)
-    p_fp = np.linspace(0, generator.s_nom * 1.2, 100)
+    p_fp = np.linspace(0, capability.s_phase * 1.2, 100)
     q_fp_ind = p_fp * np.tan(fp_angle)
     q_fp_cap = -p_fp * np.tan(fp_angle)
     
@@ -209,8 +234,8 @@ def render_capability_curve(generator, op_point, title_prefix=""):
     # Configurar el layout
     fig.update_layout(
         title=title,
-        xaxis_title="Potencia Activa P (W)",
-        yaxis_title="Potencia Reactiva Q (VAr)",
+        xaxis_title="Potencia Activa P por fase (W)",
+        yaxis_title="Potencia Reactiva Q por fase (VAr)",
         hovermode='closest',
         template='plotly_white',
         width=600,
@@ -231,4 +256,45 @@ def render_capability_curve(generator, op_point, title_prefix=""):
     fig.update_yaxes(showgrid=True, gridwidth=1, gridcolor='LightGray', zeroline=True, zerolinewidth=1, zerolinecolor='gray')
     
     # Mostrar la figura
-    st.plotly_chart(fig, use_container_width=True)
\ No newline at end of file
+    st.plotly_chart(fig, use_container_width=True)
+
+def render_transient(result, omega_s):
+    """
+    Renderiza los ángulos relativos y la frecuencia de una simulación transitoria
+    
+    Parameters:
+    -----------
+    result : TransientResult
+        Resultado de SwingSimulator.simulate (se grafica el primer escenario)
+    omega_s : float
+        Velocidad eléctrica síncrona (rad/s)
+    """
+    import plotly.graph_objects as go
+    delta = np.degrees(result.delta[:, 0, :])
+    delta = delta - delta.mean(axis=1, keepdims=True)
+    frequency = (omega_s + result.omega[:, 0, :]) / (2 * np.pi)
+    
+    if result.stable[0]:
+        st.success(f"El sistema conserva el sincronismo (separación máxima "
+                   f"{np.degrees(result.max_separation[0]):.1f}°, desviación de velocidad máxima "
+                   f"{result.max_speed_deviation[0]:.1%})")
+    elif result.max_separation[0] > np.pi:
+        st.error("Pérdida de sincronismo: la separación angular supera 180°")
+    else:
+        st.error(f"Pérdida de estabilidad: la velocidad se aleja "
+                 f"{result.max_speed_deviation[0]:.1%} de la síncrona")
+    st.caption(f"{result.t[-1] / result.wall_time:.0f} segundos simulados por segundo de cómputo")
+    
+    col1, col2 = st.columns(2)
+    for column, values, label in ((col1, delta, "Ángulo relativo δ (°)"), (col2, frequency, "Frecuencia (Hz)")):
+        fig = go.Figure()
+        for k in range(values.shape[1]):
+            fig.add_trace(go.Scatter(x=result.t, y=values[:, k], mode='lines', name=f'Generador {k + 1}'))
+        fig.update_layout(
+            xaxis_title="Tiempo (s)",
+            yaxis_title=label,
+            template='plotly_white',
+            height=400
+        )
+        with column:
+            st.plotly_chart(fig, use_container_width=True)
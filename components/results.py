@@ -1,6 +1,6 @@
 import streamlit as st
-import pandas as pd
 import numpy as np
+from datetime import datetime
 
 def render_results(results):
     """
@@ -27,6 +27,8 @@ def render_results(results):
 
 def render_generator_results(results, gen_key):
     """Muestra los resultados de un generador específico"""
+    # pandas se importa al construir las tablas, no al cargar la aplicación
+    import pandas as pd
     # Extraer prefijo apropiado para las claves
     prefix = "g1_" if gen_key == "g1" else "g2_"
     title = "Generador 1" if gen_key == "g1" else "Generador 2"
@@ -105,6 +107,7 @@ def render_generator_results(results, gen_key):
 
 def render_load_results(results):
     """Muestra los resultados relacionados con la carga y el sistema completo"""
+    import pandas as pd
     st.subheader("Carga")
     
     load_df = pd.DataFrame({
@@ -169,7 +172,13 @@ def render_load_results(results):
     st.table(distribution_df)
 
 def export_results_to_csv(results, system):
-    """Exporta resultados en formato CSV para análisis posterior"""
+    """
+    Exporta un resumen del resultado en formato CSV para análisis posterior
+
+    Para barridos y estudios con muchos puntos, con todas las cantidades y
+    columnas tipadas, usar utils.export.ResultsWriter
+    """
+    import pandas as pd
     
     data = {
         'Parámetro': [],
@@ -181,10 +190,10 @@ def export_results_to_csv(results, system):
     
     # Agregar todos los resultados importantes
     parameters = [
-        ('Corriente Armadura', results['g1_ia_mag'], results['g2_ia_mag'], '-', 'A'),
+        ('Corriente Armadura', abs(results['g1_ia']), abs(results['g2_ia']), '-', 'A'),
         ('Potencia Activa', results['g1_p'], results['g2_p'], results['g1_p'] + results['g2_p'], 'W'),
         ('Potencia Reactiva', results['g1_q'], results['g2_q'], results['g1_q'] + results['g2_q'], 'VAr'),
-        ('Ángulo Potencia', np.degrees(results['g1_delta']), np.degrees(results['g2_delta']), '-', '°'),
+        ('Ángulo Potencia', results['g1_delta'], results['g2_delta'], '-', '°'),  # ya en grados
         ('Factor Potencia', results['g1_fp'], results['g2_fp'], '-', '-'),
         ('Eficiencia', results['g1_efficiency']*100, results['g2_efficiency']*100, '-', '%')
     ]
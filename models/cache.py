@@ -0,0 +1,155 @@
+import hashlib
+import json
+import threading
+from collections import OrderedDict, namedtuple
+from types import MappingProxyType
+
+import numpy as np
+from .system import GeneratorSystem
+
+CacheInfo = namedtuple("CacheInfo", ["hits", "misses", "maxsize", "currsize"])
+
+def _canonical(value):
+    """Convierte los parámetros a una forma canónica serializable"""
+    if type(value) is float:
+        return value
+    if isinstance(value, dict):
+        return {str(k): _canonical(v) for k, v in value.items()}
+    if isinstance(value, (list, tuple, np.ndarray)):
+        return [_canonical(v) for v in value]
+    if isinstance(value, (bool, np.bool_)):
+        return bool(value)
+    if isinstance(value, (int, float, np.integer, np.floating)):
+        # 4 y 4.0 (p. ej. el número de polos) deben producir la misma clave
+        return float(value)
+    return value
+
+def _freeze(value):
+    """Versión de solo lectura de un resultado: arreglos no modificables y diccionarios inmutables"""
+    if isinstance(value, np.ndarray):
+        value.setflags(write=False)
+        return value
+    if isinstance(value, dict):
+        return MappingProxyType({k: _freeze(v) for k, v in value.items()})
+    return value
+
+def params_key(params):
+    """
+    Calcula una clave de contenido para un diccionario de parámetros
+
+    Parameters:
+    -----------
+    params : dict
+        Diccionario con parámetros para los generadores y la carga
+        (el mismo formato que retorna render_sidebar)
+
+    Returns:
+    --------
+    str
+        Resumen SHA-256 de la forma canónica de los parámetros
+    """
+    text = json.dumps(_canonical(params), sort_keys=True, separators=(",", ":"))
+    return hashlib.sha256(text.encode("utf-8")).hexdigest()
+
+class SolveCache:
+    """
+    Caché LRU de sistemas resueltos, indexada por el contenido de los parámetros
+
+    Guarda el GeneratorSystem construido y su diccionario de resultados, de
+    modo que repetir un cálculo con los mismos valores de la barra lateral
+    no reconstruye las curvas de magnetización ni vuelve a resolver.
+
+    La caché se puede compartir entre hilos (p. ej. las sesiones de
+    Streamlit con st.cache_resource). Las consultas, inserciones y
+    contadores se protegen con un candado bajo el que solo se hace trabajo
+    O(1); las soluciones nuevas se calculan fuera de él, de a una a la vez.
+    Los resultados se guardan como datos de solo lectura (arreglos no
+    modificables, diccionarios anidados inmutables) y cada llamada recibe
+    una copia superficial del diccionario. El GeneratorSystem se comparte
+    sin copiar: quien lo recibe no debe modificarlo ni volver a resolverlo
+    (copy.deepcopy si lo necesita).
+    """
+
+    def __init__(self, maxsize=128):
+        self.maxsize = maxsize
+        self.hits = 0
+        self.misses = 0
+        self._systems = OrderedDict()
+        self._results = OrderedDict()
+        self._lock = threading.Lock()
+        # Serializa las soluciones nuevas (el candado de la caché no espera por ellas)
+        self._solve_lock = threading.Lock()
+
+    def _touch(self, store, key):
+        store.move_to_end(key)
+        return store[key]
+
+    def _insert(self, store, key, value):
+        store[key] = value
+        while len(store) > self.maxsize:
+            store.popitem(last=False)
+
+    def get_system(self, params):
+        """
+        Retorna el GeneratorSystem (compartido, de solo lectura) para
+        params, construyéndolo solo si no está en caché
+        """
+        key = params_key(params)
+        with self._lock:
+            if key in self._systems:
+                return self._touch(self._systems, key)
+        system = GeneratorSystem(params)
+        with self._lock:
+            # Otro hilo pudo construirlo mientras tanto
+            if key in self._systems:
+                return self._touch(self._systems, key)
+            self._insert(self._systems, key, system)
+        return system
+
+    def solve(self, params):
+        """
+        Resuelve el sistema para params o retorna el resultado guardado
+
+        Returns:
+        --------
+        tuple
+            (GeneratorSystem compartido, copia superficial del dict de
+            resultados de solo lectura)
+        """
+        key = params_key(params)
+        with self._lock:
+            if key in self._results:
+                self.hits += 1
+                system, results = self._touch(self._results, key)
+                return system, dict(results)
+
+        with self._solve_lock:
+            with self._lock:
+                # Otro hilo pudo resolverlo mientras se esperaba
+                if key in self._results:
+                    self.hits += 1
+                    system, results = self._touch(self._results, key)
+                    return system, dict(results)
+                self.misses += 1
+                system = self._systems.get(key)
+            if system is None:
+                system = GeneratorSystem(params)
+            results = {name: _freeze(value) for name, value in system.solve().items()}
+            with self._lock:
+                self._insert(self._systems, key, system)
+                self._systems.move_to_end(key)
+                self._insert(self._results, key, (system, results))
+        return system, dict(results)
+
+    def cache_info(self):
+        """Retorna los contadores de aciertos y fallos de la caché"""
+        with self._lock:
+            return CacheInfo(self.hits, self.misses, self.maxsize, len(self._results))
+
+    def clear(self):
+        """Vacía la caché y reinicia los contadores"""
+        with self._lock:
+            self._systems.clear()
+            self._results.clear()
+            self.hits = 0
+            self.misses = 0
@@ -0,0 +1,360 @@
+import numpy as np
+
+# Puntos por consulta vectorizada en contains() (limita los temporales)
+CHUNK_SIZE = 1 << 20
+
+# Límites evaluados por margins() y violations()
+LIMITS = ["armature", "field", "prime_mover", "stability", "reverse_power"]
+
+class CapabilityCurve:
+    """
+    Curva de capacidad P-Q de una máquina síncrona de rotor cilíndrico
+
+    Todas las potencias son por fase y en terminales, S = Vφ · conj(IA).
+    Las gK_p y gK_q del solucionador y de EconomicDispatch son, en
+    cambio, potencias internas Re, Im(EA · conj(IA)), mayores en
+    Ra |IA|² y Xs |IA|²; check_feasibility() hace la conversión. Con Vφ
+    la tensión de fase en terminales y Zs = Ra + jXs = |Zs| e^(jθ) la
+    impedancia síncrona, la potencia por fase es
+
+        S = P + jQ = C + (Vφ EA / |Zs|) e^(j(θ - δ)),  C = -Vφ² / conj(Zs)
+
+    (con Ra = 0, C = -j Vφ² / Xs y S - C = (Vφ EA / Xs)(sen δ + j cos δ)),
+    de modo que los límites son regiones del plano P-Q:
+
+    - Armadura (térmico): |S| <= S_fase = S_nom / 3
+    - Campo: |S - C| <= Vφ EA_max / |Zs|, con EA_max = EA(IF_max)
+    - Motor primario: P <= (P_motor - pérdidas rotacionales) / 3, con
+      P_motor trifásica como en SynchronousGenerator.power_target
+    - Estabilidad en estado estable: δ <= δ_max, es decir, el ángulo de
+      S - C medido desde la dirección e^(jθ) (el eje Q si Ra = 0) no
+      supera δ_max
+
+    Todas las curvas y las consultas se calculan con operaciones de NumPy
+    sobre arreglos completos.
+    """
+
+    def __init__(self, s_phase, v_phase, xs, ea_max, p_max, delta_max=np.pi / 2, points=200, ra=0.0):
+        """
+        Parameters:
+        -----------
+        s_phase : float
+            Potencia aparente nominal por fase (VA)
+        v_phase : float
+            Tensión de fase en terminales (V)
+        xs : float
+            Reactancia síncrona (Ω)
+        ea_max : float
+            Fuerza electromotriz con la corriente de campo máxima (V)
+        p_max : float
+            Potencia eléctrica máxima por fase que entrega el motor primario (W)
+        delta_max : float
+            Ángulo de potencia máximo (rad); π/2 es el límite teórico
+        points : int
+            Puntos de cada curva de límite
+        ra : float
+            Resistencia de armadura (Ω)
+        """
+        self.s_phase = float(s_phase)
+        self.v_phase = float(v_phase)
+        self.xs = float(xs)
+        self.ea_max = float(ea_max)
+        self.p_max = float(p_max)
+        self.delta_max = float(delta_max)
+        self.points = int(points)
+        self.ra = float(ra)
+
+        # Centro y radio del círculo del límite de campo, y dirección de δ = 0
+        zs = complex(self.ra, self.xs)
+        center = -self.v_phase ** 2 / zs.conjugate()
+        self.p_center, self.q_center = center.real, center.imag
+        self.field_radius = self.v_phase * self.ea_max / abs(zs)
+        self.z_angle = np.angle(zs)
+        # Dirección de la recta δ = δ_max desde el centro
+        self._stability_angle = self.z_angle - self.delta_max
+        self._curves = {}
+
+    @classmethod
+    def from_generator(cls, generator, if_max=None, delta_max=np.pi / 2, points=200):
+        """
+        Curva de capacidad de un SynchronousGenerator
+
+        Parameters:
+        -----------
+        generator : SynchronousGenerator
+            Máquina (tensión nominal de línea, conexión en Y); la potencia
+            nominal, la del motor primario y las pérdidas son trifásicas y
+            se dividen entre las tres fases
+        if_max : float, optional
+            Corriente de campo máxima; por defecto la mayor de la curva medida
+        delta_max, points :
+            Igual que en el constructor
+        """
+        if if_max is None:
+            if_max = float(np.max(generator.if_values))
+        p_losses = generator.p_core + generator.p_friction + generator.p_misc
+        return cls(
+            generator.s_nom / 3,
+            generator.v_nom / np.sqrt(3),
+            generator.xs,
+            generator.get_ea_from_if(if_max),
+            (generator.p_motor - p_losses) / 3,
+            delta_max=delta_max,
+            points=points,
+            ra=generator.ra
+        )
+
+    def _cached(self, name, build):
+        curve = self._curves.get(name)
+        if curve is None:
+            curve = self._curves[name] = build()
+            for array in curve:
+                array.flags.writeable = False
+        return curve
+
+    def armature(self):
+        """Círculo del límite térmico de armadura: (p, q)"""
+        def build():
+            theta = np.linspace(-np.pi, np.pi, 2 * self.points)
+            return self.s_phase * np.cos(theta), self.s_phase * np.sin(theta)
+        return self._cached("armature", build)
+
+    def field(self):
+        """Arco del límite de campo para P >= 0 (hasta δ_max): (p, q)"""
+        def build():
+            angle = self.z_angle - np.linspace(0, self.delta_max, self.points)
+            return (self.p_center + self.field_radius * np.cos(angle),
+                    self.q_center + self.field_radius * np.sin(angle))
+        return self._cached("field", build)
+
+    def stability(self):
+        """Recta δ = δ_max desde el centro C hasta el límite de campo: (p, q)"""
+        def build():
+            r = np.linspace(0, self.field_radius, self.points)
+            return (self.p_center + r * np.cos(self._stability_angle),
+                    self.q_center + r * np.sin(self._stability_angle))
+        return self._cached("stability", build)
+
+    def prime_mover(self):
+        """Recta vertical P = p_max dentro del círculo de armadura: (p, q)"""
+        def build():
+            q_half = np.sqrt(max(self.s_phase ** 2 - self.p_max ** 2, 0.0))
+            q = np.linspace(-q_half, q_half, self.points)
+            return np.full_like(q, self.p_max), q
+        return self._cached("prime_mover", build)
+
+    def bounds(self, p):
+        """
+        Límites de Q para cada potencia activa
+
+        Parameters:
+        -----------
+        p : array_like
+            Potencias activas por fase (W)
+
+        Returns:
+        --------
+        q_min, q_max : ndarray
+            Q mínima (armadura o estabilidad) y máxima (armadura o campo);
+            q_min > q_max donde ninguna Q es admisible
+        """
+        p = np.asarray(p, dtype=float)
+        armature = np.sqrt(np.maximum(self.s_phase ** 2 - p ** 2, 0.0))
+        p_field = p - self.p_center
+        field = self.q_center + np.sqrt(np.maximum(self.field_radius ** 2 - p_field ** 2, 0.0))
+        q_max = np.minimum(armature, field)
+        q_min = -armature
+        if np.cos(self._stability_angle) > 1e-12:
+            q_min = np.maximum(q_min, self.q_center + p_field * np.tan(self._stability_angle))
+        else:
+            q_min = np.maximum(q_min, self.q_center)
+        outside = ((p < 0) | (p > self.p_max) | (np.abs(p) > self.s_phase)
+                   | (np.abs(p_field) > self.field_radius))
+        q_max = np.where(outside, -np.inf, q_max)
+        return q_min, q_max
+
+    def envelope(self):
+        """
+        Contorno cerrado de la región admisible (intersección de los límites)
+
+        Returns:
+        --------
+        p, q : ndarray
+            Recorrido del contorno: borde superior de P = 0 a P máxima y
+            borde inferior de regreso
+        """
+        def build():
+            # P máxima del arco de campo con δ <= δ_max
+            p_field = self.p_center + self.field_radius * np.cos(max(self._stability_angle, 0.0))
+            p_end = min(self.p_max, self.s_phase, p_field)
+            p = np.linspace(0, max(p_end, 0.0), self.points)
+            q_min, q_max = self.bounds(p)
+            valid = q_max >= q_min
+            p, q_min, q_max = p[valid], q_min[valid], q_max[valid]
+            return (np.concatenate([p, p[::-1], p[:1]]),
+                    np.concatenate([q_max, q_min[::-1], q_max[:1]]))
+        return self._cached("envelope", build)
+
+    def margins(self, p, q):
+        """
+        Margen de cada límite para puntos (P, Q)
+
+        Todos los márgenes están en unidades de potencia y son positivos
+        dentro del límite y negativos fuera:
+
+        - armature: S_fase - |S|
+        - field: Vφ EA_max / |Zs| - |S - C|
+        - prime_mover: p_max - P
+        - stability: distancia a la recta δ = δ_max
+        - reverse_power: P (negativo si la máquina absorbe potencia activa)
+
+        Parameters:
+        -----------
+        p, q : array_like
+            Potencias activa y reactiva por fase (misma forma o difundibles)
+
+        Returns:
+        --------
+        dict
+            Límite (LIMITS) -> ndarray con la forma de los puntos
+        """
+        p, q = np.broadcast_arrays(np.asarray(p, dtype=float), np.asarray(q, dtype=float))
+        margins = {name: np.empty(p.shape) for name in LIMITS}
+        flat_p, flat_q = p.reshape(-1), q.reshape(-1)
+        flat = {name: margin.reshape(-1) for name, margin in margins.items()}
+
+        cos_s, sin_s = np.cos(self._stability_angle), np.sin(self._stability_angle)
+        for start in range(0, flat_p.size, CHUNK_SIZE):
+            stop = start + CHUNK_SIZE
+            pc, qc = flat_p[start:stop], flat_q[start:stop]
+            pf, qf = pc - self.p_center, qc - self.q_center
+            np.subtract(self.s_phase, np.hypot(pc, qc), out=flat["armature"][start:stop])
+            np.subtract(self.field_radius, np.hypot(pf, qf), out=flat["field"][start:stop])
+            np.subtract(self.p_max, pc, out=flat["prime_mover"][start:stop])
+            np.subtract(qf * cos_s, pf * sin_s, out=flat["stability"][start:stop])
+            flat["reverse_power"][start:stop] = pc
+        return margins
+
+    def violations(self, p, q):
+        """
+        Máscaras de violación de cada límite (margen negativo)
+
+        Returns:
+        --------
+        dict
+            Límite (LIMITS) -> ndarray of bool
+        """
+        return {name: margin < 0 for name, margin in self.margins(p, q).items()}
+
+    def contains(self, p, q, out=None):
+        """
+        Indica qué puntos (P, Q) están dentro de la curva de capacidad
+
+        Se evalúa por bloques de CHUNK_SIZE puntos, de modo que la memoria
+        temporal no crece con el número de consultas.
+
+        Parameters:
+        -----------
+        p, q : array_like
+            Potencias activa y reactiva por fase (misma forma o difundibles)
+        out : ndarray of bool, optional
+            Arreglo donde se escribe el resultado
+
+        Returns:
+        --------
+        ndarray of bool
+            True donde se cumplen todos los límites
+        """
+        p, q = np.broadcast_arrays(np.asarray(p, dtype=float), np.asarray(q, dtype=float))
+        if out is None:
+            out = np.empty(p.shape, dtype=bool)
+        flat_p, flat_q, flat_out = p.reshape(-1), q.reshape(-1), out.reshape(-1)
+
+        s_phase2 = self.s_phase ** 2
+        field2 = self.field_radius ** 2
+        cos_s, sin_s = np.cos(self._stability_angle), np.sin(self._stability_angle)
+        for start in range(0, flat_p.size, CHUNK_SIZE):
+            stop = start + CHUNK_SIZE
+            pc, qc = flat_p[start:stop], flat_q[start:stop]
+            pf, qf = pc - self.p_center, qc - self.q_center
+            inside = pc * pc + qc * qc <= s_phase2
+            inside &= pf * pf + qf * qf <= field2
+            inside &= pc <= self.p_max
+            # δ <= δ_max  <=>  el vector S - C no pasa la recta de δ_max
+            inside &= pf * sin_s - qf * cos_s <= 0
+            inside &= pc >= 0
+            flat_out[start:stop] = inside
+        if not np.shares_memory(flat_out, out):
+            out[...] = flat_out.reshape(out.shape)
+        return out
+
+def _column(results, key, dtype=float):
+    """Columna de resultados de dict, ResultsStore o arreglo estructurado"""
+    try:
+        return np.asarray(results[key], dtype=dtype)
+    except (KeyError, ValueError) as error:
+        raise KeyError(f"Los resultados no contienen {key}") from error
+
+def _terminal_power(results, k):
+    """
+    Potencia por fase en terminales VT · conj(IA) del generador k
+
+    Usa gK_vt de solve() y solve_batch() o, en los resultados de
+    EconomicDispatch, la tensión común del bus vt.
+    """
+    try:
+        vt = _column(results, f"g{k}_vt", complex)
+    except KeyError:
+        vt = _column(results, "vt", complex)
+    s = vt * np.conj(_column(results, f"g{k}_ia", complex))
+    return s.real, s.imag
+
+def check_feasibility(generators, results=None, p=None, q=None, **options):
+    """
+    Verifica puntos de operación contra la curva de capacidad de cada máquina
+
+    Los límites se evalúan de forma analítica (círculos y rectas), por lo
+    que cada punto cuesta O(1) sin importar cuántos se consulten. Las
+    curvas usan la potencia por fase en terminales (ver CapabilityCurve),
+    por lo que de los resultados se toma VT · conj(IA) y no gK_p, gK_q,
+    que incluyen las pérdidas y la potencia reactiva de la impedancia
+    síncrona; p y q deben darse en la misma convención.
+
+    Parameters:
+    -----------
+    generators : sequence of SynchronousGenerator
+        Máquinas del sistema
+    results : dict, ResultsStore o ndarray estructurado, optional
+        Resultados de solve(), solve_batch(), sweep() o EconomicDispatch;
+        se usan las claves gK_ia y gK_vt (o vt)
+    p, q : array_like, optional
+        Alternativa a results: potencias por fase en terminales con forma
+        (..., N), una columna por generador
+    **options :
+        Argumentos de get_capability_curve (if_max, delta_max)
+
+    Returns:
+    --------
+    dict
+        "gK" -> {"margins": dict, "violations": dict, "feasible": ndarray}
+        para cada generador, y "feasible": puntos que cumplen todos los
+        límites en todas las máquinas
+    """
+    if results is None and (p is None or q is None):
+        raise ValueError("Se requieren results o p y q")
+
+    report = {}
+    feasible_all = None
+    for k, generator in enumerate(generators, start=1):
+        if results is not None:
+            p_k, q_k = _terminal_power(results, k)
+        else:
+            p_k, q_k = np.asarray(p, dtype=float)[..., k - 1], np.asarray(q, dtype=float)[..., k - 1]
+        curve = generator.get_capability_curve(**options)
+        margins = curve.margins(p_k, q_k)
+        violations = {name: margin < 0 for name, margin in margins.items()}
+        feasible = ~np.logical_or.reduce(list(violations.values()))
+        report[f"g{k}"] = {"margins": margins, "violations": violations, "feasible": feasible}
+        feasible_all = feasible if feasible_all is None else feasible_all & feasible
+    report["feasible"] = feasible_all
+    return report
@@ -0,0 +1,309 @@
+import numpy as np
+from numpy.polynomial import polynomial
+
+# Holgura relativa de las restricciones de desigualdad: SLSQP solo las
+# cumple hasta su tolerancia y, con la holgura, los despachos quedan
+# dentro de la curva de capacidad de check_feasibility
+CONSTRAINT_MARGIN = 1e-6
+
+class EconomicDispatch:
+    """
+    Despacho económico de generadores en paralelo sobre una carga común
+
+    Con la tensión del bus fija VT = V (referencia real) y la corriente de
+    armadura de cada generador IA_k = a_k + j b_k como incógnitas, todas
+    las cantidades son cuadráticas en (a_k, b_k):
+
+        EA_k = VT + (RA + jXS) IA_k
+        P_k = Re(EA_k IA_k*) = V a_k + RA |IA_k|²
+        Q_k = Im(EA_k IA_k*) = -V b_k + XS |IA_k|²
+
+    (P_k y Q_k son por fase e internas, como las del solucionador del
+    sistema; P_k incluye las pérdidas en el cobre de la armadura y
+    CapabilityCurve usa en cambio la potencia en terminales VT IA*). El
+    costo de cada generador es un polinomio de su potencia mecánica
+    trifásica
+
+        P_mec,k = 3 P_k + p_core + p_friction + p_misc
+
+    y se minimiza la suma con SLSQP y derivadas analíticas. El costo solo
+    depende de Q a través de las pérdidas en el cobre, por lo que casi
+    cualquier reparto de la potencia reactiva tiene el mismo costo; para
+    que el resultado no dependa del punto de partida se suma un término
+    de reparto reactivo que prefiere Q proporcional a la potencia nominal
+    de cada máquina,
+
+        w Σ_k ((Q_k - S_k / Σ S · Σ Q) / |S_carga|)²
+
+    con w = reactive_weight relativo al costo del punto de partida y
+    |S_carga| = |Y_carga| VT² la potencia aparente de la carga por fase.
+    La minimización está sujeta a:
+
+    - Ley de Kirchhoff: suma de IA_k = Y_carga VT (lineal)
+    - Motor primario: P_mec,k <= p_motor (trifásica, como en
+      SynchronousGenerator.power_target)
+    - Armadura: V |IA_k| <= s_nom / 3
+    - Campo: |EA_k| <= EA(IF_max)
+    - Generación: potencia en terminales V a_k >= 0 (como el límite de
+      potencia inversa de CapabilityCurve)
+
+    Las corrientes de campo se obtienen al final con la curva de
+    magnetización inversa. Cada solución se usa como punto de partida de
+    la siguiente, de modo que barrer niveles de carga cercanos requiere
+    pocas iteraciones.
+    """
+
+    def __init__(self, generators, load, costs, vt=None, if_max=None, reactive_weight=1.0):
+        """
+        Parameters:
+        -----------
+        generators : list of SynchronousGenerator
+            Generadores conectados al bus
+        load : Load
+            Carga conectada a los generadores
+        costs : sequence of array_like
+            Coeficientes del polinomio de costo de cada generador en orden
+            creciente: [c0, c1, c2, ...] -> c0 + c1 P + c2 P² + ... (P en W)
+        vt : float, optional
+            Magnitud de la tensión del bus (por defecto la tensión de fase
+            nominal media, v_nom / √3)
+        if_max : float o sequence, optional
+            Corriente de campo máxima de cada generador (por defecto la
+            mayor de su curva medida)
+        reactive_weight : float
+            Peso del término de reparto reactivo (0 lo desactiva y deja el
+            reparto de Q indeterminado)
+        """
+        if len(costs) != len(generators):
+            raise ValueError("Se necesita una curva de costo por generador")
+        self.generators = list(generators)
+        self.load = load
+        self.costs = [np.asarray(c, dtype=float) for c in costs]
+        self._cost_derivatives = [polynomial.polyder(c) for c in self.costs]
+        n = len(self.generators)
+        self.n_generators = n
+
+        self.ra = np.array([g.ra for g in self.generators], dtype=float)
+        self.xs = np.array([g.xs for g in self.generators], dtype=float)
+        self.p_rot = np.array([g.p_core + g.p_friction + g.p_misc for g in self.generators], dtype=float)
+        self.p_motor = np.array([g.p_motor for g in self.generators], dtype=float)
+        self.s_nom = np.array([g.s_nom for g in self.generators], dtype=float)
+        if if_max is None:
+            if_max = [np.max(g.if_values) for g in self.generators]
+        self.if_max = np.broadcast_to(np.asarray(if_max, dtype=float), (n,)).copy()
+        self.ea_max = np.array([g.get_ea_from_if(i) for g, i in zip(self.generators, self.if_max)])
+        if vt is None:
+            vt = np.mean([g.v_nom for g in self.generators]) / np.sqrt(3)
+        self.vt = float(vt)
+        self.reactive_weight = float(reactive_weight)
+
+        self._x = None
+        self._cost_scale = 1.0
+        self._q_scale = 1.0
+        self._q_share = self.s_nom / self.s_nom.sum()
+        k = np.arange(n)
+        self._a, self._b = 2 * k, 2 * k + 1
+
+        # Ley de Kirchhoff: matriz de la restricción lineal A x = Y VT
+        self._equality = np.zeros((2, 2 * n))
+        self._equality[0, self._a] = 1.0
+        self._equality[1, self._b] = 1.0
+
+    def _split(self, x):
+        return x[self._a], x[self._b]
+
+    def _powers(self, x, vt):
+        a, b = self._split(x)
+        i2 = a * a + b * b
+        return vt * a + self.ra * i2, -vt * b + self.xs * i2, i2
+
+    def _reactive_deviation(self, q):
+        """Desviación de cada Q_k respecto al reparto proporcional, en unidades de la carga"""
+        return (q - self._q_share * q.sum()) / self._q_scale
+
+    def _objective(self, x, vt):
+        p, q, _ = self._powers(x, vt)
+        p_mech = 3 * p + self.p_rot
+        cost = sum(polynomial.polyval(pk, c) for pk, c in zip(p_mech, self.costs))
+        deviation = self._reactive_deviation(q)
+        return cost / self._cost_scale + self.reactive_weight * (deviation @ deviation)
+
+    def _objective_gradient(self, x, vt):
+        a, b = self._split(x)
+        p, q, _ = self._powers(x, vt)
+        marginal = np.array([polynomial.polyval(pk, d)
+                             for pk, d in zip(3 * p + self.p_rot, self._cost_derivatives)])
+        marginal = 3 * marginal / self._cost_scale
+        deviation = self._reactive_deviation(q)
+        marginal_q = 2 * self.reactive_weight * (deviation - self._q_share @ deviation) / self._q_scale
+        gradient = np.empty_like(x)
+        gradient[self._a] = marginal * (vt + 2 * self.ra * a) + marginal_q * (2 * self.xs * a)
+        gradient[self._b] = marginal * (2 * self.ra * b) + marginal_q * (2 * self.xs * b - vt)
+        return gradient
+
+    def _ea_parts(self, x, vt):
+        a, b = self._split(x)
+        return vt + self.ra * a - self.xs * b, self.xs * a + self.ra * b
+
+    def _inequalities(self, x, vt):
+        """Restricciones g(x) >= 0 (normalizadas), en bloques de N"""
+        a, _ = self._split(x)
+        p, _, i2 = self._powers(x, vt)
+        ea_re, ea_im = self._ea_parts(x, vt)
+        return np.concatenate([
+            (self.p_motor - self.p_rot - 3 * p) / self.s_nom,
+            1.0 - i2 * (3 * vt / self.s_nom) ** 2,
+            1.0 - (ea_re ** 2 + ea_im ** 2) / self.ea_max ** 2,
+            3 * vt * a / self.s_nom
+        ]) - CONSTRAINT_MARGIN
+
+    def _inequalities_jacobian(self, x, vt):
+        n = self.n_generators
+        a, b = self._split(x)
+        ea_re, ea_im = self._ea_parts(x, vt)
+        k = np.arange(n)
+        jac = np.zeros((4 * n, 2 * n))
+        dp_da, dp_db = vt + 2 * self.ra * a, 2 * self.ra * b
+        jac[k, self._a] = -3 * dp_da / self.s_nom
+        jac[k, self._b] = -3 * dp_db / self.s_nom
+        jac[n + k, self._a] = -2 * a * (3 * vt / self.s_nom) ** 2
+        jac[n + k, self._b] = -2 * b * (3 * vt / self.s_nom) ** 2
+        jac[2 * n + k, self._a] = -2 * (ea_re * self.ra + ea_im * self.xs) / self.ea_max ** 2
+        jac[2 * n + k, self._b] = -2 * (-ea_re * self.xs + ea_im * self.ra) / self.ea_max ** 2
+        jac[3 * n + k, self._a] = 3 * vt / self.s_nom
+        return jac
+
+    def _initial_guess(self, i_load):
+        """Corriente de carga repartida en proporción a la potencia nominal"""
+        share = self.s_nom / self.s_nom.sum()
+        x = np.empty(2 * self.n_generators)
+        x[self._a] = share * i_load.real
+        x[self._b] = share * i_load.imag
+        return x
+
+    def solve(self, y_load=None, vt=None, warm_start=True, tol=1e-9, max_iter=100):
+        """
+        Calcula el reparto de mínimo costo
+
+        Parameters:
+        -----------
+        y_load : complex, optional
+            Admitancia de la carga (por defecto la de self.load)
+        vt : float, optional
+            Tensión del bus (por defecto self.vt)
+        warm_start : bool
+            Si es True parte de la solución anterior, corrigiendo la
+            diferencia de corriente de carga en proporción a s_nom
+        tol, max_iter :
+            Tolerancia e iteraciones máximas de SLSQP
+
+        Returns:
+        --------
+        dict
+            success, message, nit, cost, vt, y por generador gK_p, gK_q,
+            gK_p_mech, gK_ia, gK_ea, gK_delta (grados) y gK_if (NaN si la
+            EA requerida supera la saturación)
+        """
+        y_load = self.load.calculate_admittance() if y_load is None else complex(y_load)
+        vt = self.vt if vt is None else float(vt)
+        i_load = y_load * vt
+
+        if warm_start and self._x is not None:
+            x0 = self._x.copy()
+            a, b = self._split(x0)
+            x0 += self._initial_guess(i_load - complex(a.sum(), b.sum()))
+        else:
+            x0 = self._initial_guess(i_load)
+
+        # Escala del costo para que el objetivo sea de orden 1
+        p0, _, _ = self._powers(x0, vt)
+        cost0 = sum(polynomial.polyval(pk, c) for pk, c in zip(3 * p0 + self.p_rot, self.costs))
+        self._cost_scale = max(abs(cost0), 1e-12)
+        self._q_scale = max(abs(i_load) * vt, 1e-12)
+
+        from scipy import optimize
+        solution = optimize.minimize(
+            self._objective, x0, args=(vt,), jac=self._objective_gradient, method="SLSQP",
+            constraints=[
+                {"type": "eq", "fun": lambda x: self._equality @ x - [i_load.real, i_load.imag],
+                 "jac": lambda x: self._equality},
+                {"type": "ineq", "fun": self._inequalities, "jac": self._inequalities_jacobian,
+                 "args": (vt,)}
+            ],
+            options={"ftol": tol, "maxiter": max_iter}
+        )
+        if solution.success:
+            self._x = solution.x.copy()
+        return self._results(solution, vt)
+
+    def _results(self, solution, vt):
+        x = solution.x
+        a, b = self._split(x)
+        p, q, _ = self._powers(x, vt)
+        ea_re, ea_im = self._ea_parts(x, vt)
+        p_mech = 3 * p + self.p_rot
+        results = {
+            "success": bool(solution.success),
+            "message": str(solution.message),
+            "nit": int(solution.nit),
+            "cost": float(sum(polynomial.polyval(pk, c) for pk, c in zip(p_mech, self.costs))),
+            "vt": complex(vt, 0.0)
+        }
+        for k, generator in enumerate(self.generators):
+            prefix = f"g{k + 1}_"
+            ea = complex(ea_re[k], ea_im[k])
+            results.update({
+                prefix + "p": float(p[k]),
+                prefix + "q": float(q[k]),
+                prefix + "p_mech": float(p_mech[k]),
+                prefix + "ia": complex(a[k], b[k]),
+                prefix + "ea": ea,
+                prefix + "delta": float(np.degrees(np.angle(ea))),
+                prefix + "if": generator.magnetization.inverse(abs(ea))
+            })
+        return results
+
+    def sweep(self, scales, warm_start=True):
+        """
+        Despacho para muchos niveles de carga
+
+        Parameters:
+        -----------
+        scales : array_like
+            Factores que multiplican la admitancia de la carga (1 = carga actual)
+        warm_start : bool
+            Encadena las soluciones (conviene ordenar los niveles)
+
+        Returns:
+        --------
+        list of dict
+            Resultado de solve() para cada nivel
+        """
+        y_load = self.load.calculate_admittance()
+        return [self.solve(y_load * scale, warm_start=warm_start) for scale in np.asarray(scales, dtype=float)]
+
+    def apply(self, results):
+        """
+        Fija en los generadores el despacho de results
+
+        Asigna if_op y p_target de cada generador, de modo que
+        GeneratorSystem.solve() reproduce el reparto (con la tensión del
+        bus resultante igual a VT).
+
+        Raises:
+        -------
+        ValueError
+            Si el despacho no convergió o alguna EA requerida supera la
+            saturación (gK_if es NaN); los generadores no se modifican
+        """
+        if not results["success"]:
+            raise ValueError(f"El despacho no convergió: {results['message']}")
+        for k in range(1, self.n_generators + 1):
+            if not np.isfinite(results[f"g{k}_if"]):
+                raise ValueError(
+                    f"G{k}: la EA requerida ({abs(results[f'g{k}_ea']):.1f} V) supera la "
+                    "saturación de la curva de magnetización"
+                )
+        for k, generator in enumerate(self.generators):
+            generator.if_op = results[f"g{k + 1}_if"]
+            generator.p_target = results[f"g{k + 1}_p"]
@@ -0,0 +1,119 @@
+import numpy as np
+from .generator import SynchronousGenerator
+from .library import MACHINE_FIELDS
+
+class GeneratorFleet:
+    """
+    Muchas máquinas síncronas guardadas como arreglos paralelos
+
+    Cada parámetro escalar (ra, xs, s_nom, ...) es un arreglo de longitud
+    N y las curvas de magnetización de longitud variable se concatenan en
+    dos arreglos planos indexados con offsets y lengths, igual que en
+    MachineLibrary. Crear una flota de 10^5 máquinas cuesta unos pocos
+    arreglos en lugar de 10^5 objetos; los SynchronousGenerator se
+    construyen solo para las máquinas que se consultan.
+    """
+
+    def __init__(self, columns, if_data, ea_data, offsets, lengths):
+        """
+        Parameters:
+        -----------
+        columns : dict
+            Parámetro de MACHINE_FIELDS -> arreglo (N,)
+        if_data, ea_data : ndarray
+            Curvas de magnetización concatenadas
+        offsets, lengths : ndarray (N,)
+            Inicio y número de puntos de la curva de cada máquina
+        """
+        self.columns = {name: np.asarray(columns[name]) for name, _ in MACHINE_FIELDS}
+        self.if_data = np.asarray(if_data, dtype=float)
+        self.ea_data = np.asarray(ea_data, dtype=float)
+        self.offsets = np.asarray(offsets, dtype=np.int64)
+        self.lengths = np.asarray(lengths, dtype=np.int64)
+
+    @classmethod
+    def from_params(cls, machines):
+        """
+        Flota a partir de diccionarios con el formato de _generator_params
+
+        Parameters:
+        -----------
+        machines : sequence of dict
+            Parámetros de cada máquina
+        """
+        columns = {
+            name: np.array([params[name] for params in machines], dtype=dtype)
+            for name, dtype in MACHINE_FIELDS
+        }
+        curves_if = [np.asarray(params["if_values"], dtype=float) for params in machines]
+        curves_ea = [np.asarray(params["ea_values"], dtype=float) for params in machines]
+        lengths = np.array([len(curve) for curve in curves_if], dtype=np.int64)
+        offsets = np.concatenate(([0], np.cumsum(lengths)[:-1])) if len(lengths) else lengths
+        return cls(
+            columns,
+            np.concatenate(curves_if) if curves_if else np.zeros(0),
+            np.concatenate(curves_ea) if curves_ea else np.zeros(0),
+            offsets,
+            lengths
+        )
+
+    @classmethod
+    def from_library(cls, library):
+        """
+        Flota con todas las máquinas de una MachineLibrary
+
+        Las columnas y las curvas son vistas del memmap (sin copia).
+        """
+        records = library.records
+        return cls(
+            {name: records[name] for name, _ in MACHINE_FIELDS},
+            library.if_data,
+            library.ea_data,
+            records["offset"],
+            records["length"]
+        )
+
+    def __len__(self):
+        return len(self.offsets)
+
+    def __getattr__(self, name):
+        # Acceso a las columnas como atributos: fleet.ra, fleet.s_nom, ...
+        columns = self.__dict__.get("columns")
+        if columns is not None and name in columns:
+            return columns[name]
+        raise AttributeError(name)
+
+    @property
+    def impedance(self):
+        """Impedancia síncrona RA + jXS de cada máquina"""
+        return self.columns["ra"] + 1j * self.columns["xs"]
+
+    @property
+    def nbytes(self):
+        """Memoria ocupada por los datos de la flota (bytes)"""
+        arrays = (*self.columns.values(), self.if_data, self.ea_data, self.offsets, self.lengths)
+        return sum(array.nbytes for array in arrays)
+
+    def curve(self, i):
+        """Curva de magnetización (vistas) de la máquina i"""
+        start = int(self.offsets[i])
+        stop = start + int(self.lengths[i])
+        return self.if_data[start:stop], self.ea_data[start:stop]
+
+    def params(self, i, **overrides):
+        """Diccionario de parámetros de la máquina i (formato de _generator_params)"""
+        params = {name: self.columns[name][i].item() for name, _ in MACHINE_FIELDS}
+        params["if_values"], params["ea_values"] = self.curve(i)
+        params.update(overrides)
+        return params
+
+    def generator(self, i, **overrides):
+        """SynchronousGenerator de la máquina i (construido en cada llamada)"""
+        return SynchronousGenerator(self.params(i, **overrides))
+
+    def __getitem__(self, i):
+        return self.generator(i)
+
+    def __iter__(self):
+        for i in range(len(self)):
+            yield self.generator(i)
@@ -1,7 +1,17 @@
 import numpy as np
-from scipy.interpolate import interp1d
+from .capability import CapabilityCurve
+from .magnetization import MagnetizationCurve
 
 class SynchronousGenerator:
+    # Sin __dict__ por instancia: crear muchos generadores es barato en
+    # tiempo y memoria (ver también GeneratorFleet)
+    __slots__ = (
+        "ra", "xs", "s_nom", "v_nom", "fp_nom", "poles",
+        "_if_values", "_ea_values", "_table_size", "_magnetization", "_capability",
+        "f_sc", "if_op", "p_core", "p_friction", "p_misc", "p_motor", "p_target",
+        "inertia", "damping"
+    )
+
     def __init__(self, params):
         # Parámetros del circuito equivalente
         self.ra = params["ra"]  # Resistencia de armadura
@@ -13,16 +23,12 @@ class SynchronousGenerator:
         self.fp_nom = params["fp_nom"]  # Factor de potencia nominal
         self.poles = params["poles"]  # Número de polos
         
-        # Curva de magnetización
-        self.if_values = np.array(params["if_values"])  # Corrientes de campo
-        self.ea_values = np.array(params["ea_values"])  # Fuerzas electromotrices
-        self.magnetization_curve = interp1d(
-            self.if_values, 
-            self.ea_values, 
-            kind='cubic', 
-            bounds_error=False, 
-            fill_value="extrapolate"
-        )
+        # Curva de magnetización (el interpolante se construye al usarlo)
+        self._magnetization = None
+        self._capability = None
+        self.if_values = params["if_values"]  # Corrientes de campo
+        self.ea_values = params["ea_values"]  # Fuerzas electromotrices
+        self.table_size = params.get("magnetization_table_size")
         
         # Punto de operación
         self.f_sc = params["f_sc"]  # Frecuencia de vacío
@@ -34,27 +40,82 @@ class SynchronousGenerator:
         self.p_misc = params["p_misc"]  # Pérdidas misceláneas
         
         # Capacidad del motor primario
-        self.p_motor = params["p_motor"]  # Potencia del motor primario
+        self.p_motor = params["p_motor"]  # Potencia del motor primario (trifásica)
+        
+        # Meta de potencia activa por fase fijada por un despacho (None: 0.9 * p_motor / 3)
+        self.p_target = params.get("p_target")
+        
+        # Dinámica del rotor (simulación transitoria)
+        self.inertia = params.get("inertia", 3.0)  # Constante de inercia H (s)
+        self.damping = params.get("damping", 2.0)  # Amortiguamiento D (pu de potencia / pu de velocidad)
+
+    @property
+    def power_target(self):
+        """
+        Potencia activa por fase que el solucionador exige al generador
+
+        p_motor es trifásica, igual que s_nom y las pérdidas, mientras que
+        el solucionador trabaja con potencias por fase; sin despacho la
+        meta es el 90 % de la potencia del motor primario repartida entre
+        las tres fases.
+        """
+        return self.p_motor * 0.9 / 3 if self.p_target is None else self.p_target
+
+    # La curva de magnetización y la de capacidad se guardan y se invalidan
+    # al cambiar los datos medidos (p. ej. en los barridos de parámetros)
+    @property
+    def if_values(self):
+        return self._if_values
+
+    @if_values.setter
+    def if_values(self, value):
+        self._if_values = np.asarray(value, dtype=float)
+        self._magnetization = self._capability = None
+
+    @property
+    def ea_values(self):
+        return self._ea_values
+
+    @ea_values.setter
+    def ea_values(self, value):
+        self._ea_values = np.asarray(value, dtype=float)
+        self._magnetization = self._capability = None
+
+    @property
+    def table_size(self):
+        return self._table_size
+
+    @table_size.setter
+    def table_size(self, value):
+        self._table_size = value
+        self._magnetization = self._capability = None
+
+    @property
+    def magnetization(self):
+        """MagnetizationCurve de la máquina (se construye en el primer uso)"""
+        if self._magnetization is None:
+            self._magnetization = MagnetizationCurve(
+                self.if_values,
+                self.ea_values,
+                table_size=self.table_size
+            )
+        return self._magnetization
+
+    @property
+    def magnetization_curve(self):
+        """Interpolante interp1d de la curva medida"""
+        return self.magnetization.interpolant
     
     def get_ea_from_if(self, if_value):
-        """Calcula la fuerza electromotriz a partir de la corriente de campo"""
-        # Asegurarse de que la curva de magnetización maneja valores fuera de rango
-        if if_value < min(self.if_values):
-            # Para valores menores, usamos una extrapolación lineal desde el origen
-            slope = self.ea_values[0] / self.if_values[0]
-            return float(slope * if_value)
-        elif if_value > max(self.if_values):
-            # Para valores mayores, extrapolamos con saturación
-            # Usamos los dos últimos puntos para calcular la pendiente
-            n = len(self.if_values)
-            slope = (self.ea_values[n-1] - self.ea_values[n-2]) / (self.if_values[n-1] - self.if_values[n-2])
-            extra = slope * (if_value - self.if_values[n-1]) + self.ea_values[n-1]
-            # Limitamos la extrapolación para evitar valores irreales
-            max_ea = self.ea_values[n-1] * 1.3  # 30% más que el último valor
-            return float(min(extra, max_ea))
-        else:
-            # Dentro del rango, usamos la interpolación
-            return float(self.magnetization_curve(if_value))
+        """
+        Calcula la fuerza electromotriz a partir de la corriente de campo
+        
+        Acepta un escalar (retorna float) o un arreglo de corrientes de campo
+        (retorna un ndarray con la misma forma). Fuera del rango medido se
+        extrapola linealmente desde el origen por debajo y con saturación
+        por encima (ver MagnetizationCurve).
+        """
+        return self.magnetization(if_value)
     
     def calculate_power_angle(self, ea, vt, ia):
         """Calcula el ángulo de potencia delta"""
@@ -70,7 +131,30 @@ class SynchronousGenerator:
         """Calcula las pérdidas en el cobre"""
         return 3 * (abs(ia) ** 2) * self.ra
     
-    def get_capability_curve(self):
-        """Genera los puntos para la curva de capacidad"""
-        # Implementación para generar los límites P-Q del generador
-        pass
\ No newline at end of file
+    def get_capability_curve(self, if_max=None, delta_max=np.pi / 2, points=200):
+        """
+        Genera la curva de capacidad P-Q del generador
+        
+        La curva se guarda y se reutiliza mientras no cambien los datos de
+        la máquina ni los argumentos.
+        
+        Parameters:
+        -----------
+        if_max : float, optional
+            Corriente de campo máxima (por defecto la mayor de la curva medida)
+        delta_max : float
+            Ángulo de potencia máximo para el límite de estabilidad (rad)
+        points : int
+            Puntos de cada curva de límite
+        
+        Returns:
+        --------
+        CapabilityCurve
+        """
+        key = (self.s_nom, self.v_nom, self.ra, self.xs, self.p_motor, self.p_core, self.p_friction,
+               self.p_misc, if_max, delta_max, points)
+        cached = self._capability
+        if cached is None or cached[0] != key:
+            curve = CapabilityCurve.from_generator(self, if_max=if_max, delta_max=delta_max, points=points)
+            self._capability = cached = (key, curve)
+        return cached[1]
@@ -0,0 +1,202 @@
+import copy
+import os
+from collections import OrderedDict
+
+import numpy as np
+from .generator import SynchronousGenerator
+
+# Campos escalares de cada máquina (mismo nombre que en _generator_params)
+MACHINE_FIELDS = [
+    ("ra", "f8"), ("xs", "f8"),
+    ("s_nom", "f8"), ("v_nom", "f8"), ("fp_nom", "f8"), ("poles", "i4"),
+    ("f_sc", "f8"), ("if_op", "f8"),
+    ("p_core", "f8"), ("p_friction", "f8"), ("p_misc", "f8"),
+    ("p_motor", "f8")
+]
+
+# Longitud máxima (bytes UTF-8) del identificador de una máquina
+ID_SIZE = 32
+
+RECORD_DTYPE = np.dtype(
+    [("id", f"S{ID_SIZE}")] + MACHINE_FIELDS + [("offset", "i8"), ("length", "i4")]
+)
+
+_FILES = ("records.npy", "if.npy", "ea.npy")
+
+def _encode_id(machine_id):
+    """Identificador como bytes de longitud fija"""
+    encoded = str(machine_id).encode("utf-8")
+    if len(encoded) > ID_SIZE:
+        raise ValueError(f"Identificador demasiado largo (máx. {ID_SIZE} bytes): {machine_id!r}")
+    return encoded
+
+def write_library(path, machines):
+    """
+    Escribe una biblioteca de máquinas
+
+    Parameters:
+    -----------
+    path : str
+        Directorio de la biblioteca (se crea si no existe)
+    machines : iterable of (id, dict)
+        Identificador y parámetros de cada máquina con el formato de
+        _generator_params (if_values y ea_values de cualquier longitud)
+
+    Returns:
+    --------
+    int
+        Número de máquinas escritas
+    """
+    ids, rows, if_parts, ea_parts = [], [], [], []
+    offset = 0
+    for machine_id, params in machines:
+        if_values = np.asarray(params["if_values"], dtype=float)
+        ea_values = np.asarray(params["ea_values"], dtype=float)
+        if if_values.shape != ea_values.shape or if_values.ndim != 1:
+            raise ValueError(f"Curva de magnetización inválida en {machine_id!r}")
+        ids.append(_encode_id(machine_id))
+        rows.append(tuple(params[name] for name, _ in MACHINE_FIELDS) + (offset, len(if_values)))
+        if_parts.append(if_values)
+        ea_parts.append(ea_values)
+        offset += len(if_values)
+
+    records = np.zeros(len(rows), dtype=RECORD_DTYPE)
+    for name, column in zip(RECORD_DTYPE.names[1:], zip(*rows) if rows else ()):
+        records[name] = column
+    records["id"] = ids
+
+    # Registros ordenados por identificador para buscar con searchsorted
+    order = np.argsort(records["id"], kind="stable")
+    records = records[order]
+    if len(records) > 1 and (records["id"][1:] == records["id"][:-1]).any():
+        raise ValueError("Identificadores de máquina repetidos")
+
+    os.makedirs(path, exist_ok=True)
+    curves = (np.concatenate(if_parts) if if_parts else np.zeros(0),
+              np.concatenate(ea_parts) if ea_parts else np.zeros(0))
+    for name, array in zip(_FILES, (records,) + curves):
+        np.save(os.path.join(path, name), array)
+    return len(records)
+
+
+class MachineLibrary:
+    """
+    Biblioteca de datos de placa de máquinas síncronas en disco
+
+    Los registros (valores nominales, Ra, Xs, pérdidas y el índice de la
+    curva) forman un arreglo estructurado ordenado por identificador, y las
+    curvas de magnetización de longitud variable se guardan concatenadas en
+    dos arreglos planos (IF y EA) que se indexan con offset y length.
+
+    Los tres archivos se abren como memmap de solo lectura: abrir la
+    biblioteca no lee los datos, de modo que cuesta lo mismo para diez
+    máquinas que para un millón. Los generadores se crean bajo demanda y
+    sus curvas son vistas del memmap (sin copia).
+    """
+
+    def __init__(self, path, cache_size=64):
+        """
+        Parameters:
+        -----------
+        path : str
+            Directorio escrito con write_library
+        cache_size : int
+            Número de generadores construidos que se conservan (LRU)
+        """
+        self.path = path
+        self.records, self.if_data, self.ea_data = (
+            np.load(os.path.join(path, name), mmap_mode="r") for name in _FILES
+        )
+        if self.records.dtype != RECORD_DTYPE:
+            raise ValueError(f"Formato de registros incompatible en {path}")
+        self.cache_size = cache_size
+        self._generators = OrderedDict()
+
+    def __len__(self):
+        return len(self.records)
+
+    def __contains__(self, machine_id):
+        try:
+            self.index(machine_id)
+        except KeyError:
+            return False
+        return True
+
+    def index(self, machine_id):
+        """Posición del registro de una máquina (búsqueda binaria)"""
+        encoded = _encode_id(machine_id)
+        ids = self.records["id"]
+        i = int(np.searchsorted(ids, encoded))
+        if i == len(ids) or ids[i] != encoded:
+            raise KeyError(machine_id)
+        return i
+
+    def ids(self):
+        """Identificadores de todas las máquinas (en orden)"""
+        return [machine_id.decode("utf-8") for machine_id in self.records["id"]]
+
+    def curve(self, machine_id):
+        """
+        Curva de magnetización de una máquina
+
+        Returns:
+        --------
+        if_values, ea_values : ndarray
+            Vistas de solo lectura del memmap
+        """
+        record = self.records[self.index(machine_id)]
+        start = int(record["offset"])
+        stop = start + int(record["length"])
+        return self.if_data[start:stop], self.ea_data[start:stop]
+
+    def params(self, machine_id, **overrides):
+        """
+        Parámetros de una máquina con el formato de _generator_params
+
+        Parameters:
+        -----------
+        machine_id : str
+            Identificador de la máquina
+        **overrides :
+            Valores que reemplazan a los de la biblioteca (p. ej. if_op o
+            p_motor del punto de operación)
+
+        Returns:
+        --------
+        dict
+            Escalares de Python; if_values y ea_values son vistas del memmap
+        """
+        record = self.records[self.index(machine_id)]
+        params = {name: record[name].item() for name, _ in MACHINE_FIELDS}
+        params["if_values"], params["ea_values"] = self.curve(machine_id)
+        params.update(overrides)
+        return params
+
+    def generator(self, machine_id, **overrides):
+        """
+        SynchronousGenerator de una máquina, construido bajo demanda
+
+        Los generadores sin overrides se guardan en una caché LRU y cada
+        llamada retorna una copia superficial del guardado: comparte las
+        curvas medidas (vistas de solo lectura del memmap) y las curvas
+        de magnetización y de capacidad ya construidas, de modo que
+        cambiar if_op, p_motor, etc. en el generador retornado no altera
+        la caché. Con overrides se construye uno nuevo en cada llamada.
+        """
+        if overrides:
+            return SynchronousGenerator(self.params(machine_id, **overrides))
+        generator = self._generators.get(machine_id)
+        if generator is not None:
+            self._generators.move_to_end(machine_id)
+            # Una máquina pedida más de una vez construye su curva de
+            # magnetización en el guardado para que las copias la compartan
+            generator.magnetization
+            return copy.copy(generator)
+        generator = SynchronousGenerator(self.params(machine_id))
+        self._generators[machine_id] = generator
+        if len(self._generators) > self.cache_size:
+            self._generators.popitem(last=False)
+        return copy.copy(generator)
+
+    def __getitem__(self, machine_id):
+        return self.generator(machine_id)
@@ -1,18 +1,45 @@
 import numpy as np
 
 class Load:
+    # La impedancia y la admitancia se calculan una vez y se invalidan al
+    # cambiar r_load o x_load (p. ej. en los barridos de parámetros)
+    __slots__ = ("_r_load", "_x_load", "_z", "_y")
+
     def __init__(self, r_load, x_load):
-        self.r_load = r_load  # Resistencia de carga
-        self.x_load = x_load  # Reactancia de carga (+ inductiva, - capacitiva)
+        self._r_load = r_load  # Resistencia de carga
+        self._x_load = x_load  # Reactancia de carga (+ inductiva, - capacitiva)
+        self._z = None
+        self._y = None
+
+    @property
+    def r_load(self):
+        return self._r_load
+
+    @r_load.setter
+    def r_load(self, value):
+        self._r_load = value
+        self._z = self._y = None
+
+    @property
+    def x_load(self):
+        return self._x_load
+
+    @x_load.setter
+    def x_load(self, value):
+        self._x_load = value
+        self._z = self._y = None
         
     def calculate_impedance(self):
         """Calcula la impedancia compleja de la carga"""
-        return complex(self.r_load, self.x_load)
+        if self._z is None:
+            self._z = complex(self._r_load, self._x_load)
+        return self._z
     
     def calculate_admittance(self):
         """Calcula la admitancia compleja de la carga"""
-        z = self.calculate_impedance()
-        return 1 / z
+        if self._y is None:
+            self._y = 1 / self.calculate_impedance()
+        return self._y
     
     def calculate_current(self, voltage):
         """Calcula la corriente que fluye por la carga"""
@@ -22,4 +49,4 @@ class Load:
     def calculate_power(self, voltage):
         """Calcula la potencia compleja consumida por la carga"""
         current = self.calculate_current(voltage)
-        return voltage * np.conj(current)
\ No newline at end of file
+        return voltage * np.conj(current)
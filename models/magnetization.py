@@ -0,0 +1,198 @@
+import numpy as np
+
+class MagnetizationCurve:
+    """
+    Curva de magnetización EA(IF) evaluable sobre arreglos completos
+
+    - Por debajo del primer punto: recta desde el origen
+    - Dentro del rango medido: interpolación cúbica (cuadrática o lineal
+      si la curva tiene menos de cuatro puntos)
+    - Por encima del último punto: extrapolación lineal con los dos últimos
+      puntos, limitada a un 30% más que el último valor (saturación)
+
+    Los límites y las pendientes se calculan una sola vez al construirla.
+    Opcionalmente se puede precalcular una tabla densa uniforme para
+    evaluar cada punto en O(1) con interpolación lineal entre nodos.
+    """
+
+    def __init__(self, if_values, ea_values, table_size=None):
+        """
+        Parameters:
+        -----------
+        if_values : array_like
+            Corrientes de campo medidas (en orden creciente)
+        ea_values : array_like
+            Fuerzas electromotrices correspondientes
+        table_size : int, optional
+            Número de nodos de la tabla precalculada (sin tabla por defecto)
+        """
+        self.if_values = np.asarray(if_values, dtype=float)
+        self.ea_values = np.asarray(ea_values, dtype=float)
+        self._interpolant = None
+
+        # Límites del rango medido
+        self.if_min = float(self.if_values.min())
+        self.if_max = float(self.if_values.max())
+
+        # Tramo inferior: recta desde el origen
+        self.slope_low = self.ea_values[0] / self.if_values[0]
+
+        # Tramo superior: pendiente de los dos últimos puntos y tope de saturación
+        self.if_last = self.if_values[-1]
+        self.ea_last = self.ea_values[-1]
+        self.slope_high = (self.ea_values[-1] - self.ea_values[-2]) / (self.if_values[-1] - self.if_values[-2])
+        self.ea_cap = self.ea_values[-1] * 1.3
+
+        self._table = None
+        self._inverse = None
+        self._slope = None
+        if table_size is not None:
+            self.build_table(table_size)
+
+    @property
+    def interpolant(self):
+        """Interpolante interp1d de la curva medida (se construye en el primer uso)"""
+        if self._interpolant is None:
+            # scipy.interpolate se importa solo al evaluar la curva
+            from scipy.interpolate import interp1d
+            kinds = {2: 'linear', 3: 'quadratic'}
+            self._interpolant = interp1d(
+                self.if_values,
+                self.ea_values,
+                kind=kinds.get(len(self.if_values), 'cubic'),
+                bounds_error=False,
+                fill_value="extrapolate"
+            )
+        return self._interpolant
+
+    def build_table(self, size=4096, if_range=None):
+        """
+        Precalcula una tabla densa uniforme de EA(IF)
+
+        Parameters:
+        -----------
+        size : int
+            Número de nodos de la tabla
+        if_range : tuple, optional
+            Intervalo (IF inicial, IF final) cubierto por la tabla; por
+            defecto desde 0 hasta el punto donde se alcanza la saturación
+        """
+        if if_range is None:
+            if_range = (0.0, self._saturation_current())
+        start, stop = map(float, if_range)
+        nodes = np.linspace(start, stop, size)
+        table = self._evaluate(nodes)
+        self._table = (start, (size - 1) / (stop - start), table, np.diff(table))
+
+    def _saturation_current(self):
+        """Corriente de campo a partir de la cual EA se mantiene en el tope"""
+        if self.slope_high > 0:
+            return max(self.if_last + max(self.ea_cap - self.ea_last, 0) / self.slope_high, self.if_max)
+        return self.if_max
+
+    def inverse(self, ea_value, size=4096):
+        """
+        Corriente de campo necesaria para una fuerza electromotriz
+
+        Se interpola sobre una tabla densa de EA(IF) que se calcula una sola
+        vez (la curva es creciente). Los valores por encima del tope de
+        saturación no se pueden alcanzar y retornan NaN.
+
+        Parameters:
+        -----------
+        ea_value : float o array_like
+            Fuerzas electromotrices
+        size : int
+            Nodos de la tabla inversa (solo en la primera llamada)
+
+        Returns:
+        --------
+        float o ndarray
+            Corrientes de campo con la forma de la entrada
+        """
+        if self._inverse is None:
+            if_nodes = np.linspace(0.0, self._saturation_current(), size)
+            # Se fuerza la monotonía por si la interpolación cúbica oscila
+            self._inverse = (np.maximum.accumulate(self._evaluate(if_nodes)), if_nodes)
+        ea_nodes, if_nodes = self._inverse
+        values = np.asarray(ea_value, dtype=float)
+        if_value = np.interp(values, ea_nodes, if_nodes, right=np.nan)
+        if_value = np.where(values < 0, np.nan, if_value)
+        return float(if_value) if values.ndim == 0 else if_value
+
+    def derivative(self, if_value):
+        """
+        Pendiente dEA/dIF de la curva (la misma evaluación por tramos)
+
+        Dentro del rango medido se deriva el spline que usa interp1d; por
+        encima del tope de saturación la pendiente es cero.
+
+        Returns:
+        --------
+        float o ndarray
+            Pendientes con la forma de la entrada
+        """
+        if self._slope is None:
+            from scipy.interpolate import make_interp_spline
+            order = min(len(self.if_values) - 1, 3)
+            self._slope = make_interp_spline(self.if_values, self.ea_values, k=order).derivative()
+        values = np.asarray(if_value, dtype=float)
+        high_ea = self.slope_high * (values - self.if_last) + self.ea_last
+        slope = np.where(
+            values < self.if_min, self.slope_low,
+            np.where(values > self.if_max,
+                     np.where(high_ea < self.ea_cap, self.slope_high, 0.0),
+                     self._slope(np.clip(values, self.if_min, self.if_max)))
+        )
+        return float(slope) if values.ndim == 0 else slope
+
+    def _evaluate(self, if_values):
+        """Evaluación exacta por tramos sobre un arreglo"""
+        low = if_values < self.if_min
+        high = if_values > self.if_max
+        ea = np.empty_like(if_values)
+
+        inside = ~(low | high)
+        if inside.any():
+            ea[inside] = self.interpolant(if_values[inside])
+        ea[low] = self.slope_low * if_values[low]
+        ea[high] = np.minimum(self.slope_high * (if_values[high] - self.if_last) + self.ea_last, self.ea_cap)
+        return ea
+
+    def _lookup(self, if_values):
+        """Evaluación con la tabla precalculada (fuera de la tabla, exacta)"""
+        start, inv_step, table, slopes = self._table
+        position = (if_values - start) * inv_step
+        index = position.astype(np.intp)
+        np.clip(index, 0, len(slopes) - 1, out=index)
+        ea = table.take(index) + (position - index) * slopes.take(index)
+
+        outside = (position < 0) | (position > len(slopes))
+        if outside.any():
+            ea[outside] = self._evaluate(if_values[outside])
+        return ea
+
+    def __call__(self, if_value):
+        """
+        Calcula EA para una corriente de campo o un arreglo de corrientes
+
+        Returns:
+        --------
+        float o ndarray
+            float si la entrada es escalar, ndarray con la misma forma en otro caso
+        """
+        if self._table is None and np.ndim(if_value) == 0:
+            # Camino rápido para escalares (evita crear máscaras)
+            x = float(if_value)
+            if x < self.if_min:
+                return float(self.slope_low * x)
+            if x > self.if_max:
+                return float(min(self.slope_high * (x - self.if_last) + self.ea_last, self.ea_cap))
+            return float(self.interpolant(x))
+
+        values = np.asarray(if_value, dtype=float)
+        flat = values.reshape(-1)
+        ea = self._lookup(flat) if self._table is not None else self._evaluate(flat)
+        if values.ndim == 0:
+            return float(ea[0])
+        return ea.reshape(values.shape)
@@ -0,0 +1,262 @@
+import numpy as np
+from scipy import sparse
+from solvers.power_flow import newton_power_flow
+
+class Network:
+    """
+    Red de varias barras con generadores síncronos, cargas y líneas
+
+    Cada generador se modela como su fuerza electromotriz EA (de la curva de
+    magnetización) detrás de la impedancia síncrona RA + jXS, conectada a una
+    barra; cada carga, como una admitancia en derivación. Las incógnitas son
+    las tensiones de fase de todas las barras y los ángulos de potencia de
+    los generadores. El primer generador es la referencia angular (delta = 0)
+    y cubre el desbalance de potencia (generador de holgura); los demás
+    entregan la potencia activa objetivo por fase 0.9 * p_motor / 3, como en
+    GeneratorSystem.
+    """
+
+    def __init__(self):
+        self.n_buses = 0
+        self.bus_names = []
+        self.lines = []       # (barra origen, barra destino, r, x, b)
+        self.generators = []  # (barra, SynchronousGenerator)
+        self.loads = []       # (barra, Load)
+
+    def add_bus(self, name=None):
+        """Agrega una barra y retorna su índice"""
+        self.bus_names.append(name if name is not None else f"Barra {self.n_buses + 1}")
+        self.n_buses += 1
+        return self.n_buses - 1
+
+    def add_line(self, from_bus, to_bus, r, x, b=0.0):
+        """
+        Agrega una línea (modelo pi)
+
+        Parameters:
+        -----------
+        from_bus, to_bus : int
+            Barras que conecta la línea
+        r, x : float
+            Resistencia y reactancia serie (Ω)
+        b : float
+            Susceptancia total en derivación (S), repartida en ambos extremos
+        """
+        self.lines.append((from_bus, to_bus, r, x, b))
+
+    def add_generator(self, bus, generator):
+        """Conecta un SynchronousGenerator a una barra"""
+        self.generators.append((bus, generator))
+
+    def add_load(self, bus, load):
+        """Conecta una carga (Load) a una barra"""
+        self.loads.append((bus, load))
+
+    def build_ybus(self, include_generators=True):
+        """
+        Construye la matriz de admitancias de barra dispersa
+
+        Parameters:
+        -----------
+        include_generators : bool
+            Si es True incluye la admitancia 1/(RA + jXS) de cada generador
+            como derivación en su barra (la EA se trata como inyección)
+
+        Returns:
+        --------
+        scipy.sparse.csr_matrix
+            Ybus compleja (n_barras x n_barras)
+        """
+        n = self.n_buses
+        rows, cols, values = [], [], []
+
+        if self.lines:
+            f, t, r, x, b = (np.array(column) for column in zip(*self.lines))
+            f = f.astype(np.intp)
+            t = t.astype(np.intp)
+            y_series = 1 / (r + 1j * x)
+            y_shunt = 0.5j * b
+            rows += [f, t, f, t]
+            cols += [f, t, t, f]
+            values += [y_series + y_shunt, y_series + y_shunt, -y_series, -y_series]
+
+        shunt = np.zeros(n, dtype=complex)
+        for bus, load in self.loads:
+            shunt[bus] += load.calculate_admittance()
+        if include_generators:
+            for bus, generator in self.generators:
+                shunt[bus] += 1 / complex(generator.ra, generator.xs)
+        rows.append(np.arange(n))
+        cols.append(np.arange(n))
+        values.append(shunt)
+
+        return sparse.csr_matrix(
+            (np.concatenate(values), (np.concatenate(rows), np.concatenate(cols))),
+            shape=(n, n)
+        )
+
+    def _compile(self):
+        """Precalcula la Ybus real por bloques y el patrón de la jacobiana"""
+        nb = self.n_buses
+        ng = len(self.generators)
+        if ng == 0:
+            raise ValueError("La red necesita al menos un generador")
+
+        self._gen_bus = np.array([bus for bus, _ in self.generators], dtype=np.intp)
+        gens = [generator for _, generator in self.generators]
+        self._ea = np.array([g.get_ea_from_if(g.if_op) for g in gens], dtype=float)
+        self._y_gen = 1 / np.array([complex(g.ra, g.xs) for g in gens])
+        self._p_target = np.array([g.power_target for g in gens], dtype=float)[1:]
+        self._p_scale = np.maximum(1.0, np.abs(self._p_target))
+
+        # Ybus como matriz real de bloques 2x2: [[G, -B], [B, G]]
+        ybus = self.build_ybus().tocoo()
+        g, b = ybus.data.real, ybus.data.imag
+        i, j = ybus.row, ybus.col
+        y_rows = np.concatenate([2 * i, 2 * i, 2 * i + 1, 2 * i + 1])
+        y_cols = np.concatenate([2 * j, 2 * j + 1, 2 * j, 2 * j + 1])
+        y_values = np.concatenate([g, -b, b, g])
+        self._ybus_real = sparse.csr_matrix((y_values, (y_rows, y_cols)), shape=(2 * nb, 2 * nb))
+
+        # Entradas variables: inyecciones respecto a delta y filas de potencia
+        k = np.arange(1, ng)
+        bus = self._gen_bus[k]
+        col_delta = 2 * nb + k - 1
+        row_power = 2 * nb + k - 1
+        var_rows = np.concatenate([2 * bus, 2 * bus + 1, row_power, row_power, row_power])
+        var_cols = np.concatenate([col_delta, col_delta, 2 * bus, 2 * bus + 1, col_delta])
+
+        size = 2 * nb + ng - 1
+        rows = np.concatenate([y_rows, var_rows])
+        cols = np.concatenate([y_cols, var_cols])
+        order = np.arange(1, len(rows) + 1, dtype=float)
+        jac = sparse.csc_matrix((order, (rows, cols)), shape=(size, size))
+        jac.sum_duplicates()
+        position = np.empty(len(rows), dtype=np.intp)
+        position[jac.data.astype(np.intp) - 1] = np.arange(len(rows))
+        jac.data[position[:len(y_rows)]] = y_values
+        self._jacobian = jac
+        self._var_position = position[len(y_rows):]
+        self._n_variables = size
+
+    def _injections(self, x):
+        """EA de cada generador (delta = 0 para la referencia)"""
+        delta = np.concatenate([[0.0], x[2 * self.n_buses:]])
+        return self._ea * np.exp(1j * delta)
+
+    def residual(self, x):
+        """Ley de Kirchhoff en cada barra y potencia activa de los generadores"""
+        nb = self.n_buses
+        out = np.empty(self._n_variables)
+        out[:2 * nb] = self._ybus_real @ x[:2 * nb]
+
+        current = self._y_gen * self._injections(x)
+        np.subtract.at(out, 2 * self._gen_bus, current.real)
+        np.subtract.at(out, 2 * self._gen_bus + 1, current.imag)
+
+        out[2 * nb:] = (self._generator_power(x)[1:] - self._p_target) / self._p_scale
+        return out
+
+    def _generator_power(self, x):
+        """Potencia activa interna P = Re(EA * conj(IA)) de cada generador"""
+        ea = self._injections(x)
+        v = x[2 * self._gen_bus] + 1j * x[2 * self._gen_bus + 1]
+        return (ea * np.conj(self._y_gen * (ea - v))).real
+
+    def jacobian(self, x):
+        """Jacobiana dispersa (CSC) con patrón fijo"""
+        ea = self._injections(x)[1:]
+        y = self._y_gen[1:]
+        bus = self._gen_bus[1:]
+        v_real, v_imag = x[2 * bus], x[2 * bus + 1]
+        scale = self._p_scale
+
+        # Derivada de la inyección y*EA respecto a delta: j*y*EA
+        injection = y * ea
+        # P = |EA|^2 Re(y) - Re(w * conj(V)), con w = EA * conj(y)
+        w = ea * np.conj(y)
+
+        self._jacobian.data[self._var_position] = np.concatenate([
+            injection.imag,
+            -injection.real,
+            -w.real / scale,
+            -w.imag / scale,
+            (w.imag * v_real - w.real * v_imag) / scale
+        ])
+        return self._jacobian
+
+    def solve(self, initial_guess=None, tol=1e-8, max_iter=30):
+        """
+        Resuelve las tensiones de barra con Newton-Raphson disperso
+
+        Parameters:
+        -----------
+        initial_guess : array_like, optional
+            Vector [V_real, V_imag por barra..., delta de los generadores
+            2..N]; por defecto tensión nominal de fase en todas las barras
+        tol : float
+            Tolerancia sobre la norma infinito del residuo
+        max_iter : int
+            Número máximo de iteraciones
+
+        Returns:
+        --------
+        dict
+            Tensiones de barra, corrientes y potencias de generadores,
+            cargas y líneas, e información de convergencia
+        """
+        self._compile()
+        nb = self.n_buses
+        if initial_guess is None:
+            initial_guess = np.zeros(self._n_variables)
+            initial_guess[0:2 * nb:2] = self.generators[0][1].v_nom / np.sqrt(3)
+
+        solution = newton_power_flow(self.residual, self.jacobian, initial_guess, tol=tol, max_iter=max_iter)
+        if not solution.success:
+            raise ValueError(f"El flujo de potencia no convergió: {solution.message}")
+        return self._build_results(solution)
+
+    def _build_results(self, solution):
+        """Calcula las cantidades de barras, generadores, cargas y líneas"""
+        x = solution.x
+        nb = self.n_buses
+        v = x[0:2 * nb:2] + 1j * x[1:2 * nb:2]
+
+        ea = self._injections(x)
+        v_gen = v[self._gen_bus]
+        ia = self._y_gen * (ea - v_gen)
+        s_gen = ea * np.conj(ia)
+
+        load_bus = np.array([bus for bus, _ in self.loads], dtype=np.intp)
+        y_load = np.array([load.calculate_admittance() for _, load in self.loads], dtype=complex)
+        i_load = y_load * v[load_bus]
+
+        results = {
+            "bus_v": v,
+            "bus_v_mag": np.abs(v),
+            "bus_v_angle": np.degrees(np.angle(v)),
+            "gen_bus": self._gen_bus,
+            "gen_ia": ia,
+            "gen_ea": ea,
+            "gen_p": s_gen.real,
+            "gen_q": s_gen.imag,
+            "gen_s": np.abs(s_gen),
+            "gen_delta": np.degrees(np.angle(ea)),
+            "gen_pcu": 3 * np.abs(ia) ** 2 * np.array([g.ra for _, g in self.generators]),
+            "load_bus": load_bus,
+            "load_i": i_load,
+            "load_s": v[load_bus] * np.conj(i_load),
+            "converged": solution.success,
+            "nit": solution.nit,
+            "residual_history": solution.residual_history
+        }
+
+        if self.lines:
+            f, t, r, x_line, b = (np.array(column) for column in zip(*self.lines))
+            f = f.astype(np.intp)
+            t = t.astype(np.intp)
+            i_line = (v[f] - v[t]) / (r + 1j * x_line) + 0.5j * b * v[f]
+            results["line_i"] = i_line
+            results["line_s_from"] = v[f] * np.conj(i_line)
+
+        return results
@@ -0,0 +1,176 @@
+import re
+
+import numpy as np
+from .system import BATCH_GENERATOR_FIELDS, BATCH_SYSTEM_FIELDS
+
+# Cantidades por generador que son idénticas a otra y no se almacenan
+# dos veces: IL = IA (conexión en Y), Tap = Tind (estado estable) y
+# VT = Vφ = tensión común del bus
+GENERATOR_ALIASES = {"il": "ia", "tap": "tind"}
+SYSTEM_ALIASES = {"vt": "vt", "vf": "vt"}
+
+_GENERATOR_KEY = re.compile(r"g(\d+)_(\w+)$")
+
+class ResultsStore:
+    """
+    Contenedor columnar de resultados para muchos puntos de operación
+
+    Guarda un arreglo preasignado por cantidad en lugar de un diccionario
+    de escalares por punto: las cantidades de los generadores tienen forma
+    (n_puntos, N) y las del sistema, (n_puntos,). Las cantidades complejas
+    se guardan como complex128.
+
+    Se accede con las mismas claves que el diccionario de solve():
+    store["g1_p"] es una vista (sin copia) de la potencia del generador 1
+    en todos los puntos, store["p"] la matriz completa y store["vt"] la
+    tensión del bus. Las vistas se pueden escribir, de modo que
+    solve_batch y los barridos llenan el contenedor en su lugar.
+    """
+
+    def __init__(self, n_points, n_generators=2):
+        """
+        Parameters:
+        -----------
+        n_points : int
+            Número de puntos de operación
+        n_generators : int
+            Número de generadores del sistema
+        """
+        self.n_points = int(n_points)
+        self.n_generators = int(n_generators)
+        self.generator_columns = {
+            name: np.zeros((self.n_points, self.n_generators), dtype=dtype)
+            for name, dtype in BATCH_GENERATOR_FIELDS
+            if name not in GENERATOR_ALIASES and name not in SYSTEM_ALIASES
+        }
+        self.system_columns = {
+            name: np.zeros(self.n_points, dtype=dtype)
+            for name, dtype in BATCH_SYSTEM_FIELDS
+        }
+
+    @classmethod
+    def _from_columns(cls, generator_columns, system_columns):
+        store = cls.__new__(cls)
+        store.generator_columns = generator_columns
+        store.system_columns = system_columns
+        store.n_points = len(system_columns["vt"])
+        store.n_generators = generator_columns["p"].shape[1]
+        return store
+
+    def __len__(self):
+        return self.n_points
+
+    def _locate(self, key):
+        """Retorna (columna, índice del generador o None) para una clave"""
+        if key in self.system_columns:
+            return self.system_columns[key], None
+        if key in self.generator_columns:
+            return self.generator_columns[key], None
+
+        match = _GENERATOR_KEY.match(key)
+        if match:
+            k, name = int(match.group(1)) - 1, match.group(2)
+            if not 0 <= k < self.n_generators:
+                raise KeyError(key)
+            if name in SYSTEM_ALIASES:
+                return self.system_columns[SYSTEM_ALIASES[name]], None
+            name = GENERATOR_ALIASES.get(name, name)
+            if name in self.generator_columns:
+                return self.generator_columns[name], k
+        raise KeyError(key)
+
+    def __getitem__(self, key):
+        """
+        Vista de una cantidad ("g1_p", "p", "vt", ...) o, con un slice,
+        un ResultsStore con las filas seleccionadas (también sin copia)
+        """
+        if isinstance(key, slice):
+            return self._from_columns(
+                {name: column[key] for name, column in self.generator_columns.items()},
+                {name: column[key] for name, column in self.system_columns.items()}
+            )
+        column, k = self._locate(key)
+        return column if k is None else column[:, k]
+
+    def __setitem__(self, key, value):
+        column, k = self._locate(key)
+        if k is None:
+            column[...] = value
+        else:
+            column[:, k] = value
+
+    def generator(self, k):
+        """
+        Vistas (sin copia) de todas las cantidades del generador k (desde 1)
+
+        Returns:
+        --------
+        dict
+            Cantidad -> arreglo (n_puntos,), con las claves sin el prefijo gK_
+        """
+        if not 1 <= k <= self.n_generators:
+            raise IndexError(f"Generador fuera de rango: {k}")
+        views = {name: column[:, k - 1] for name, column in self.generator_columns.items()}
+        for alias, name in GENERATOR_ALIASES.items():
+            views[alias] = views[name]
+        for alias, name in SYSTEM_ALIASES.items():
+            views[alias] = self.system_columns[name]
+        return views
+
+    @property
+    def nbytes(self):
+        """Memoria ocupada por los datos (bytes)"""
+        return sum(column.nbytes for column in self.generator_columns.values()) + \
+            sum(column.nbytes for column in self.system_columns.values())
+
+    @property
+    def bytes_per_point(self):
+        """Memoria por punto de operación (bytes)"""
+        return self.nbytes / self.n_points if self.n_points else 0.0
+
+    def write(self, i, results):
+        """
+        Copia en la fila i un diccionario de resultados de solve()
+
+        Parameters:
+        -----------
+        i : int
+            Índice del punto
+        results : dict o None
+            Resultados de solve(); None marca el punto como no convergido
+            (sus cantidades quedan en NaN)
+        """
+        if results is None:
+            for column in (*self.generator_columns.values(), *self.system_columns.values()):
+                column[i] = np.nan if column.dtype.kind in "fc" else 0
+            self.system_columns["converged"][i] = False
+            return
+        for name, column in self.generator_columns.items():
+            for k in range(self.n_generators):
+                column[i, k] = results[f"g{k + 1}_{name}"]
+        for name, column in self.system_columns.items():
+            column[i] = results.get(name, 0)
+        self.system_columns["converged"][i] = results.get("converged", True)
+
+    def to_results(self, i):
+        """
+        Diccionario del punto i con el formato de solve() (para render_results)
+
+        Returns:
+        --------
+        dict
+            Claves gK_*, del sistema y op_point_gK con escalares de Python
+        """
+        results = {}
+        for k in range(1, self.n_generators + 1):
+            for name, column in self.generator(k).items():
+                results[f"g{k}_{name}"] = column[i].item()
+            results[f"op_point_g{k}"] = {
+                "if": results[f"g{k}_if"],
+                "ea": abs(results[f"g{k}_ea"]),
+                "p": results[f"g{k}_p"],
+                "q": results[f"g{k}_q"]
+            }
+        for name, column in self.system_columns.items():
+            results[name] = column[i].item()
+        return results
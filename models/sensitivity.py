@@ -0,0 +1,88 @@
+import numpy as np
+from solvers.equation_system import CompiledSystem
+
+def solution_sensitivities(generators, load, solution):
+    """
+    Sensibilidades de la solución respecto a las entradas del usuario
+
+    Se obtienen por diferenciación implícita de la solución convergida
+    (CompiledSystem.sensitivities, una sola factorización) y la regla de
+    la cadena hasta las entradas físicas:
+
+    - gK_if: EA_k cambia con la pendiente de la curva de magnetización
+    - gK_p_motor: la meta de potencia por fase es 0.9 * p_motor / 3 (cero
+      si un despacho fijó p_target)
+    - r_load, x_load: Y = 1 / (R + jX)
+
+    El ángulo de VT se mantiene fijo, de modo que las derivadas de delta
+    son las del ángulo respecto a VT. Cada columna equivale a re-solver el
+    sistema con la entrada perturbada, pero sin ninguna solución no lineal
+    adicional.
+
+    Parameters:
+    -----------
+    generators : sequence of SynchronousGenerator
+        Generadores del sistema
+    load : Load
+        Carga conectada a los generadores
+    solution : array_like
+        Vector solución en el orden de CompiledSystem
+
+    Returns:
+    --------
+    dict
+        inputs: nombres de las M = 2N + 2 entradas (g1_if, ..., gN_if,
+        g1_p_motor, ..., gN_p_motor, r_load, x_load) y, con una columna por
+        entrada:
+        p, q : ndarray (N, M) - potencias activa y reactiva (W, var)
+        delta : ndarray (N, M) - ángulo de potencia (grados)
+        ia : ndarray complejo (N, M) - corriente de armadura
+        vt : ndarray complejo (M,) - tensión en terminales
+        vt_mag : ndarray (M,) - magnitud de la tensión en terminales
+    """
+    generators = list(generators)
+    n = len(generators)
+    x = np.asarray(solution, dtype=float)
+    compiled = CompiledSystem(generators, load)
+    d_state = compiled.sensitivities(x)
+
+    # Regla de la cadena: parámetros internos (EA, meta de P, G, B) -> entradas
+    k = np.arange(n)
+    chain = np.zeros((2 * n + 2, 2 * n + 2))
+    chain[k, k] = [g.magnetization.derivative(g.if_op) for g in generators]
+    # Igual que SynchronousGenerator.power_target
+    chain[n + k, n + k] = [0.9 / 3 if g.p_target is None else 0.0 for g in generators]
+    z = load.calculate_impedance()
+    dy_dr, dy_dx = -1 / z ** 2, -1j / z ** 2
+    chain[2 * n:, 2 * n] = dy_dr.real, dy_dr.imag
+    chain[2 * n:, 2 * n + 1] = dy_dx.real, dy_dx.imag
+    d_state = d_state @ chain
+    d_ea = chain[:n]
+
+    ia_real, ia_imag = x[0:2 * n:2, None], x[1:2 * n:2, None]
+    delta = x[2 * n + 2:, None]
+    ea = compiled.ea[:, None]
+    cos, sin = np.cos(delta), np.sin(delta)
+    d_real, d_imag = d_state[0:2 * n:2], d_state[1:2 * n:2]
+    d_delta = d_state[2 * n + 2:]
+
+    # P = EA (cos δ Re IA + sen δ Im IA),  Q = EA (sen δ Re IA - cos δ Im IA)
+    p_unit = cos * ia_real + sin * ia_imag
+    q_unit = sin * ia_real - cos * ia_imag
+    d_p = ea * (cos * d_real + sin * d_imag - q_unit * d_delta) + p_unit * d_ea
+    d_q = ea * (sin * d_real - cos * d_imag + p_unit * d_delta) + q_unit * d_ea
+
+    vt = complex(x[2 * n], x[2 * n + 1])
+    d_vt = d_state[2 * n] + 1j * d_state[2 * n + 1]
+    labels = ([f"g{i}_if" for i in range(1, n + 1)]
+              + [f"g{i}_p_motor" for i in range(1, n + 1)]
+              + ["r_load", "x_load"])
+    return {
+        "inputs": labels,
+        "p": d_p,
+        "q": d_q,
+        "delta": np.degrees(d_delta),
+        "ia": d_real + 1j * d_imag,
+        "vt": d_vt,
+        "vt_mag": np.real(np.conj(vt) * d_vt) / abs(vt) if vt != 0 else np.zeros(2 * n + 2)
+    }
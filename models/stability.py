@@ -0,0 +1,141 @@
+import numpy as np
+from .transient import Event, SwingSimulator
+
+def pull_out_margin(generators, results):
+    """
+    Margen de estabilidad en estado estable de cada generador
+
+    Para una máquina conectada al bus la potencia interna es
+
+        P = |EA|² cos θ / |Z| - |EA| |VT| cos(θ + δ) / |Z|,  θ = ∠(RA + jXS)
+
+    con δ el ángulo de EA respecto a VT. Es máxima (ángulo de pérdida de
+    sincronismo) en δ = 180° - θ, que es 90° si RA = 0.
+
+    Parameters:
+    -----------
+    generators : sequence of SynchronousGenerator
+        Generadores del sistema
+    results : dict, ResultsStore o ndarray estructurado
+        Resultados de solve(), solve_batch() o sweep() (gK_ea, gK_p y vt)
+
+    Returns:
+    --------
+    dict
+        Por generador: gK_load_angle (δ respecto a VT), gK_pull_out_angle,
+        gK_angle_margin (grados) y gK_p_max, gK_power_margin (W)
+    """
+    vt = np.asarray(results["vt"], dtype=complex)
+    margins = {}
+    for k, generator in enumerate(generators, start=1):
+        ea = np.asarray(results[f"g{k}_ea"], dtype=complex)
+        z = complex(generator.ra, generator.xs)
+        theta = np.angle(z)
+        load_angle = np.angle(ea * np.conj(vt))
+        pull_out = np.pi - theta
+        p_max = (np.abs(ea) ** 2 * np.cos(theta) + np.abs(ea) * np.abs(vt)) / abs(z)
+        margins.update({
+            f"g{k}_load_angle": np.degrees(load_angle),
+            f"g{k}_pull_out_angle": np.degrees(pull_out) + np.zeros_like(load_angle),
+            f"g{k}_angle_margin": np.degrees(pull_out - load_angle),
+            f"g{k}_p_max": p_max,
+            f"g{k}_power_margin": p_max - np.asarray(results[f"g{k}_p"], dtype=float)
+        })
+    return margins
+
+def critical_clearing_time(simulator, t_max=1.0, tol=1e-3, candidates=8, y_fault=1e4,
+                           t_after=2.0, method="rk4", dt=1e-3, chunk_size=None, speed_limit=0.05):
+    """
+    Tiempo crítico de despeje de una falla en el bus para cada escenario
+
+    La falla (admitancia y_fault en el bus) se aplica en t = 0 y se
+    despeja en t_c. Se busca el mayor t_c que conserva la estabilidad
+    (separación angular menor que π y velocidad dentro de speed_limit,
+    evaluadas en cada paso; ver SwingSimulator.simulate) con una
+    bisección generalizada: en cada ronda se simulan a la vez
+    `candidates` tiempos de despeje repartidos en el intervalo de cada
+    escenario (todos los escenarios y candidatos en un solo lote), y el
+    intervalo se reduce al tramo entre el último candidato estable y el
+    primero inestable, es decir, un factor candidates + 1 por ronda.
+
+    Parameters:
+    -----------
+    simulator : SwingSimulator
+        Con un estado inicial común o uno por escenario (from_results)
+    t_max : float
+        Mayor tiempo de despeje considerado (s)
+    tol : float
+        Ancho final del intervalo de búsqueda (s)
+    candidates : int
+        Tiempos de despeje simulados por escenario en cada ronda
+    y_fault : complex
+        Admitancia de la falla (S)
+    t_after : float
+        Tiempo simulado después del mayor despeje de la ronda (s)
+    method, dt :
+        Integrador de SwingSimulator.simulate
+    chunk_size : int, optional
+        Escenarios por lote (limita la memoria); por defecto todos
+    speed_limit : float
+        Desviación de velocidad máxima respecto a la síncrona (por unidad)
+
+    Returns:
+    --------
+    ndarray (B,)
+        Tiempo crítico de despeje (límite inferior, con error menor que
+        tol); inf si el sistema es estable aun con t_max y 0 si no lo es
+        con el despeje más rápido
+    """
+    b = simulator.n_scenarios or 1
+    chunk_size = chunk_size or b
+    cct = np.empty(b)
+    for start in range(0, b, chunk_size):
+        stop = min(start + chunk_size, b)
+        cct[start:stop] = _bisect_chunk(
+            _select(simulator, slice(start, stop)), stop - start, t_max, tol, candidates,
+            y_fault, t_after, method, dt, speed_limit
+        )
+    return cct
+
+def _select(simulator, rows):
+    """Simulador con los escenarios rows (o el mismo si es común)"""
+    if simulator.n_scenarios is None:
+        return simulator
+    selected = simulator.repeat(1)
+    for name in ("ea0", "delta0", "p_m", "r_load0", "x_load0"):
+        setattr(selected, name, getattr(selected, name)[rows])
+    return selected
+
+def _bisect_chunk(simulator, b, t_max, tol, candidates, y_fault, t_after, method, dt, speed_limit):
+    low = np.zeros(b)
+    high = np.full(b, t_max)
+    beyond = np.zeros(b, dtype=bool)  # Estable aun con t_max
+    first = True
+    while True:
+        # Solo se simulan los escenarios cuyo intervalo no ha convergido
+        active = np.flatnonzero(~beyond & (high - low > tol))
+        if active.size == 0:
+            break
+        subset = simulator if active.size == b else _select(simulator, active)
+        # Candidatos: en la primera ronda incluyen t_max
+        fractions = np.arange(1, candidates + 1) / (candidates if first else candidates + 1)
+        times = low[active, None] + (high - low)[active, None] * fractions
+        result = subset.repeat(candidates).simulate(
+            times.max() + t_after,
+            [Event(0.0, y_fault=y_fault), Event(times.reshape(-1), y_fault=0.0)],
+            dt=dt, dt_out=max(dt, 1e-2), method=method, store=False, speed_limit=speed_limit
+        )
+        stable = result.stable.reshape(active.size, candidates)
+
+        # Primer candidato inestable de cada escenario (candidates si no hay)
+        unstable = ~stable
+        first_unstable = np.where(unstable.any(axis=1), unstable.argmax(axis=1), candidates)
+        rows = np.arange(active.size)
+        low[active] = np.where(first_unstable > 0, times[rows, np.maximum(first_unstable - 1, 0)],
+                               low[active])
+        high[active] = np.where(first_unstable < candidates,
+                                times[rows, np.minimum(first_unstable, candidates - 1)], high[active])
+        if first:
+            beyond = first_unstable == candidates
+        first = False
+    return np.where(beyond, np.inf, low)
@@ -0,0 +1,296 @@
+import json
+import os
+
+import numpy as np
+from .cache import params_key
+from .system import GeneratorSystem
+
+# Ejes de la malla: (generador, parámetro) o ("load", parámetro)
+SURROGATE_AXES = [
+    ("generator1", "if_op"), ("generator2", "if_op"),
+    ("generator1", "p_motor"), ("generator2", "p_motor"),
+    ("load", "r_load"), ("load", "x_load")
+]
+
+# Cantidades aproximadas. Los ángulos delta se miden respecto a VT: el
+# ángulo absoluto depende de la referencia que elija el solucionador y no
+# es una función suave de los parámetros
+SURROGATE_OUTPUTS = ["g1_p", "g1_q", "g1_delta", "g2_p", "g2_q", "g2_delta", "vt"]
+
+# Semiancho relativo por defecto de cada eje alrededor del valor actual
+DEFAULT_SPANS = {"if_op": 0.25, "p_motor": 0.5, "r_load": 0.5, "x_load": 0.5}
+
+def surrogate_key(params):
+    """
+    Clave de la pareja de máquinas: todos los parámetros salvo los ejes de
+    la malla (if_op, p_motor y la carga)
+    """
+    machines = {}
+    for name in ("generator1", "generator2"):
+        machines[name] = {k: v for k, v in params[name].items() if k not in ("if_op", "p_motor")}
+    return params_key(machines)
+
+def default_axes(params, nodes=7):
+    """
+    Ejes por defecto alrededor del punto de operación actual
+
+    Parameters:
+    -----------
+    params : dict
+        Parámetros con el formato de render_sidebar
+    nodes : int o sequence
+        Nodos por eje (uno para todos o uno por eje)
+
+    Returns:
+    --------
+    list of ndarray
+        Valores de cada eje en el orden de SURROGATE_AXES
+    """
+    nodes = np.broadcast_to(nodes, len(SURROGATE_AXES))
+    axes = []
+    for (owner, name), n in zip(SURROGATE_AXES, nodes):
+        value = params[owner][name]
+        if name == "x_load":
+            # La reactancia puede ser nula o capacitiva: el ancho se toma
+            # respecto a su magnitud o a una fracción de la resistencia
+            width = DEFAULT_SPANS[name] * max(abs(value), 0.1 * params["load"]["r_load"])
+        else:
+            width = DEFAULT_SPANS[name] * abs(value)
+        axes.append(np.linspace(value - width, value + width, int(n)))
+    return axes
+
+def _batch(system, points):
+    """Resuelve solve_batch para puntos (..., 6) en el orden de SURROGATE_AXES"""
+    return system.solve_batch(
+        if_op=points[..., 0:2],
+        p_motor=points[..., 2:4],
+        r_load=points[..., 4],
+        x_load=points[..., 5]
+    )
+
+def _outputs(results):
+    """Arreglo (..., len(SURROGATE_OUTPUTS)) con las salidas de un lote"""
+    vt_angle = np.degrees(np.angle(results["vt"]))
+    values = []
+    for key in SURROGATE_OUTPUTS:
+        if key == "vt":
+            values.append(np.abs(results["vt"]))
+        elif key.endswith("_delta"):
+            values.append((results[key] - vt_angle + 180) % 360 - 180)
+        else:
+            values.append(results[key])
+    out = np.stack(values, axis=-1)
+    out[~results["converged"]] = np.nan
+    return out
+
+def build_surrogate(params, path=None, axes=None, nodes=7, n_validation=2000, seed=0):
+    """
+    Construye la superficie de respuesta de una pareja de máquinas
+
+    Resuelve con solve_batch todos los nodos de la malla y estima las
+    cotas de error comparando la interpolación con soluciones exactas en
+    n_validation puntos aleatorios dentro de la malla.
+
+    Parameters:
+    -----------
+    params : dict
+        Parámetros con el formato de render_sidebar
+    path : str, optional
+        Si se indica, se guarda con save(path)
+    axes : list of array_like, optional
+        Valores de cada eje (orden de SURROGATE_AXES); por defecto default_axes
+    nodes : int o sequence
+        Nodos por eje cuando no se indican los ejes
+    n_validation : int
+        Puntos aleatorios para estimar el error
+    seed : int
+        Semilla de los puntos de validación
+
+    Returns:
+    --------
+    OperatingPointSurrogate
+    """
+    if axes is None:
+        axes = default_axes(params, nodes)
+    axes = [np.asarray(axis, dtype=float) for axis in axes]
+    system = GeneratorSystem(params)
+
+    grid = np.stack(np.meshgrid(*axes, indexing="ij"), axis=-1)
+    values = _outputs(_batch(system, grid))
+
+    surrogate = OperatingPointSurrogate(axes, values, key=surrogate_key(params))
+
+    # Cotas de error en puntos aleatorios
+    rng = np.random.default_rng(seed)
+    points = np.column_stack([rng.uniform(axis[0], axis[-1], n_validation) for axis in axes])
+    exact = _outputs(_batch(system, points))
+    error = np.abs(surrogate(points) - exact)
+    valid = ~np.isnan(error).any(axis=1)
+    surrogate.error_max = dict(zip(SURROGATE_OUTPUTS, np.max(error[valid], axis=0).tolist()))
+    surrogate.error_p99 = dict(zip(SURROGATE_OUTPUTS, np.percentile(error[valid], 99, axis=0).tolist()))
+    surrogate.n_validation = int(valid.sum())
+
+    if path is not None:
+        surrogate.save(path)
+    return surrogate
+
+
+class OperatingPointSurrogate:
+    """
+    Interpolación multilineal de P, Q, delta y |VT| sobre una malla
+    regular de (if_op, p_motor) de ambos generadores y (R, X) de la carga
+
+    Los valores se guardan en un archivo .npy (que se puede abrir como
+    memmap) y los ejes, las cotas de error y la clave de las máquinas en
+    un archivo .json al lado.
+    """
+
+    def __init__(self, axes, values, key=None, error_max=None, error_p99=None, n_validation=0):
+        """
+        Parameters:
+        -----------
+        axes : list of ndarray
+            Valores de cada eje (orden de SURROGATE_AXES)
+        values : ndarray (*forma de la malla, len(SURROGATE_OUTPUTS))
+            Salidas en cada nodo (NaN donde el sistema no convergió)
+        key : str, optional
+            surrogate_key de las máquinas
+        error_max, error_p99 : dict, optional
+            Error absoluto máximo y percentil 99 por salida
+        n_validation : int
+            Puntos usados para estimar el error
+        """
+        self.axes = [np.asarray(axis, dtype=float) for axis in axes]
+        self.values = values
+        self.key = key
+        self.error_max = error_max or {}
+        self.error_p99 = error_p99 or {}
+        self.n_validation = n_validation
+        self._interpolant = None
+
+    def __call__(self, points):
+        """
+        Evalúa la interpolación
+
+        Parameters:
+        -----------
+        points : array_like (..., 6)
+            Puntos en el orden de SURROGATE_AXES
+
+        Returns:
+        --------
+        ndarray (..., len(SURROGATE_OUTPUTS))
+            NaN fuera de la malla o cerca de nodos sin convergencia
+        """
+        if self._interpolant is None:
+            from scipy.interpolate import RegularGridInterpolator
+            self._interpolant = RegularGridInterpolator(
+                self.axes, self.values, bounds_error=False, fill_value=np.nan
+            )
+        return self._interpolant(points)
+
+    def _interpolate_point(self, point):
+        """
+        Interpolación multilineal de un solo punto
+
+        Lee solo el bloque de 2^6 nodos de la celda que contiene el punto
+        (con memmap, unas pocas páginas del archivo) y evita el costo fijo
+        de RegularGridInterpolator. Retorna None fuera de la malla.
+        """
+        index = []
+        weights = []
+        for axis, value in zip(self.axes, point):
+            if not axis[0] <= value <= axis[-1]:
+                return None
+            i = min(int(np.searchsorted(axis, value, side="right")) - 1, len(axis) - 2)
+            t = (value - axis[i]) / (axis[i + 1] - axis[i])
+            index.append(slice(i, i + 2))
+            weights.append(np.array([1.0 - t, t]))
+        block = np.asarray(self.values[tuple(index)])
+        for w in weights:
+            # Contrae el primer eje restante con los pesos de la celda
+            block = np.tensordot(w, block, axes=1)
+        return block
+
+    def point(self, params):
+        """Punto de la malla correspondiente a un diccionario de parámetros"""
+        return np.array([params[owner][name] for owner, name in SURROGATE_AXES], dtype=float)
+
+    def matches(self, params):
+        """True si la superficie corresponde a las máquinas de params"""
+        return self.key == surrogate_key(params)
+
+    def evaluate(self, params):
+        """
+        Aproxima el punto de operación de params
+
+        Returns:
+        --------
+        dict o None
+            Salida -> (valor, cota de error máxima), o None si el punto
+            está fuera de la malla o no hay aproximación válida
+        """
+        values = self._interpolate_point(self.point(params))
+        if values is None or np.isnan(values).any():
+            return None
+        return {
+            key: (float(value), self.error_max.get(key, np.nan))
+            for key, value in zip(SURROGATE_OUTPUTS, values)
+        }
+
+    def save(self, path):
+        """Guarda path.npy (valores) y path.json (ejes, cotas y metadatos)"""
+        np.save(path + ".npy", np.ascontiguousarray(self.values))
+        metadata = {
+            "key": self.key,
+            "axes": [[owner, name] for owner, name in SURROGATE_AXES],
+            "axis_values": [axis.tolist() for axis in self.axes],
+            "outputs": SURROGATE_OUTPUTS,
+            "error_max": self.error_max,
+            "error_p99": self.error_p99,
+            "n_validation": self.n_validation
+        }
+        with open(path + ".json", "w") as f:
+            json.dump(metadata, f, indent=1)
+
+    @classmethod
+    def load(cls, path, mmap=True):
+        """
+        Carga una superficie guardada con save()
+
+        Parameters:
+        -----------
+        path : str
+            Ruta sin extensión
+        mmap : bool
+            Si es True los valores se abren como memmap de solo lectura
+        """
+        with open(path + ".json") as f:
+            metadata = json.load(f)
+        if metadata["outputs"] != SURROGATE_OUTPUTS:
+            raise ValueError(f"Salidas incompatibles en {path}.json")
+        values = np.load(path + ".npy", mmap_mode="r" if mmap else None)
+        return cls(
+            metadata["axis_values"], values,
+            key=metadata["key"],
+            error_max=metadata["error_max"],
+            error_p99=metadata["error_p99"],
+            n_validation=metadata["n_validation"]
+        )
+
+def surrogate_path(directory, params):
+    """Ruta (sin extensión) de la superficie de las máquinas de params en directory"""
+    return os.path.join(directory, "surrogate_" + surrogate_key(params)[:16])
+
+def find_surrogate(directory, params, mmap=True):
+    """
+    Busca en directory la superficie de las máquinas de params
+
+    Returns:
+    --------
+    OperatingPointSurrogate o None
+    """
+    path = surrogate_path(directory, params)
+    if not os.path.exists(path + ".json"):
+        return None
+    return OperatingPointSurrogate.load(path, mmap=mmap)
@@ -0,0 +1,298 @@
+import os
+import threading
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+
+import numpy as np
+
+from .system import GeneratorSystem
+
+# Sistema del proceso de trabajo (construido una sola vez por el inicializador)
+_worker_system = None
+
+def _init_worker(base_params):
+    """Construye el GeneratorSystem base en cada proceso de trabajo"""
+    global _worker_system
+    _worker_system = GeneratorSystem(base_params)
+
+def _resolve(system, parameter):
+    """Retorna (objeto, atributo) para un parámetro "generatorK.attr" o "load.attr\""""
+    owner_name, attribute = parameter.split(".")
+    owner = getattr(system, owner_name)
+    if not hasattr(owner, attribute):
+        raise ValueError(f"Parámetro desconocido: {parameter}")
+    return owner, attribute
+
+def solve_with_overrides(system, overrides, initial_guess=None):
+    """
+    Resuelve el sistema con algunos parámetros modificados temporalmente
+
+    Parameters:
+    -----------
+    system : GeneratorSystem
+        Sistema base (se restaura al terminar)
+    overrides : dict
+        Valores a aplicar, con claves "generatorK.attr" o "load.attr"
+        como en GeneratorSystem.sweep
+    initial_guess : array_like, optional
+        Estimación inicial (por defecto la heurística de solve())
+
+    Returns:
+    --------
+    dict o None
+        Resultados de solve(), o None si el sistema no convergió
+    """
+    applied = []
+    try:
+        for parameter, value in overrides.items():
+            owner, attribute = _resolve(system, parameter)
+            applied.append((owner, attribute, getattr(owner, attribute)))
+            setattr(owner, attribute, value)
+        try:
+            return system.solve(initial_guess=initial_guess)
+        except ValueError:
+            return None
+    finally:
+        for owner, attribute, original in reversed(applied):
+            setattr(owner, attribute, original)
+
+def _align_reference(x, n):
+    """
+    Gira todos los fasores de la solución x para que VT sea real
+
+    La referencia angular del sistema es arbitraria (la fija el punto de
+    partida); girar la estimación evita que el ángulo de VT se acumule de
+    un punto al siguiente.
+    """
+    x = np.array(x, dtype=float)
+    theta = np.arctan2(x[2 * n + 1], x[2 * n])
+    rotation = np.exp(-1j * theta)
+    ia = (x[0:2 * n:2] + 1j * x[1:2 * n:2]) * rotation
+    x[0:2 * n:2], x[1:2 * n:2] = ia.real, ia.imag
+    x[2 * n], x[2 * n + 1] = np.hypot(x[2 * n], x[2 * n + 1]), 0.0
+    x[2 * n + 2:] -= theta
+    return x
+
+def solve_points(system, chunk):
+    """
+    Resuelve en orden una lista de (índice, overrides)
+
+    Cada punto parte de la solución del anterior, como en
+    GeneratorSystem.sweep, girada para que VT sea real como en la
+    estimación heurística. Si con ella Newton no converge (el solucionador
+    recurre a otro método o falla), el punto se repite desde la
+    estimación heurística, de modo que un punto lejano del anterior no
+    queda peor que con un arranque en frío. Las magnitudes, potencias y
+    ángulos respecto a VT no dependen del arranque; los ángulos absolutos
+    (gK_delta, fase de vt) sí, igual que entre dos arranques en frío.
+
+    Parameters:
+    -----------
+    system : GeneratorSystem
+        Sistema base (ver solve_with_overrides)
+    chunk : list of tuple
+        Pares (índice, overrides) en el orden en que se resuelven
+
+    Returns:
+    --------
+    list
+        (índice, dict de resultados o None si no convergió) de cada punto
+    """
+    results = []
+    guess = None
+    n = len(system.generators)
+    for index, overrides in chunk:
+        point = None
+        if guess is not None:
+            point = solve_with_overrides(system, overrides, initial_guess=guess)
+            if point is not None and system.last_solution.method != "newton":
+                point = None
+        if point is None:
+            point = solve_with_overrides(system, overrides)
+        guess = None if point is None else _align_reference(system.last_solution.x, n)
+        results.append((index, point))
+    return results
+
+def _solve_chunk(chunk):
+    """Resuelve en el proceso de trabajo una lista de (índice, overrides)"""
+    return solve_points(_worker_system, chunk)
+
+
+class SweepRunner:
+    """
+    Ejecuta estudios de muchos puntos (Monte Carlo, barridos) en paralelo
+
+    Los conjuntos de parámetros se agrupan en bloques que se envían a un
+    ProcessPoolExecutor. Cada proceso construye una sola vez el
+    GeneratorSystem base y aplica a él las modificaciones de cada punto,
+    de modo que solo viajan entre procesos los diccionarios de cambios y
+    los resultados. Dentro de cada bloque los puntos se resuelven en
+    orden partiendo de la solución del anterior (ver solve_points); el
+    primero de cada bloque arranca en frío, por lo que conviene ordenar
+    los puntos de modo que los vecinos sean parecidos.
+    """
+
+    def __init__(self, base_params, max_workers=None, chunk_size=None):
+        """
+        Parameters:
+        -----------
+        base_params : dict
+            Parámetros del sistema base (formato de render_sidebar)
+        max_workers : int, optional
+            Número de procesos; por defecto os.cpu_count(). Con 1 se
+            resuelve en el proceso actual sin crear el grupo de procesos
+        chunk_size : int, optional
+            Puntos por bloque; por defecto se reparten unos cuatro bloques
+            por proceso
+        """
+        self.base_params = base_params
+        self.max_workers = max_workers or os.cpu_count() or 1
+        self.chunk_size = chunk_size
+        self.failed = 0
+        self._cancel = threading.Event()
+        self._executor = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def _get_executor(self):
+        if self._executor is None:
+            self._executor = ProcessPoolExecutor(
+                max_workers=self.max_workers,
+                initializer=_init_worker,
+                initargs=(self.base_params,)
+            )
+        return self._executor
+
+    def close(self):
+        """Termina los procesos de trabajo"""
+        if self._executor is not None:
+            self._executor.shutdown(wait=True, cancel_futures=True)
+            self._executor = None
+
+    def cancel(self):
+        """Pide detener la ejecución en curso (se puede llamar desde otro hilo)"""
+        self._cancel.set()
+
+    @property
+    def cancelled(self):
+        return self._cancel.is_set()
+
+    def _chunks(self, overrides):
+        size = self.chunk_size or max(1, -(-len(overrides) // (4 * self.max_workers)))
+        for start in range(0, len(overrides), size):
+            yield [(start + i, o) for i, o in enumerate(overrides[start:start + size])]
+
+    def imap(self, overrides, ordered=True, progress=None):
+        """
+        Resuelve cada conjunto de parámetros y entrega los resultados a
+        medida que están disponibles
+
+        Parameters:
+        -----------
+        overrides : list of dict
+            Cambios respecto al sistema base de cada punto, por ejemplo
+            {"generator1.ra": 0.012, "load.r_load": 90.0}
+        ordered : bool
+            Si es True los resultados se entregan en el orden de overrides;
+            si es False, en el orden en que terminan los bloques
+        progress : callable, optional
+            Se llama como progress(completados, total) tras cada bloque
+
+        Yields:
+        -------
+        tuple
+            (índice del punto, dict de resultados o None si no convergió)
+        """
+        overrides = list(overrides)
+        total = len(overrides)
+        self._cancel.clear()
+        self.failed = 0
+        done = 0
+
+        if self.max_workers == 1:
+            system = GeneratorSystem(self.base_params)
+            for chunk in self._chunks(overrides):
+                if self._cancel.is_set():
+                    return
+                for index, results in solve_points(system, chunk):
+                    self.failed += results is None
+                    yield index, results
+                done += len(chunk)
+                if progress is not None:
+                    progress(done, total)
+            return
+
+        executor = self._get_executor()
+        chunks = self._chunks(overrides)
+        # Se limita el número de bloques en vuelo para poder cancelar pronto
+        in_flight = {}
+        buffered = {}
+        next_chunk = 0
+        submitted = 0
+        try:
+            while True:
+                while not self._cancel.is_set() and len(in_flight) < 2 * self.max_workers:
+                    chunk = next(chunks, None)
+                    if chunk is None:
+                        break
+                    in_flight[executor.submit(_solve_chunk, chunk)] = submitted
+                    submitted += 1
+                if not in_flight or self._cancel.is_set():
+                    return
+
+                finished, _ = wait(in_flight, return_when=FIRST_COMPLETED)
+                for future in finished:
+                    number = in_flight.pop(future)
+                    chunk_results = future.result()
+                    self.failed += sum(results is None for _, results in chunk_results)
+                    done += len(chunk_results)
+                    if progress is not None:
+                        progress(done, total)
+                    if ordered:
+                        buffered[number] = chunk_results
+                    else:
+                        yield from chunk_results
+
+                while next_chunk in buffered:
+                    yield from buffered.pop(next_chunk)
+                    next_chunk += 1
+        finally:
+            for future in in_flight:
+                future.cancel()
+
+    def run(self, overrides, progress=None, out=None):
+        """
+        Resuelve todos los puntos y retorna los resultados en orden
+
+        Parameters:
+        -----------
+        overrides : list of dict
+            Cambios respecto al sistema base de cada punto
+        progress : callable, optional
+            Se llama como progress(completados, total) tras cada bloque
+        out : ResultsStore, optional
+            Contenedor con un punto por conjunto de parámetros; si se indica,
+            cada resultado se copia en él y no se guardan los diccionarios
+
+        Returns:
+        --------
+        list o ResultsStore
+            Resultados de cada punto (None si no convergió o si se canceló
+            antes de resolverlo), o out si se indicó
+        """
+        overrides = list(overrides)
+        if out is not None:
+            if len(out) != len(overrides):
+                raise ValueError(f"out tiene {len(out)} puntos y el estudio {len(overrides)}")
+            out["converged"] = False
+            for index, point in self.imap(overrides, ordered=False, progress=progress):
+                out.write(index, point)
+            return out
+
+        results = [None] * len(overrides)
+        for index, point in self.imap(overrides, ordered=False, progress=progress):
+            results[index] = point
+        return results
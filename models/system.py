@@ -1,94 +1,182 @@
 import numpy as np
+from .capability import check_feasibility
+from .dispatch import EconomicDispatch
 from .generator import SynchronousGenerator
 from .load import Load
-from solvers.equation_system import solve_system
+from .sensitivity import solution_sensitivities
+from .stability import pull_out_margin
+from solvers.equation_system import solve_generators, default_initial_guess
+from solvers.batch_solver import BatchSystem, solve_batch
+
+# Campos por generador de los resultados por lotes (prefijo gK_)
+BATCH_GENERATOR_FIELDS = [
+    ("ia", np.complex128), ("il", np.complex128), ("if", np.float64),
+    ("ea", np.complex128), ("vt", np.complex128), ("vf", np.complex128),
+    ("p", np.float64), ("q", np.float64), ("s", np.float64),
+    ("delta", np.float64), ("tind", np.float64), ("tap", np.float64),
+    ("omega_sinc", np.float64), ("fe", np.float64), ("pcu", np.float64),
+    ("fp", np.float64), ("efficiency", np.float64)
+]
+
+# Campos del sistema y la carga de los resultados por lotes
+BATCH_SYSTEM_FIELDS = [
+    ("vt", np.complex128), ("i_load", np.complex128), ("p_load", np.float64),
+    ("q_load", np.float64), ("s_load", np.float64), ("fp_load", np.float64),
+    ("f", np.float64), ("p_total", np.float64), ("q_total", np.float64),
+    ("losses_total", np.float64), ("converged", np.bool_), ("status", np.int8),
+    ("nit", np.int32)
+]
+
+def batch_result_dtype(n_generators=2):
+    """Tipo estructurado de NumPy con las mismas claves que el diccionario de resultados"""
+    fields = []
+    for k in range(1, n_generators + 1):
+        fields += [(f"g{k}_{name}", dtype) for name, dtype in BATCH_GENERATOR_FIELDS]
+    return np.dtype(fields + BATCH_SYSTEM_FIELDS)
+
+def _safe_divide(num, den, default=0.0):
+    """Divide elemento a elemento retornando default donde den es cero"""
+    out = np.full(np.broadcast(num, den).shape, default, dtype=float)
+    np.divide(num, den, out=out, where=den != 0)
+    return out
+
 
 class GeneratorSystem:
     def __init__(self, params):
         """
-        Inicializa el sistema de dos generadores síncronos en paralelo
+        Inicializa el sistema de generadores síncronos en paralelo
         
         Parameters:
         -----------
         params : dict
-            Diccionario con parámetros para los generadores y la carga
+            Diccionario con parámetros para los generadores y la carga.
+            Los generadores se indican con las claves "generator1",
+            "generator2", ... o con una lista en la clave "generators"
         """
         # Crear instancias de generadores
-        self.generator1 = SynchronousGenerator(params["generator1"])
-        self.generator2 = SynchronousGenerator(params["generator2"])
+        if "generators" in params:
+            generator_params = list(params["generators"])
+        else:
+            generator_params = []
+            while f"generator{len(generator_params) + 1}" in params:
+                generator_params.append(params[f"generator{len(generator_params) + 1}"])
+        
+        self.generators = [SynchronousGenerator(p) for p in generator_params]
+        
+        # Acceso por nombre: generator1, generator2, ...
+        for k, generator in enumerate(self.generators, start=1):
+            setattr(self, f"generator{k}", generator)
         
         # Crear instancia de carga
         self.load = Load(
             params["load"]["r_load"],
             params["load"]["x_load"]
         )
+        
+        # Resultado del solucionador de la última llamada a solve()
+        self.last_solution = None
     
-    def solve(self):
+    def solve(self, initial_guess=None, sensitivities=False):
         """
         Resuelve el sistema completo
         
+        Parameters:
+        -----------
+        initial_guess : array_like, optional
+            Estimación inicial del vector de variables; por defecto se usa
+            la heurística basada en los valores nominales
+        sensitivities : bool
+            Si es True agrega en la clave "sensitivities" las derivadas de
+            P, Q, delta, IA y VT respecto a if_op, p_motor y la carga (ver
+            models.sensitivity.solution_sensitivities), calculadas con una
+            sola factorización en lugar de re-solver por cada entrada
+        
         Returns:
         --------
         dict
             Diccionario con todos los resultados calculados
         """
         # Resolver el sistema de ecuaciones no lineales
-        solution = solve_system(self.generator1, self.generator2, self.load)
-        
-        # Extraer variables de la solución
-        ia1_real, ia1_imag = solution[0], solution[1]
-        ia2_real, ia2_imag = solution[2], solution[3]
-        vt_real, vt_imag = solution[4], solution[5]
-        delta1, delta2 = solution[6], solution[7]
-        
-        # Formar números complejos
-        ia1 = complex(ia1_real, ia1_imag)
-        ia2 = complex(ia2_real, ia2_imag)
-        vt = complex(vt_real, vt_imag)
-        
-        # Calcular EA1 y EA2 usando las curvas de magnetización y los ángulos delta
-        ea1_mag = self.generator1.get_ea_from_if(self.generator1.if_op)
-        ea2_mag = self.generator2.get_ea_from_if(self.generator2.if_op)
-        
-        ea1 = ea1_mag * np.exp(1j * delta1)
-        ea2 = ea2_mag * np.exp(1j * delta2)
-        
-        # Calcular corrientes de línea (asumiendo conexión en Y)
-        il1 = ia1
-        il2 = ia2
-        
-        # Calcular tensiones de fase (asumiendo sistema equilibrado)
-        vf1 = vt
-        vf2 = vt
-        
-        # Calcular potencias de los generadores
-        p1 = (ea1 * np.conj(ia1)).real
-        q1 = (ea1 * np.conj(ia1)).imag
-        s1 = abs(ea1 * np.conj(ia1))
-        
-        p2 = (ea2 * np.conj(ia2)).real
-        q2 = (ea2 * np.conj(ia2)).imag
-        s2 = abs(ea2 * np.conj(ia2))
-        
-        # Calcular velocidad síncrona y frecuencia
-        f1 = self.generator1.f_sc  # Asumimos que operan a la frecuencia especificada
-        f2 = self.generator2.f_sc
-        f = (f1 + f2) / 2  # Frecuencia del sistema
+        self.last_solution = solve_generators(
+            self.generators, self.load,
+            initial_guess=initial_guess, full_output=True
+        )
+        results = self._build_results(self.last_solution.x)
+        if sensitivities:
+            results["sensitivities"] = solution_sensitivities(
+                self.generators, self.load, self.last_solution.x
+            )
+        return results
+    
+    def _build_results(self, solution):
+        """Calcula el diccionario de resultados a partir del vector solución"""
+        n = len(self.generators)
         
-        omega_sinc1 = 2 * np.pi * f1 / (self.generator1.poles / 2)
-        omega_sinc2 = 2 * np.pi * f2 / (self.generator2.poles / 2)
+        # Tensión en terminales (común a todos los generadores)
+        vt = complex(solution[2 * n], solution[2 * n + 1])
         
-        # Calcular torques
-        tind1 = p1 / omega_sinc1
-        tind2 = p2 / omega_sinc2
+        results = {}
+        op_points = {}
+        p_total = 0.0
+        q_total = 0.0
         
-        # Asumimos que el torque aplicado es igual al inducido en estado estable
-        tap1 = tind1
-        tap2 = tind2
+        for k, generator in enumerate(self.generators):
+            prefix = f"g{k + 1}_"
+            
+            # Corriente de armadura y ángulo de potencia del generador
+            ia = complex(solution[2 * k], solution[2 * k + 1])
+            delta = solution[2 * n + 2 + k]
+            
+            # Calcular EA usando la curva de magnetización y el ángulo delta
+            ea_mag = generator.get_ea_from_if(generator.if_op)
+            ea = ea_mag * np.exp(1j * delta)
+            
+            # Calcular potencias del generador
+            s_complex = ea * np.conj(ia)
+            p = s_complex.real
+            q = s_complex.imag
+            s_mag = abs(s_complex)
+            
+            # Calcular velocidad síncrona (asumimos que opera a la frecuencia especificada)
+            omega_sinc = 2 * np.pi * generator.f_sc / (generator.poles / 2)
+            
+            # Calcular torque; en estado estable el aplicado es igual al inducido
+            tind = p / omega_sinc
+            
+            # Calcular pérdidas en el cobre
+            pcu = 3 * (abs(ia) ** 2) * generator.ra
+            
+            results.update({
+                prefix + "ia": ia,
+                prefix + "il": ia,  # Conexión en Y
+                prefix + "if": generator.if_op,
+                prefix + "ea": ea,
+                prefix + "vt": vt,
+                prefix + "vf": vt,  # Sistema equilibrado
+                prefix + "p": p,
+                prefix + "q": q,
+                prefix + "s": s_mag,
+                prefix + "delta": np.degrees(delta),
+                prefix + "tind": tind,
+                prefix + "tap": tind,
+                prefix + "omega_sinc": omega_sinc,
+                prefix + "fe": generator.f_sc,
+                prefix + "pcu": pcu,
+            })
+            
+            # Puntos de operación para gráficas
+            op_points[f"op_point_g{k + 1}"] = {
+                "if": generator.if_op,
+                "ea": abs(ea),
+                "p": p,
+                "q": q
+            }
+            
+            p_total += p
+            q_total += q
         
-        # Calcular pérdidas en el cobre
-        pcu1 = 3 * (abs(ia1) ** 2) * self.generator1.ra
-        pcu2 = 3 * (abs(ia2) ** 2) * self.generator2.ra
+        # Frecuencia del sistema
+        f = float(np.mean([g.f_sc for g in self.generators]))
         
         # Calcular corriente y potencia de carga
         i_load = self.load.calculate_current(vt)
@@ -98,48 +186,8 @@ class GeneratorSystem:
         s_load = abs(s_complex_load)
         fp_load = p_load / s_load if s_load > 0 else 1.0
         
-        # Calcular pérdidas y potencia total
-        p_total = p1 + p2
-        q_total = q1 + q2
-        losses_total = p_total - p_load
-        
-        # Preparar resultados
-        results = {
-            # Generador 1
-            "g1_ia": ia1,
-            "g1_il": il1,
-            "g1_if": self.generator1.if_op,
-            "g1_ea": ea1,
-            "g1_vt": vt,
-            "g1_vf": vf1,
-            "g1_p": p1,
-            "g1_q": q1,
-            "g1_s": s1,
-            "g1_delta": np.degrees(delta1),
-            "g1_tind": tind1,
-            "g1_tap": tap1,
-            "g1_omega_sinc": omega_sinc1,
-            "g1_fe": f1,
-            "g1_pcu": pcu1,
-            
-            # Generador 2
-            "g2_ia": ia2,
-            "g2_il": il2,
-            "g2_if": self.generator2.if_op,
-            "g2_ea": ea2,
-            "g2_vt": vt,
-            "g2_vf": vf2,
-            "g2_p": p2,
-            "g2_q": q2,
-            "g2_s": s2,
-            "g2_delta": np.degrees(delta2),
-            "g2_tind": tind2,
-            "g2_tap": tap2,
-            "g2_omega_sinc": omega_sinc2,
-            "g2_fe": f2,
-            "g2_pcu": pcu2,
-            
-            # Carga y sistema
+        # Carga y sistema
+        results.update({
             "vt": vt,
             "i_load": i_load,
             "p_load": p_load,
@@ -149,86 +197,441 @@ class GeneratorSystem:
             "f": f,
             "p_total": p_total,
             "q_total": q_total,
-            "losses_total": losses_total,
+            "losses_total": p_total - p_load,
+        })
+        results.update(op_points)
+        
+        for k in range(1, n + 1):
+            prefix = f"g{k}_"
             
-            # Puntos de operación para gráficas
-            "op_point_g1": {
-                "if": self.generator1.if_op,
-                "ea": abs(ea1),
-                "p": p1,
-                "q": q1
-            },
-            "op_point_g2": {
-                "if": self.generator2.if_op,
-                "ea": abs(ea2),
-                "p": p2,
-                "q": q2
-            }
-        }
-
-        # Calcular factores de potencia
-        results['g1_fp'] = results['g1_p'] / results['g1_s'] if results['g1_s'] != 0 else 0
-        results['g2_fp'] = results['g2_p'] / results['g2_s'] if results['g2_s'] != 0 else 0
-
-        # Calcular eficiencias (aproximadas, sin pérdidas mecánicas detalladas)
-        results['g1_efficiency'] = results['g1_p'] / (results['g1_p'] + results['g1_pcu']) if (results['g1_p'] + results['g1_pcu']) != 0 else 0
-        results['g2_efficiency'] = results['g2_p'] / (results['g2_p'] + results['g2_pcu']) if (results['g2_p'] + results['g2_pcu']) != 0 else 0
-
+            # Calcular factores de potencia
+            results[prefix + 'fp'] = results[prefix + 'p'] / results[prefix + 's'] if results[prefix + 's'] != 0 else 0
+            
+            # Calcular eficiencias (aproximadas, sin pérdidas mecánicas detalladas)
+            p_in = results[prefix + 'p'] + results[prefix + 'pcu']
+            results[prefix + 'efficiency'] = results[prefix + 'p'] / p_in if p_in != 0 else 0
         
         return results
     
+    def solve_batch(self, if_op=None, p_motor=None, r_load=None, x_load=None, initial_guess=None,
+                    out=None):
+        """
+        Resuelve simultáneamente muchos puntos de operación
+        
+        Los parámetros que no se indiquen toman el valor actual de los
+        generadores y de la carga. Todos se difunden (broadcasting) a una
+        forma común; la última dimensión de if_op y p_motor corresponde al
+        generador.
+        
+        Parameters:
+        -----------
+        if_op : array_like (..., N), optional
+            Corriente de campo de cada generador
+        p_motor : array_like (..., N), optional
+            Potencia trifásica del motor primario de cada generador
+        r_load, x_load : array_like (...), optional
+            Resistencia y reactancia de la carga
+        initial_guess : array_like, optional
+            Estimación inicial común o por punto (..., 3N+2)
+        out : ResultsStore, optional
+            Contenedor (o rebanada de uno) con tantos puntos como la forma
+            común aplanada, donde se escriben los resultados en su lugar
+            
+        Returns:
+        --------
+        ndarray estructurado o ResultsStore
+            Arreglo con la forma común de los parámetros y un campo por cada
+            clave escalar del diccionario de solve() (g1_p, vt, ...), más
+            converged, status y nit; si se indicó out, el mismo out
+        """
+        generators = self.generators
+        n = len(generators)
+        
+        if_op = np.asarray([g.if_op for g in generators] if if_op is None else if_op, dtype=float)
+        # Sin p_motor se usan las metas actuales de los generadores (p_target o 0.9 * p_motor / 3)
+        p_target = np.asarray([g.power_target for g in generators] if p_motor is None else
+                              np.asarray(p_motor, dtype=float) * 0.9 / 3, dtype=float)
+        r_load = np.asarray(self.load.r_load if r_load is None else r_load, dtype=float)
+        x_load = np.asarray(self.load.x_load if x_load is None else x_load, dtype=float)
+        
+        if_op = np.broadcast_to(if_op, if_op.shape[:-1] + (n,)) if if_op.ndim else np.full(n, if_op)
+        p_target = np.broadcast_to(p_target, p_target.shape[:-1] + (n,)) if p_target.ndim else np.full(n, p_target)
+        shape = np.broadcast_shapes(if_op.shape[:-1], p_target.shape[:-1], r_load.shape, x_load.shape)
+        
+        if_op = np.broadcast_to(if_op, shape + (n,)).reshape(-1, n)
+        p_target = np.broadcast_to(p_target, shape + (n,)).reshape(-1, n)
+        z_load = (np.broadcast_to(r_load, shape) + 1j * np.broadcast_to(x_load, shape)).ravel()
+        y_load = 1 / z_load
+        
+        ea_mag = np.column_stack([g.get_ea_from_if(if_op[:, k]) for k, g in enumerate(generators)])
+        system = BatchSystem(
+            ea_mag,
+            [g.ra for g in generators],
+            [g.xs for g in generators],
+            p_target,
+            y_load.real,
+            y_load.imag
+        )
+        
+        if initial_guess is None:
+            initial_guess = default_initial_guess(generators)
+        x0 = np.broadcast_to(np.asarray(initial_guess, dtype=float), shape + (3 * n + 2,)).reshape(-1, 3 * n + 2)
+        
+        if out is not None and len(out) != x0.shape[0]:
+            raise ValueError(f"out tiene {len(out)} puntos y el lote {x0.shape[0]}")
+        
+        x, status, nit = solve_batch(system, x0)
+        results = self._batch_results(generators, x, ea_mag, if_op, y_load, out=out)
+        results["status"] = status
+        results["nit"] = nit
+        results["converged"] = (status >= 1) & (status <= 3)
+        return results if out is not None else results.reshape(shape)
+    
+    def _batch_results(self, generators, x, ea_mag, if_op, y_load, out=None):
+        """
+        Calcula, de forma vectorizada, las mismas cantidades que solve()
+        
+        Escribe en out (ResultsStore o arreglo estructurado) si se indica;
+        en otro caso crea un arreglo estructurado nuevo
+        """
+        n = len(generators)
+        results = np.zeros(x.shape[0], dtype=batch_result_dtype(n)) if out is None else out
+        
+        vt = x[:, 2 * n] + 1j * x[:, 2 * n + 1]
+        f_sys = np.mean([g.f_sc for g in generators])
+        
+        p_total = np.zeros(x.shape[0])
+        q_total = np.zeros(x.shape[0])
+        for k, generator in enumerate(generators):
+            prefix = f"g{k + 1}_"
+            ia = x[:, 2 * k] + 1j * x[:, 2 * k + 1]
+            delta = x[:, 2 * n + 2 + k]
+            ea = ea_mag[:, k] * np.exp(1j * delta)
+            s_complex = ea * np.conj(ia)
+            
+            omega_sinc = 2 * np.pi * generator.f_sc / (generator.poles / 2)
+            pcu = 3 * np.abs(ia) ** 2 * generator.ra
+            
+            results[prefix + "ia"] = ia
+            results[prefix + "il"] = ia
+            results[prefix + "if"] = if_op[:, k]
+            results[prefix + "ea"] = ea
+            results[prefix + "vt"] = vt
+            results[prefix + "vf"] = vt
+            results[prefix + "p"] = s_complex.real
+            results[prefix + "q"] = s_complex.imag
+            results[prefix + "s"] = np.abs(s_complex)
+            results[prefix + "delta"] = np.degrees(delta)
+            results[prefix + "tind"] = s_complex.real / omega_sinc
+            results[prefix + "tap"] = s_complex.real / omega_sinc
+            results[prefix + "omega_sinc"] = omega_sinc
+            results[prefix + "fe"] = generator.f_sc
+            results[prefix + "pcu"] = pcu
+            results[prefix + "fp"] = _safe_divide(s_complex.real, np.abs(s_complex))
+            results[prefix + "efficiency"] = _safe_divide(s_complex.real, s_complex.real + pcu)
+            
+            p_total += s_complex.real
+            q_total += s_complex.imag
+        
+        i_load = vt * y_load
+        s_complex_load = vt * np.conj(i_load)
+        s_load = np.abs(s_complex_load)
+        
+        results["vt"] = vt
+        results["i_load"] = i_load
+        results["p_load"] = s_complex_load.real
+        results["q_load"] = s_complex_load.imag
+        results["s_load"] = s_load
+        results["fp_load"] = _safe_divide(s_complex_load.real, s_load, default=1.0)
+        results["f"] = f_sys
+        results["p_total"] = p_total
+        results["q_total"] = q_total
+        results["losses_total"] = p_total - s_complex_load.real
+        return results
+    
+    def sweep(self, parameter, values, predictor="linear", slow_iterations=15,
+              max_refinements=6, compare_cold=False, out=None):
+        """
+        Barrido de un parámetro por continuación (arranque en caliente)
+        
+        Cada punto se inicia desde la solución convergida anterior o desde
+        un predictor lineal construido con las dos últimas. Si un punto no
+        converge o necesita más de slow_iterations iteraciones, el paso se
+        divide a la mitad insertando puntos intermedios, y se vuelve al paso
+        completo en el siguiente valor pedido.
+        
+        Parameters:
+        -----------
+        parameter : str
+            Parámetro a barrer: "generator1.if_op", "generator2.p_motor",
+            "generatorK.xs",
+            "load.r_load", "load.x_load", etc.
+        values : array_like
+            Valores del parámetro, en el orden del barrido
+        predictor : str
+            "linear" (extrapolación con las dos últimas soluciones),
+            "previous" (última solución) o "cold" (heurística en cada punto)
+        slow_iterations : int
+            Iteraciones a partir de las cuales se reduce el paso (una
+            solución en frío con los valores por defecto usa de 6 a 10)
+        max_refinements : int
+            Número máximo de divisiones del paso entre dos valores pedidos
+        compare_cold : bool
+            Si es True, resuelve además cada punto desde la estimación
+            heurística para medir el ahorro de iteraciones y la diferencia
+            de potencia activa entre ambas soluciones
+        out : ResultsStore, optional
+            Contenedor con un punto por valor pedido; si se indica, los
+            resultados se escriben en él en lugar de crear diccionarios
+            
+        Returns:
+        --------
+        results : list of dict o ResultsStore
+            Resultados de solve() para cada valor pedido (out si se indicó)
+        stats : dict
+            Iteraciones en caliente, puntos intermedios insertados y, si se
+            pidió, iteraciones en frío, ahorro relativo y máxima diferencia
+            de P entre las soluciones en caliente y en frío (max_deviation, W)
+        """
+        if predictor not in ("linear", "previous", "cold"):
+            raise ValueError(f"Predictor desconocido: {predictor}")
+        
+        owner_name, attribute = parameter.split(".")
+        owner = getattr(self, owner_name)
+        original = getattr(owner, attribute)
+        
+        history = []  # Pares (valor, solución) convergidos
+        results = []
+        warm_power = []  # P de cada valor pedido, para compare_cold
+        stats = {"iterations": 0, "inserted_points": 0}
+        
+        def predict(value):
+            if predictor == "cold" or not history:
+                return None
+            if predictor == "previous" or len(history) < 2:
+                return history[-1][1]
+            (v0, x0), (v1, x1) = history[-2], history[-1]
+            if v1 == v0:
+                return x1
+            return x1 + (x1 - x0) * (value - v1) / (v1 - v0)
+        
+        if out is not None and len(out) != len(values):
+            raise ValueError(f"out tiene {len(out)} puntos y el barrido {len(values)}")
+        
+        try:
+            for i, target in enumerate(values):
+                pending = [target]
+                refinements = 0
+                while pending:
+                    value = pending[-1]
+                    setattr(owner, attribute, value)
+                    try:
+                        solution = solve_generators(
+                            self.generators, self.load,
+                            initial_guess=predict(value), full_output=True
+                        )
+                        iterations = solution.get("nit", solution.nfev)
+                        failed = solution.method != "newton" or iterations > slow_iterations
+                    except ValueError:
+                        solution, iterations, failed = None, 0, True
+                    
+                    can_refine = history and refinements < max_refinements and predictor != "cold"
+                    if failed and can_refine:
+                        # Reducir el paso: resolver primero un punto intermedio
+                        refinements += 1
+                        stats["inserted_points"] += 1
+                        pending.append((history[-1][0] + value) / 2)
+                        continue
+                    if solution is None:
+                        raise ValueError(f"El barrido no convergió en {parameter} = {value}")
+                    
+                    stats["iterations"] += iterations
+                    history.append((value, solution.x))
+                    pending.pop()
+                
+                self.last_solution = solution
+                if compare_cold:
+                    warm_power.append(self._active_power(solution.x))
+                if out is None:
+                    results.append(self._build_results(solution.x))
+                else:
+                    self._write_solution(out[i:i + 1], solution)
+            
+            if compare_cold:
+                stats["cold_iterations"] = 0
+                stats["max_deviation"] = 0.0
+                for target, power in zip(values, warm_power):
+                    setattr(owner, attribute, target)
+                    solution = solve_generators(self.generators, self.load, full_output=True)
+                    stats["cold_iterations"] += solution.get("nit", solution.nfev)
+                    deviation = np.max(np.abs(self._active_power(solution.x) - power))
+                    stats["max_deviation"] = max(stats["max_deviation"], float(deviation))
+                cold = stats["cold_iterations"]
+                stats["savings"] = 1 - stats["iterations"] / cold if cold else 0.0
+        finally:
+            setattr(owner, attribute, original)
+        
+        return (results if out is None else out), stats
+    
+    def _active_power(self, x):
+        """Potencia activa por fase de cada generador, Re(EA · conj(IA)), en la solución x"""
+        n = len(self.generators)
+        ea = np.array([g.get_ea_from_if(g.if_op) for g in self.generators], dtype=float)
+        delta = x[2 * n + 2:]
+        return ea * (np.cos(delta) * x[0:2 * n:2] + np.sin(delta) * x[1:2 * n:2])
+    
+    def _write_solution(self, out, solution):
+        """Escribe una solución de solve_generators en una fila de un ResultsStore"""
+        generators = self.generators
+        if_op = np.array([[g.if_op for g in generators]], dtype=float)
+        ea_mag = np.array([[g.get_ea_from_if(g.if_op) for g in generators]], dtype=float)
+        y_load = np.array([self.load.calculate_admittance()])
+        self._batch_results(generators, solution.x[None, :], ea_mag, if_op, y_load, out=out)
+        out["status"] = solution.status
+        out["nit"] = solution.get("nit", solution.nfev)
+        out["converged"] = solution.success
+    
     def check_synchronization_conditions(self):
         """
         Verifica las condiciones de sincronización según la teoría académica
+        
+        Cada generador se compara con el primero (referencia); las claves
+        voltage_diff_percent y frequency_diff son la mayor diferencia y
+        gK_voltage_diff_percent, gK_frequency_diff (K >= 2) las de cada
+        generador.
         """
         results = {}
+        reference = self.generators[0]
+        others = self.generators[1:]
         
-        # Voltajes nominales
-        v1_nom = self.generator1.v_nom / np.sqrt(3)  # Voltaje de fase
-        v2_nom = self.generator2.v_nom / np.sqrt(3)
-        
-        results['voltage_match'] = abs(v1_nom - v2_nom) < 0.05 * v1_nom  # 5% tolerancia
-        results['voltage_diff_percent'] = abs(v1_nom - v2_nom) / v1_nom * 100
+        # Voltajes nominales (de fase)
+        v_ref = reference.v_nom / np.sqrt(3)
+        v_nom = np.array([g.v_nom / np.sqrt(3) for g in others])
+        voltage_diff = np.abs(v_nom - v_ref) / v_ref * 100
         
         # Frecuencias (asumimos 60 Hz nominal)
-        f1 = 120 * 60 / self.generator1.poles
-        f2 = 120 * 60 / self.generator2.poles
+        f_ref = 120 * 60 / reference.poles
+        frequency_diff = np.abs(np.array([120 * 60 / g.poles for g in others]) - f_ref)
         
-        results['frequency_match'] = abs(f1 - f2) < 0.1  # 0.1 Hz tolerancia
-        results['frequency_diff'] = abs(f1 - f2)
+        for k, (dv, df) in enumerate(zip(voltage_diff, frequency_diff), start=2):
+            results[f'g{k}_voltage_diff_percent'] = float(dv)
+            results[f'g{k}_frequency_diff'] = float(df)
         
-        # Secuencia de fases (asumimos ABC para ambos)
+        results['voltage_diff_percent'] = float(voltage_diff.max(initial=0.0))
+        results['voltage_match'] = results['voltage_diff_percent'] < 5.0  # 5% tolerancia
+        
+        results['frequency_diff'] = float(frequency_diff.max(initial=0.0))
+        results['frequency_match'] = results['frequency_diff'] < 0.1  # 0.1 Hz tolerancia
+        
+        # Secuencia de fases (asumimos ABC para todos)
         results['phase_sequence_match'] = True  # Simplificación
         
         return results
 
-    def analyze_load_sharing(self, results):
+    def dispatch(self, costs, vt=None, if_max=None, apply=False):
         """
-        Analiza el reparto de potencia activa y reactiva entre generadores
+        Reparto de mínimo costo de la carga entre los generadores
+        
+        Parameters:
+        -----------
+        costs : sequence of array_like
+            Coeficientes del polinomio de costo de cada generador en
+            función de su potencia mecánica (ver EconomicDispatch)
+        vt : float, optional
+            Tensión del bus (por defecto la tensión de fase nominal)
+        if_max : float o sequence, optional
+            Corriente de campo máxima de cada generador
+        apply : bool
+            Si es True fija if_op y p_target de los generadores con el
+            resultado, de modo que solve() resuelve el punto despachado
+        
+        Returns:
+        --------
+        dict
+            Resultado de EconomicDispatch.solve()
+        
+        Raises:
+        -------
+        ValueError
+            Con apply=True, si el despacho no se puede aplicar (ver
+            EconomicDispatch.apply)
         """
-        analysis = {}
+        dispatch = EconomicDispatch(self.generators, self.load, costs, vt=vt, if_max=if_max)
+        results = dispatch.solve()
+        if apply:
+            dispatch.apply(results)
+        return results
+
+    def check_feasibility(self, results, **options):
+        """
+        Verifica los puntos de operación resueltos contra la curva de
+        capacidad de cada generador (ver capability.check_feasibility)
         
-        # Potencias individuales
-        p1 = results['g1_p']
-        p2 = results['g2_p']
-        q1 = results['g1_q']
-        q2 = results['g2_q']
+        Las curvas usan la potencia por fase en terminales, que se calcula
+        con gK_vt y gK_ia de los resultados.
         
-        # Análisis de reparto de potencia activa
-        total_p = p1 + p2
-        analysis['p1_percentage'] = (p1 / total_p) * 100 if total_p > 0 else 0
-        analysis['p2_percentage'] = (p2 / total_p) * 100 if total_p > 0 else 0
+        Parameters:
+        -----------
+        results : dict, ResultsStore o ndarray estructurado
+            Resultados de solve(), solve_batch(), sweep() o dispatch()
+        **options :
+            Argumentos de get_capability_curve (if_max, delta_max)
         
-        # Análisis de reparto de potencia reactiva
-        total_q = q1 + q2
-        analysis['q1_percentage'] = (q1 / total_q) * 100 if total_q > 0 else 0
-        analysis['q2_percentage'] = (q2 / total_q) * 100 if total_q > 0 else 0
+        Returns:
+        --------
+        dict
+            Márgenes, máscaras de violación y factibilidad por generador
+        """
+        return check_feasibility(self.generators, results, **options)
+
+    def analyze_load_sharing(self, results, min_margin=20.0):
+        """
+        Analiza el reparto de potencia activa y reactiva entre generadores
+        
+        La advertencia de estabilidad se basa en el margen de cada
+        generador hasta su ángulo de pérdida de sincronismo (ver
+        stability.pull_out_margin).
+        
+        Parameters:
+        -----------
+        results : dict
+            Resultados de solve()
+        min_margin : float
+            Margen angular mínimo aceptable (grados)
         
-        # Verificar estabilidad (ángulos de potencia)
-        delta1 = np.degrees(results['g1_delta'])  # Convertir a grados
-        delta2 = np.degrees(results['g2_delta'])
+        Returns:
+        --------
+        dict
+            pK_percentage y qK_percentage (participación de cada generador
+            en el total), gK_angle_margin, gK_power_margin,
+            stability_warning y power_angle_diff (mayor diferencia entre
+            los ángulos de potencia de dos generadores, en grados)
+        """
+        analysis = {}
+        ks = range(1, len(self.generators) + 1)
         
-        analysis['stability_warning'] = abs(delta1) > 30 or abs(delta2) > 30  # Grados
-        analysis['power_angle_diff'] = abs(delta1 - delta2)
+        # Potencias individuales
+        p = [results[f'g{k}_p'] for k in ks]
+        q = [results[f'g{k}_q'] for k in ks]
+        
+        # Análisis de reparto de potencia activa y reactiva
+        total_p = sum(p)
+        total_q = sum(q)
+        for k, p_k, q_k in zip(ks, p, q):
+            analysis[f'p{k}_percentage'] = (p_k / total_p) * 100 if total_p > 0 else 0
+            analysis[f'q{k}_percentage'] = (q_k / total_q) * 100 if total_q > 0 else 0
+        
+        # Verificar estabilidad (solve() ya entrega los ángulos en grados)
+        delta = [results[f'g{k}_delta'] for k in ks]
+        
+        margins = pull_out_margin(self.generators, results)
+        for k in ks:
+            analysis[f'g{k}_angle_margin'] = float(margins[f'g{k}_angle_margin'])
+            analysis[f'g{k}_power_margin'] = float(margins[f'g{k}_power_margin'])
+        
+        analysis['stability_warning'] = any(
+            analysis[f'g{k}_angle_margin'] < min_margin for k in ks
+        )
+        analysis['power_angle_diff'] = max(delta) - min(delta)
         
-        return analysis
\ No newline at end of file
+        return analysis
@@ -0,0 +1,400 @@
+from collections import namedtuple
+from time import perf_counter
+
+import copy
+
+import numpy as np
+from solvers.equation_system import solve_generators
+
+# Cambio en el sistema a partir de un instante. Los valores no indicados
+# (None) no cambian; cada campo puede ser un escalar o un arreglo (B,)
+# (if_op: (N,) o (B, N)) para simular B escenarios a la vez
+Event = namedtuple("Event", ["time", "r_load", "x_load", "if_op", "y_fault"],
+                   defaults=(None, None, None, None))
+
+TransientResult = namedtuple("TransientResult", [
+    "t",               # Instantes de salida (T,)
+    "delta",           # Ángulos de EA (T, B, N) en rad, o None
+    "omega",           # Desviación de velocidad eléctrica (T, B, N) en rad/s, o None
+    "p_e",             # Potencia eléctrica (T, B, N) en W, o None
+    "vt",              # Tensión del bus (T, B) compleja, o None
+    "max_separation",  # Máxima separación angular entre generadores (B,) en rad
+    "max_speed_deviation",  # Máxima |Δω| de un generador respecto a ωs (B,) en por unidad
+    "stable",          # True si la separación y |Δω| nunca superaron sus límites (B,)
+    "steps",           # Pasos aceptados (B,)
+    "wall_time",       # Tiempo de cómputo (s)
+    "speed"            # Segundos simulados por segundo de cómputo (todos los escenarios)
+])
+
+# Coeficientes de Dormand-Prince 5(4)
+_DP_C = np.array([0, 1 / 5, 3 / 10, 4 / 5, 8 / 9, 1, 1])
+_DP_A = [
+    [],
+    [1 / 5],
+    [3 / 40, 9 / 40],
+    [44 / 45, -56 / 15, 32 / 9],
+    [19372 / 6561, -25360 / 2187, 64448 / 6561, -212 / 729],
+    [9017 / 3168, -355 / 33, 46732 / 5247, 49 / 176, -5103 / 18656],
+    [35 / 384, 0, 500 / 1113, 125 / 192, -2187 / 6784, 11 / 84]
+]
+_DP_E = np.array([71 / 57600, 0, -71 / 16695, 71 / 1920, -17253 / 339200, 22 / 525, -1 / 40])
+
+
+class SwingSimulator:
+    """
+    Simulación transitoria de generadores en paralelo con la ecuación de
+    oscilación
+
+    Cada máquina es una fuente EA_k∠δ_k de magnitud constante (salvo
+    eventos de campo) detrás de RA + jXS, conectadas a un bus común con
+    la carga como admitancia constante:
+
+        VT = Σ y_k EA_k / (Σ y_k + Y_carga + Y_falla),  IA_k = y_k (EA_k - VT)
+        P_e,k = Re(EA_k IA_k*)   (la misma potencia del modelo fasorial)
+
+        dδ_k/dt = Δω_k
+        M_k dΔω_k/dt = P_m,k - P_e,k - D_k Δω_k
+
+    con M_k = 2 H_k S_nom,k / ωs y D_k en por unidad de S_nom / ωs. La
+    potencia mecánica es constante e igual a la eléctrica del estado
+    estable inicial (sin regulador de velocidad).
+
+    Todos los escenarios de un lote avanzan juntos con operaciones de
+    NumPy sobre arreglos (B, N). El estado inicial puede ser común o uno
+    por escenario (ver from_results), de modo que un lote puede mezclar
+    puntos de operación distintos.
+    """
+
+    def __init__(self, generators, load, delta0=None):
+        """
+        Parameters:
+        -----------
+        generators : list of SynchronousGenerator
+            Generadores (usa inertia, damping, s_nom, f_sc, ra, xs e if_op)
+        load : Load
+            Carga antes de los eventos
+        delta0 : array_like (N,), optional
+            Ángulos iniciales de EA; por defecto los del estado estable que
+            calcula solve_generators
+        """
+        self.generators = list(generators)
+        self.load = load
+        n = len(self.generators)
+        self.n_generators = n
+
+        self.y_gen = 1 / np.array([complex(g.ra, g.xs) for g in self.generators])
+        self.omega_s = 2 * np.pi * float(np.mean([g.f_sc for g in self.generators]))
+        s_nom = np.array([g.s_nom for g in self.generators], dtype=float)
+        self.m = 2 * np.array([g.inertia for g in self.generators], dtype=float) * s_nom / self.omega_s
+        self.d = np.array([g.damping for g in self.generators], dtype=float) * s_nom / self.omega_s
+        self.ea0 = np.array([g.get_ea_from_if(g.if_op) for g in self.generators], dtype=float)
+        self.r_load0 = float(load.r_load)
+        self.x_load0 = float(load.x_load)
+
+        if delta0 is None:
+            delta0 = solve_generators(self.generators, load)[2 * n + 2:3 * n + 2]
+        self.delta0 = np.asarray(delta0, dtype=float)
+
+        # Potencia mecánica: la eléctrica en el equilibrio inicial
+        y_shunt = np.array([load.calculate_admittance()])
+        self.p_m, _ = self.electrical(self.delta0[None, :], self.ea0[None, :], y_shunt)
+        self.p_m = self.p_m[0]
+
+    @property
+    def n_scenarios(self):
+        """Escenarios del estado inicial (None si es común a todo el lote)"""
+        return self.delta0.shape[0] if self.delta0.ndim == 2 else None
+
+    @classmethod
+    def from_results(cls, generators, results):
+        """
+        Simulador con un estado inicial por punto de operación resuelto
+
+        Parameters:
+        -----------
+        generators : list of SynchronousGenerator
+            Generadores del sistema (inercia, amortiguamiento e impedancias)
+        results : dict, ResultsStore o ndarray estructurado
+            Resultados de solve(), solve_batch() o sweep() con gK_ea, vt e
+            i_load; cada punto es un escenario
+
+        Returns:
+        --------
+        SwingSimulator
+            Con delta0, EA, carga y potencia mecánica de forma (B, N) o (B,)
+        """
+        n = len(generators)
+        ea = np.column_stack([np.asarray(results[f"g{k}_ea"], dtype=complex).reshape(-1)
+                              for k in range(1, n + 1)])
+        z_load = np.asarray(results["vt"], dtype=complex).reshape(-1) / \
+            np.asarray(results["i_load"], dtype=complex).reshape(-1)
+
+        simulator = cls.__new__(cls)
+        simulator.generators = list(generators)
+        simulator.load = None
+        simulator.n_generators = n
+        simulator.y_gen = 1 / np.array([complex(g.ra, g.xs) for g in generators])
+        simulator.omega_s = 2 * np.pi * float(np.mean([g.f_sc for g in generators]))
+        s_nom = np.array([g.s_nom for g in generators], dtype=float)
+        simulator.m = 2 * np.array([g.inertia for g in generators], dtype=float) * s_nom / simulator.omega_s
+        simulator.d = np.array([g.damping for g in generators], dtype=float) * s_nom / simulator.omega_s
+        simulator.ea0 = np.abs(ea)
+        simulator.delta0 = np.angle(ea)
+        simulator.r_load0 = z_load.real
+        simulator.x_load0 = z_load.imag
+        simulator.p_m, _ = simulator.electrical(simulator.delta0, simulator.ea0, 1 / z_load)
+        return simulator
+
+    def repeat(self, count):
+        """
+        Simulador con cada escenario del estado inicial repetido count veces
+        (escenario i -> filas i*count ... i*count + count - 1)
+        """
+        b = self.n_scenarios or 1
+        repeated = copy.copy(self)
+        repeated.ea0 = np.repeat(np.broadcast_to(self.ea0, (b, self.n_generators)), count, axis=0)
+        repeated.delta0 = np.repeat(np.broadcast_to(self.delta0, (b, self.n_generators)), count, axis=0)
+        repeated.p_m = np.repeat(np.broadcast_to(self.p_m, (b, self.n_generators)), count, axis=0)
+        repeated.r_load0 = np.repeat(np.broadcast_to(self.r_load0, (b,)), count)
+        repeated.x_load0 = np.repeat(np.broadcast_to(self.x_load0, (b,)), count)
+        return repeated
+
+    def electrical(self, delta, ea, y_shunt):
+        """
+        Solución del circuito para ángulos dados
+
+        Parameters:
+        -----------
+        delta, ea : ndarray (B, N)
+            Ángulos y magnitudes de EA
+        y_shunt : ndarray (B,)
+            Admitancia total conectada al bus (carga y falla)
+
+        Returns:
+        --------
+        p_e : ndarray (B, N)
+            Potencia eléctrica de cada generador
+        vt : ndarray (B,)
+            Tensión del bus
+        """
+        e = ea * np.exp(1j * delta)
+        vt = (e @ self.y_gen) / (self.y_gen.sum() + y_shunt)
+        ia = self.y_gen * (e - vt[:, None])
+        return (e * ia.conj()).real, vt
+
+    def _prepare(self, events):
+        """Convierte los eventos a arreglos por escenario (ordenados por tiempo)"""
+        n = self.n_generators
+        shapes = []
+        for event in events:
+            shapes += [np.shape(event.time), np.shape(event.r_load), np.shape(event.x_load),
+                       np.shape(event.y_fault)]
+            if event.if_op is not None:
+                shapes.append(np.shape(event.if_op)[:-1] if np.ndim(event.if_op) else ())
+        if self.n_scenarios is not None:
+            shapes.append((self.n_scenarios,))
+        shape = np.broadcast_shapes(*shapes) if shapes else ()
+        if len(shape) > 1:
+            raise ValueError("Los eventos deben ser escalares o arreglos (B,)")
+        b = shape[0] if shape else 1
+
+        prepared = []
+        for event in events:
+            ea = None
+            if event.if_op is not None:
+                if_op = np.broadcast_to(np.asarray(event.if_op, dtype=float), (b, n))
+                ea = np.column_stack([g.get_ea_from_if(if_op[:, k]) for k, g in enumerate(self.generators)])
+            prepared.append((
+                np.broadcast_to(np.asarray(event.time, dtype=float), (b,)),
+                None if event.r_load is None else np.broadcast_to(np.asarray(event.r_load, dtype=float), (b,)),
+                None if event.x_load is None else np.broadcast_to(np.asarray(event.x_load, dtype=float), (b,)),
+                ea,
+                None if event.y_fault is None else np.broadcast_to(np.asarray(event.y_fault, dtype=complex), (b,))
+            ))
+        return b, prepared
+
+    def _parameters(self, t, b, events):
+        """EA (B, N) y admitancia en el bus (B,) vigentes en los instantes t (B,)"""
+        ea = np.broadcast_to(self.ea0, (b, self.n_generators))
+        r_load = np.broadcast_to(self.r_load0, (b,))
+        x_load = np.broadcast_to(self.x_load0, (b,))
+        y_fault = np.zeros(b, dtype=complex)
+        for time, r, x, e, y in events:
+            active = t >= time
+            if not active.any():
+                continue
+            if r is not None:
+                r_load = np.where(active, r, r_load)
+            if x is not None:
+                x_load = np.where(active, x, x_load)
+            if e is not None:
+                ea = np.where(active[:, None], e, ea)
+            if y is not None:
+                y_fault = np.where(active, y, y_fault)
+        return ea, 1 / (r_load + 1j * x_load) + y_fault
+
+    def _derivative(self, delta, omega, ea, y_shunt):
+        p_e, _ = self.electrical(delta, ea, y_shunt)
+        return omega, (self.p_m - p_e - self.d * omega) / self.m
+
+    def simulate(self, t_end, events=(), dt=1e-3, dt_out=1e-2, method="rk4", rtol=1e-6, atol=1e-8,
+                 store=True, separation_limit=np.pi, speed_limit=0.05):
+        """
+        Integra la ecuación de oscilación para uno o muchos escenarios
+
+        Los parámetros (carga, EA, falla) se mantienen constantes dentro de
+        cada paso y se actualizan al inicio del paso: con method="adaptive"
+        los pasos terminan exactamente en los instantes de los eventos, y
+        con method="rk4" un evento entra en vigor en el primer múltiplo de
+        dt posterior a su instante.
+
+        La pérdida de estabilidad se evalúa después de cada paso del
+        integrador (no solo en los instantes de salida) con dos criterios:
+        la separación angular entre generadores y la desviación de
+        velocidad de cada uno respecto a la referencia síncrona ωs. La
+        segunda detecta que todo el sistema se aleja de la frecuencia
+        nominal, lo que la separación no ve cuando las máquinas oscilan
+        juntas (p. ej. generadores idénticos).
+
+        Parameters:
+        -----------
+        t_end : float
+            Tiempo final (s)
+        events : sequence of Event
+            Eventos; el número de escenarios B es el de sus arreglos
+        dt : float
+            Paso fijo (rk4) o paso inicial (adaptive)
+        dt_out : float
+            Intervalo entre instantes de salida
+        method : str
+            "rk4" (paso fijo) o "adaptive" (Dormand-Prince 5(4) con paso
+            independiente por escenario)
+        rtol, atol : float
+            Tolerancias del método adaptativo
+        store : bool
+            Si es False solo se calculan la separación máxima, la
+            desviación de velocidad máxima y la estabilidad (sin guardar
+            las trayectorias)
+        separation_limit : float
+            Separación angular entre generadores que se considera pérdida
+            de sincronismo (rad)
+        speed_limit : float
+            Desviación de velocidad |Δω_k| / ωs que se considera pérdida
+            de estabilidad (por unidad)
+
+        Returns:
+        --------
+        TransientResult
+        """
+        if method not in ("rk4", "adaptive"):
+            raise ValueError(f"Método desconocido: {method}")
+        start = perf_counter()
+        b, prepared = self._prepare(events)
+        n = self.n_generators
+
+        steps_per_output = max(1, int(np.ceil(dt_out / dt - 1e-9)))
+        if method == "rk4":
+            dt = dt_out / steps_per_output
+        t_out = np.arange(int(np.floor(t_end / dt_out + 1e-9)) + 1) * dt_out
+
+        delta = np.broadcast_to(self.delta0, (b, n)).copy()
+        omega = np.zeros((b, n))
+        outputs = None
+        if store:
+            outputs = (np.empty((len(t_out), b, n)), np.empty((len(t_out), b, n)),
+                       np.empty((len(t_out), b, n)), np.empty((len(t_out), b), dtype=complex))
+        max_separation = np.zeros(b)
+        max_speed = np.zeros(b)
+        steps = np.zeros(b, dtype=np.int64)
+        t = np.zeros(b)
+
+        def monitor(delta, omega):
+            np.maximum(max_separation, delta.max(axis=1) - delta.min(axis=1), out=max_separation)
+            np.maximum(max_speed, np.abs(omega).max(axis=1), out=max_speed)
+
+        def record(i, t, delta, omega):
+            if outputs is not None:
+                ea, y_shunt = self._parameters(t, b, prepared)
+                p_e, vt = self.electrical(delta, ea, y_shunt)
+                outputs[0][i], outputs[1][i], outputs[2][i], outputs[3][i] = delta, omega, p_e, vt
+
+        monitor(delta, omega)
+        record(0, t, delta, omega)
+        if method == "rk4":
+            for i in range(1, len(t_out)):
+                for _ in range(steps_per_output):
+                    delta, omega = self._rk4_step(delta, omega, t, dt, b, prepared)
+                    monitor(delta, omega)
+                    t = t + dt
+                steps += steps_per_output
+                t = np.full(b, t_out[i])
+                record(i, t, delta, omega)
+        else:
+            delta, omega, steps = self._integrate_adaptive(
+                delta, omega, t_out, dt, rtol, atol, b, prepared, record, monitor
+            )
+
+        wall_time = perf_counter() - start
+        if outputs is None:
+            outputs = (None, None, None, None)
+        max_speed /= self.omega_s
+        stable = (max_separation <= separation_limit) & (max_speed <= speed_limit)
+        return TransientResult(
+            t_out, *outputs, max_separation, max_speed, stable, steps,
+            wall_time, b * t_out[-1] / wall_time if wall_time > 0 else np.inf
+        )
+
+    def _rk4_step(self, delta, omega, t, dt, b, events):
+        ea, y_shunt = self._parameters(t, b, events)
+        k1d, k1w = self._derivative(delta, omega, ea, y_shunt)
+        k2d, k2w = self._derivative(delta + 0.5 * dt * k1d, omega + 0.5 * dt * k1w, ea, y_shunt)
+        k3d, k3w = self._derivative(delta + 0.5 * dt * k2d, omega + 0.5 * dt * k2w, ea, y_shunt)
+        k4d, k4w = self._derivative(delta + dt * k3d, omega + dt * k3w, ea, y_shunt)
+        return (delta + dt / 6 * (k1d + 2 * k2d + 2 * k3d + k4d),
+                omega + dt / 6 * (k1w + 2 * k2w + 2 * k3w + k4w))
+
+    def _integrate_adaptive(self, delta, omega, t_out, h0, rtol, atol, b, events, record, monitor):
+        """Dormand-Prince 5(4) con paso y control de error por escenario"""
+        t = np.zeros(b)
+        h = np.full(b, h0)
+        steps = np.zeros(b, dtype=np.int64)
+        event_times = [time for time, *_ in events]
+        y = np.concatenate([delta, omega], axis=1)
+        n = self.n_generators
+
+        for i in range(1, len(t_out)):
+            target = t_out[i]
+            while True:
+                active = t < target - 1e-12
+                if not active.any():
+                    break
+                # El paso no cruza el siguiente instante de salida ni un evento
+                stop = np.full(b, target)
+                for time in event_times:
+                    stop = np.where((time > t + 1e-12) & (time < stop), time, stop)
+                step = np.where(active, np.minimum(h, stop - t), 0.0)
+
+                ea, y_shunt = self._parameters(t, b, events)
+                k = []
+                for stage in range(7):
+                    y_stage = y.copy()
+                    for coefficient, k_j in zip(_DP_A[stage], k):
+                        y_stage += (step * coefficient)[:, None] * k_j
+                    d_delta, d_omega = self._derivative(y_stage[:, :n], y_stage[:, n:], ea, y_shunt)
+                    k.append(np.concatenate([d_delta, d_omega], axis=1))
+                y_new = y_stage  # La etapa 7 se evalúa en la solución de orden 5
+                error = sum((step * e)[:, None] * k_j for e, k_j in zip(_DP_E, k) if e != 0)
+                scale = atol + rtol * np.maximum(np.abs(y), np.abs(y_new))
+                norm = np.sqrt(np.mean((error / scale) ** 2, axis=1))
+
+                accept = active & (norm <= 1.0)
+                y = np.where(accept[:, None], y_new, y)
+                t = np.where(accept, np.where(stop - t - step <= 1e-12, stop, t + step), t)
+                steps += accept
+                monitor(y[:, :n], y[:, n:])
+                factor = np.clip(0.9 * np.maximum(norm, 1e-10) ** -0.2, 0.2, 5.0)
+                # Tras un paso recortado por un evento o una salida se conserva h
+                h = np.where(active, np.where(accept & (step < h), h, step * factor), h)
+            t = np.full(b, target)
+            record(i, t, y[:, :n], y[:, n:])
+        return y[:, :n], y[:, n:], steps
@@ -0,0 +1,227 @@
+import numpy as np
+
+class BatchSystem:
+    """
+    Sistema de ecuaciones de generadores en paralelo apilado para M puntos
+    de operación independientes
+
+    Usa el mismo orden de variables que CompiledSystem; cada fila de los
+    arreglos corresponde a un punto de operación.
+    """
+
+    def __init__(self, ea, ra, xs, p_target, g_load, b_load):
+        """
+        Parameters:
+        -----------
+        ea : ndarray (M, N)
+            Magnitud de EA de cada generador en cada punto
+        ra, xs : ndarray (M, N) o (N,)
+            Resistencia de armadura y reactancia síncrona
+        p_target : ndarray (M, N)
+            Metas de potencia activa
+        g_load, b_load : ndarray (M,)
+            Conductancia y susceptancia de la carga
+        """
+        self.ea = np.atleast_2d(np.asarray(ea, dtype=float))
+        m, n = self.ea.shape
+        self.n_points = m
+        self.n_generators = n
+        self.n_variables = 3 * n + 2
+
+        self.ra = np.broadcast_to(np.asarray(ra, dtype=float), (m, n))
+        self.xs = np.broadcast_to(np.asarray(xs, dtype=float), (m, n))
+        self.p_target = np.broadcast_to(np.asarray(p_target, dtype=float), (m, n))
+        self.p_scale = np.maximum(1.0, np.abs(self.p_target))
+        self.g_load = np.broadcast_to(np.asarray(g_load, dtype=float), (m,))
+        self.b_load = np.broadcast_to(np.asarray(b_load, dtype=float), (m,))
+
+    def residual(self, x, idx):
+        """
+        Evalúa los residuos de los puntos idx
+
+        Parameters:
+        -----------
+        x : ndarray (len(idx), 3N+2)
+            Variables de los puntos seleccionados
+        idx : ndarray of int
+            Índices de los puntos dentro del lote
+        """
+        n = self.n_generators
+        ea = self.ea[idx]
+        ra = self.ra[idx]
+        xs = self.xs[idx]
+        g_load = self.g_load[idx]
+        b_load = self.b_load[idx]
+
+        ia_real = x[:, 0:2 * n:2]
+        ia_imag = x[:, 1:2 * n:2]
+        vt_real = x[:, 2 * n:2 * n + 1]
+        vt_imag = x[:, 2 * n + 1:2 * n + 2]
+        delta = x[:, 2 * n + 2:]
+
+        ea_real = ea * np.cos(delta)
+        ea_imag = ea * np.sin(delta)
+
+        out = np.empty_like(x)
+        out[:, 0:2 * n:2] = ea_real - vt_real - ra * ia_real + xs * ia_imag
+        out[:, 1:2 * n:2] = ea_imag - vt_imag - ra * ia_imag - xs * ia_real
+        out[:, 2 * n] = ia_real.sum(axis=1) - g_load * vt_real[:, 0] + b_load * vt_imag[:, 0]
+        out[:, 2 * n + 1] = ia_imag.sum(axis=1) - g_load * vt_imag[:, 0] - b_load * vt_real[:, 0]
+        out[:, 2 * n + 2:] = (ea_real * ia_real + ea_imag * ia_imag - self.p_target[idx]) / self.p_scale[idx]
+        return out
+
+    def jacobian(self, x, idx):
+        """Evalúa las jacobianas (len(idx), 3N+2, 3N+2) de los puntos idx"""
+        n = self.n_generators
+        m = len(idx)
+        ea = self.ea[idx]
+        ra = self.ra[idx]
+        xs = self.xs[idx]
+        p_scale = self.p_scale[idx]
+
+        ia_real = x[:, 0:2 * n:2]
+        ia_imag = x[:, 1:2 * n:2]
+        delta = x[:, 2 * n + 2:]
+        ea_cos = ea * np.cos(delta)
+        ea_sin = ea * np.sin(delta)
+
+        k = np.arange(n)
+        rows_real, rows_imag = 2 * k, 2 * k + 1
+        cols_delta = 2 * n + 2 + k
+
+        jac = np.zeros((m, self.n_variables, self.n_variables))
+
+        # Ecuaciones fasoriales
+        jac[:, rows_real, rows_real] = -ra
+        jac[:, rows_real, rows_imag] = xs
+        jac[:, rows_imag, rows_real] = -xs
+        jac[:, rows_imag, rows_imag] = -ra
+        jac[:, rows_real, 2 * n] = -1.0
+        jac[:, rows_imag, 2 * n + 1] = -1.0
+        jac[:, rows_real, cols_delta] = -ea_sin
+        jac[:, rows_imag, cols_delta] = ea_cos
+
+        # Ley de Kirchhoff
+        jac[:, 2 * n, rows_real] = 1.0
+        jac[:, 2 * n + 1, rows_imag] = 1.0
+        jac[:, 2 * n, 2 * n] = -self.g_load[idx]
+        jac[:, 2 * n, 2 * n + 1] = self.b_load[idx]
+        jac[:, 2 * n + 1, 2 * n] = -self.b_load[idx]
+        jac[:, 2 * n + 1, 2 * n + 1] = -self.g_load[idx]
+
+        # Ecuaciones de potencia
+        jac[:, cols_delta, rows_real] = ea_cos / p_scale
+        jac[:, cols_delta, rows_imag] = ea_sin / p_scale
+        jac[:, cols_delta, cols_delta] = (ea_cos * ia_imag - ea_sin * ia_real) / p_scale
+        return jac
+
+def solve_batch(system, x0, tol=1e-8, xtol=1e-10, ftol=1.49e-8, gtol=1e-8, max_iter=50,
+                armijo=1e-4, min_step=0.25, mu_min=1e-6, mu_max=1e8):
+    """
+    Newton-Raphson amortiguado vectorizado sobre un lote de puntos
+
+    Aplica a todos los puntos a la vez el mismo paso regularizado y la misma
+    búsqueda lineal que newton_raphson; cada punto lleva su propio parámetro
+    de regularización y sale del cálculo en cuanto converge.
+
+    Parameters:
+    -----------
+    system : BatchSystem
+        Sistema apilado
+    x0 : array_like (M, 3N+2) o (3N+2,)
+        Estimación inicial (común o por punto)
+    tol, xtol, ftol, gtol, max_iter, armijo, min_step, mu_min, mu_max :
+        Igual que en newton_raphson
+
+    Returns:
+    --------
+    x : ndarray (M, 3N+2)
+        Solución de cada punto
+    status : ndarray of int (M,)
+        0: máximo de iteraciones, 1: residuo < tol, 2: paso < xtol,
+        3: reducción < ftol (2 y 3 en un punto estacionario), 4: búsqueda
+        lineal fallida, 5: estancado con gradiente mayor que gtol
+    nit : ndarray of int (M,)
+        Iteraciones usadas por cada punto
+    """
+    m, nv = system.n_points, system.n_variables
+    x = np.array(np.broadcast_to(np.asarray(x0, dtype=float), (m, nv)))
+    all_idx = np.arange(m)
+    f = system.residual(x, all_idx)
+    norm2 = np.einsum('ij,ij->i', f, f)
+    mu = np.full(m, mu_min)
+    status = np.zeros(m, dtype=np.int8)
+    nit = np.zeros(m, dtype=np.int32)
+
+    # Puntos que ya cumplen la tolerancia
+    status[norm2 <= tol ** 2] = 1
+    active = status == 0
+
+    for _ in range(max_iter):
+        idx = all_idx[active]
+        if idx.size == 0:
+            break
+        nit[idx] += 1
+
+        xa, fa, n2a, mua = x[idx], f[idx], norm2[idx], mu[idx]
+        jac = system.jacobian(xa, idx)
+        jac_t = jac.transpose(0, 2, 1)
+        normal = jac_t @ jac
+        gradient = np.einsum('kji,kj->ki', jac, fa)
+        scaling = np.maximum(np.einsum('kii->ki', normal), np.finfo(float).tiny)
+        # Coseno entre F y cada columna de J (criterio de gtol de newton_raphson)
+        stationary = np.max(np.abs(gradient) / np.sqrt(scaling * n2a[:, None]), axis=1) <= gtol
+
+        damped = normal.copy()
+        diag = np.einsum('kii->ki', damped)
+        diag += mua[:, None] * scaling
+        step = np.linalg.solve(damped, -gradient[..., None])[..., 0]
+
+        predicted = fa + np.einsum('kij,kj->ki', jac, step)
+        decrease = n2a - np.einsum('ij,ij->i', predicted, predicted)
+        stalled = decrease <= ftol * n2a
+        status[idx[stalled & stationary]] = 3
+        # Los estancados lejos del mínimo intentan el paso de todos modos
+        stalled &= ~stationary
+
+        # Búsqueda lineal de Armijo sobre los puntos restantes
+        slope = np.einsum('ij,ij->i', gradient, step)
+        pending = status[idx] == 0
+        accepted = np.zeros(idx.size, dtype=bool)
+        t_used = np.zeros(idx.size)
+        x_new, f_new, n2_new = xa.copy(), fa.copy(), n2a.copy()
+        t = 1.0
+        while t >= min_step and pending.any():
+            p = np.flatnonzero(pending)
+            x_trial = xa[p] + t * step[p]
+            f_trial = system.residual(x_trial, idx[p])
+            n2_trial = np.einsum('ij,ij->i', f_trial, f_trial)
+            ok = n2_trial <= n2a[p] + 2 * armijo * t * slope[p]
+            ok_p = p[ok]
+            x_new[ok_p], f_new[ok_p], n2_new[ok_p] = x_trial[ok], f_trial[ok], n2_trial[ok]
+            accepted[ok_p] = True
+            t_used[ok_p] = t
+            pending[ok_p] = False
+            t *= 0.5
+
+        # Actualización de la regularización (Nielsen si se aceptó el paso)
+        rho = np.where(accepted & (decrease > 0), (n2a - n2_new) / np.where(decrease > 0, decrease, 1.0), 0.0)
+        factor = np.maximum(1 / 3, 1 - (2 * rho - 1) ** 3)
+        mua = np.where(accepted, np.maximum(mua * factor, mu_min), mua * 10)
+        mu[idx] = mua
+        status[idx[pending & (mua > mu_max)]] = 4
+        # Aumentar mu solo reduciría más la reducción prevista
+        status[idx[pending & stalled]] = 5
+
+        x[idx], f[idx], norm2[idx] = x_new, f_new, n2_new
+
+        # Criterios de convergencia de los puntos que avanzaron
+        step_norm = t_used * np.linalg.norm(step, axis=1)
+        x_norm = np.linalg.norm(x_new, axis=1)
+        small_step = accepted & stationary & (step_norm <= xtol * (x_norm + xtol))
+        status[idx[small_step]] = 2
+        status[idx[accepted & (n2_new <= tol ** 2)]] = 1
+
+        active = status == 0
+
+    return x, status, nit
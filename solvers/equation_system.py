@@ -1,5 +1,365 @@
+from time import perf_counter
+
 import numpy as np
-from scipy import optimize
+from .newton_raphson import newton_raphson
+from .method_selector import get_method_selector, method_label
+from .telemetry import SolveAttempt, SolveRecord, attempt_from_result, get_telemetry
+
+class CompiledSystem:
+    """
+    Sistema de ecuaciones de N generadores en paralelo con todas las
+    cantidades que no dependen de las incógnitas precalculadas una sola vez
+    
+    Orden de las variables:
+    - variables[2k], variables[2k+1]: Parte real e imaginaria de IA del generador k
+    - variables[2n], variables[2n+1]: Parte real e imaginaria de VT
+    - variables[2n+2+k]: Ángulo delta del generador k
+    
+    Con dos generadores coincide con el orden usado históricamente
+    (IA1, IA2, VT, delta1, delta2). El costo de evaluar residuo y jacobiana
+    crece linealmente con N; para muchos generadores la jacobiana se entrega
+    como matriz dispersa CSR con patrón fijo.
+    """
+    
+    # Número de generadores a partir del cual la jacobiana es dispersa
+    SPARSE_THRESHOLD = 16
+    
+    def __init__(self, generators, load, sparse=None):
+        """
+        Parameters:
+        -----------
+        generators : list of SynchronousGenerator
+            Generadores conectados al bus
+        load : Load
+            Carga conectada a los generadores
+        sparse : bool, optional
+            Forzar jacobiana dispersa (True) o densa (False); por defecto
+            se decide según el número de generadores
+        """
+        self._setup(
+            # Magnitud de EA (curva de magnetización evaluada en el punto de operación)
+            [g.get_ea_from_if(g.if_op) for g in generators],
+            # Impedancias síncronas
+            [g.ra for g in generators],
+            [g.xs for g in generators],
+            # Metas de potencia activa por fase (0.9 * p_motor / 3, ligeramente menor para
+            # facilitar la convergencia, salvo que un despacho fije p_target)
+            [g.power_target for g in generators],
+            # Admitancia de la carga (I = Y * VT)
+            load.calculate_admittance(),
+            sparse
+        )
+    
+    @classmethod
+    def from_arrays(cls, ea, ra, xs, p_target, y_load, sparse=None):
+        """
+        Construye el sistema directamente a partir de arreglos por generador
+        
+        Parameters:
+        -----------
+        ea, ra, xs, p_target : array_like (N,)
+            Magnitud de EA, resistencia de armadura, reactancia síncrona y
+            meta de potencia activa de cada generador
+        y_load : complex
+            Admitancia de la carga
+        sparse : bool, optional
+            Igual que en el constructor
+        """
+        compiled = cls.__new__(cls)
+        compiled._setup(ea, ra, xs, p_target, y_load, sparse)
+        return compiled
+    
+    def _setup(self, ea, ra, xs, p_target, y_load, sparse):
+        self.ea = np.asarray(ea, dtype=float)
+        self.ra = np.asarray(ra, dtype=float)
+        self.xs = np.asarray(xs, dtype=float)
+        self.p_target = np.asarray(p_target, dtype=float)
+        self.p_scale = np.maximum(1.0, np.abs(self.p_target))
+        self.g_load = float(np.real(y_load))
+        self.b_load = float(np.imag(y_load))
+        
+        n = len(self.ea)
+        self.n_generators = n
+        self.n_variables = 3 * n + 2
+        self.sparse = n >= self.SPARSE_THRESHOLD if sparse is None else bool(sparse)
+        
+        # Posiciones dentro del vector de variables
+        self._ia_real = slice(0, 2 * n, 2)
+        self._ia_imag = slice(1, 2 * n, 2)
+        self._vt_real = 2 * n
+        self._vt_imag = 2 * n + 1
+        self._delta = slice(2 * n + 2, 3 * n + 2)
+        
+        rows = np.arange(n)
+        self._rows_real = 2 * rows
+        self._rows_imag = 2 * rows + 1
+        self._rows_power = 2 * n + 2 + rows
+        self._cols_delta = 2 * n + 2 + rows
+        
+        # Buffers preasignados
+        self._residual = np.empty(self.n_variables)
+        self._jacobian = self._jacobian_template()
+    
+    def _jacobian_template(self):
+        """Jacobiana con las entradas constantes ya escritas"""
+        n = self.n_generators
+        k = np.arange(n)
+        ones = np.ones(n)
+        vt_real = np.full(n, self._vt_real)
+        vt_imag = np.full(n, self._vt_imag)
+        
+        # Entradas constantes: ecuación fasorial EA - VT - Z*IA,
+        # ley de Kirchhoff (suma de IA - Y*VT)
+        const_rows = np.concatenate([
+            2 * k, 2 * k, 2 * k + 1, 2 * k + 1, 2 * k, 2 * k + 1,
+            np.full(n, 2 * n), np.full(n, 2 * n + 1),
+            [2 * n, 2 * n, 2 * n + 1, 2 * n + 1]
+        ])
+        const_cols = np.concatenate([
+            2 * k, 2 * k + 1, 2 * k, 2 * k + 1, vt_real, vt_imag,
+            2 * k, 2 * k + 1,
+            [self._vt_real, self._vt_imag, self._vt_real, self._vt_imag]
+        ])
+        const_values = np.concatenate([
+            -self.ra, self.xs, -self.xs, -self.ra, -ones, -ones,
+            ones, ones,
+            [-self.g_load, self.b_load, -self.b_load, -self.g_load]
+        ])
+        
+        # Entradas que dependen de las variables (en el orden de jacobian())
+        self._var_rows = np.concatenate([
+            self._rows_real, self._rows_imag, self._rows_power, self._rows_power, self._rows_power
+        ])
+        self._var_cols = np.concatenate([
+            self._cols_delta, self._cols_delta, self._rows_real, self._rows_imag, self._cols_delta
+        ])
+        
+        if not self.sparse:
+            jac = np.zeros((self.n_variables, self.n_variables))
+            jac[const_rows, const_cols] = const_values
+            return jac
+        
+        from scipy import sparse
+        rows = np.concatenate([const_rows, self._var_rows])
+        cols = np.concatenate([const_cols, self._var_cols])
+        
+        # Se numeran las entradas para ubicar cada una dentro de los datos CSR
+        order = np.arange(1, len(rows) + 1, dtype=float)
+        shape = (self.n_variables, self.n_variables)
+        jac = sparse.csr_matrix((order, (rows, cols)), shape=shape)
+        position = np.empty(len(rows), dtype=np.intp)
+        position[jac.data.astype(np.intp) - 1] = np.arange(len(rows))
+        
+        jac.data[position[:len(const_rows)]] = const_values
+        jac.data[position[len(const_rows):]] = 0.0
+        self._var_position = position[len(const_rows):]
+        return jac
+    
+    def augmented_ordering(self):
+        """
+        Orden de eliminación por bloques para el sistema aumentado disperso
+        
+        Agrupa, para cada generador, sus tres variables (IA, delta) con sus
+        tres ecuaciones (fasorial y de potencia), y deja al final VT y la ley
+        de Kirchhoff, que acoplan a todos los generadores. Así la
+        factorización produce llenado solo en ese borde y su costo es lineal
+        en el número de generadores.
+        """
+        n = self.n_generators
+        nv = self.n_variables
+        k = np.arange(n)
+        machine_vars = np.stack([2 * k, 2 * k + 1, 2 * n + 2 + k], axis=1)
+        blocks = np.concatenate([machine_vars, nv + machine_vars], axis=1).ravel()
+        border = [self._vt_real, self._vt_imag, nv + self._vt_real, nv + self._vt_imag]
+        return np.concatenate([blocks, border])
+    
+    def residual(self, variables):
+        """
+        Evalúa el sistema de ecuaciones no lineales
+        
+        El arreglo retornado es un buffer interno que se reutiliza en cada
+        llamada; debe copiarse si se necesita conservarlo.
+        """
+        x = np.asarray(variables, dtype=float)
+        out = self._residual
+        
+        ia_real = x[self._ia_real]
+        ia_imag = x[self._ia_imag]
+        vt_real = x[self._vt_real]
+        vt_imag = x[self._vt_imag]
+        delta = x[self._delta]
+        
+        ea_real = self.ea * np.cos(delta)
+        ea_imag = self.ea * np.sin(delta)
+        
+        # Ecuaciones fasoriales: EA - VT - (RA + jXS) IA
+        out[self._ia_real] = ea_real - vt_real - self.ra * ia_real + self.xs * ia_imag
+        out[self._ia_imag] = ea_imag - vt_imag - self.ra * ia_imag - self.xs * ia_real
+        
+        # Ley de Kirchhoff para corrientes
+        out[self._vt_real] = ia_real.sum() - self.g_load * vt_real + self.b_load * vt_imag
+        out[self._vt_imag] = ia_imag.sum() - self.g_load * vt_imag - self.b_load * vt_real
+        
+        # Ecuaciones de potencia normalizadas: P = Re(EA * conj(IA))
+        out[self._delta] = (ea_real * ia_real + ea_imag * ia_imag - self.p_target) / self.p_scale
+        
+        return out
+    
+    def jacobian(self, variables):
+        """
+        Evalúa la jacobiana analítica (filas: ecuaciones, columnas: variables)
+        
+        Solo se actualizan las entradas que dependen de los ángulos; el
+        arreglo (o la matriz CSR) retornado es un buffer interno reutilizado
+        entre llamadas.
+        """
+        x = np.asarray(variables, dtype=float)
+        jac = self._jacobian
+        
+        ia_real = x[self._ia_real]
+        ia_imag = x[self._ia_imag]
+        delta = x[self._delta]
+        
+        ea_cos = self.ea * np.cos(delta)
+        ea_sin = self.ea * np.sin(delta)
+        
+        values = (
+            # Derivadas de las ecuaciones fasoriales respecto a delta
+            -ea_sin,
+            ea_cos,
+            # Derivadas de las ecuaciones de potencia
+            ea_cos / self.p_scale,
+            ea_sin / self.p_scale,
+            (ea_cos * ia_imag - ea_sin * ia_real) / self.p_scale
+        )
+        
+        if self.sparse:
+            jac.data[self._var_position] = np.concatenate(values)
+        else:
+            jac[self._var_rows, self._var_cols] = np.concatenate(values)
+        
+        return jac
+    
+    def sensitivities(self, variables):
+        """
+        Derivadas de la solución respecto a los parámetros del sistema
+        
+        El solucionador entrega un punto estacionario de 0.5*||F||^2 (una
+        raíz exacta cuando las metas de potencia son alcanzables), así que
+        se deriva implícitamente la condición J^T F = 0:
+            
+            (J^T J + S) dx/dθ = -(J^T F_θ + T)
+        
+        con S = suma de F_i por la hessiana de F_i y T = suma de F_i por
+        las derivadas cruzadas d²F_i/dx dθ (ambas nulas en una raíz
+        exacta). La rotación común de los fasores deja la solución
+        indeterminada, por lo que se fija el ángulo de VT. Todo se resuelve
+        con una sola factorización del sistema aumentado
+            
+            [[S, J^T, g], [J, -I, 0], [g^T, 0, 0]] [dx; r; λ] = [-T; -F_θ; 0]
+        
+        para todos los parámetros a la vez (dispersa si la jacobiana lo es).
+        
+        Parameters:
+        -----------
+        variables : array_like
+            Solución del sistema en el orden de las variables
+        
+        Returns:
+        --------
+        ndarray (n_variables, 2N + 2)
+            Columnas: magnitud de EA de cada generador, meta de potencia de
+            cada generador, conductancia y susceptancia de la carga
+        """
+        x = np.asarray(variables, dtype=float)
+        n = self.n_generators
+        nv = self.n_variables
+        n_params = 2 * n + 2
+        f = self.residual(x).copy()
+        jac = self.jacobian(x)
+        
+        ia_real = x[self._ia_real]
+        ia_imag = x[self._ia_imag]
+        vt_real = x[self._vt_real]
+        vt_imag = x[self._vt_imag]
+        delta = x[self._delta]
+        cos, sin = np.cos(delta), np.sin(delta)
+        ea_cos, ea_sin = self.ea * cos, self.ea * sin
+        
+        # Índices de IA (coinciden con las filas de las ecuaciones fasoriales)
+        col_a, col_b, col_d = self._rows_real, self._rows_imag, self._cols_delta
+        k = np.arange(n)
+        f_real, f_imag, f_power = f[col_a], f[col_b], f[self._rows_power]
+        power = ea_cos * ia_real + ea_sin * ia_imag
+        
+        # Derivada de p_scale = max(1, |p_target|)
+        scale_slope = np.where(np.abs(self.p_target) > 1.0, np.sign(self.p_target), 0.0)
+        
+        # Derivadas de F respecto a los parámetros (F_θ)
+        f_theta = np.zeros((nv, n_params))
+        f_theta[col_a, k] = cos
+        f_theta[col_b, k] = sin
+        f_theta[self._rows_power, k] = (cos * ia_real + sin * ia_imag) / self.p_scale
+        f_theta[self._rows_power, n + k] = (-1.0 - f_power * scale_slope) / self.p_scale
+        f_theta[self._vt_real, 2 * n] = -vt_real
+        f_theta[self._vt_imag, 2 * n] = -vt_imag
+        f_theta[self._vt_real, 2 * n + 1] = vt_imag
+        f_theta[self._vt_imag, 2 * n + 1] = -vt_real
+        
+        # T: derivadas cruzadas ponderadas por el residuo
+        w = f_power / self.p_scale
+        t = np.zeros((nv, n_params))
+        t[col_a, k] = w * cos
+        t[col_b, k] = w * sin
+        t[col_d, k] = -f_real * sin + f_imag * cos + w * (cos * ia_imag - sin * ia_real)
+        w_scale = -w * scale_slope / self.p_scale
+        t[col_a, n + k] = w_scale * ea_cos
+        t[col_b, n + k] = w_scale * ea_sin
+        t[col_d, n + k] = w_scale * (ea_cos * ia_imag - ea_sin * ia_real)
+        t[self._vt_real, 2 * n] = -f[self._vt_real]
+        t[self._vt_imag, 2 * n] = -f[self._vt_imag]
+        t[self._vt_imag, 2 * n + 1] = f[self._vt_real]
+        t[self._vt_real, 2 * n + 1] = -f[self._vt_imag]
+        
+        # S: hessianas ponderadas por el residuo (solo acoplan IA y delta de cada generador)
+        s_dd = -f_real * ea_cos - f_imag * ea_sin - w * power
+        s_ad = -w * ea_sin
+        s_bd = w * ea_cos
+        s_rows = np.concatenate([col_d, col_a, col_d, col_b, col_d])
+        s_cols = np.concatenate([col_d, col_d, col_a, col_d, col_b])
+        s_values = np.concatenate([s_dd, s_ad, s_ad, s_bd, s_bd])
+        
+        # Fijación del ángulo de VT (la rotación común no cambia |VT|)
+        vt_mag = max(np.hypot(vt_real, vt_imag), np.finfo(float).tiny)
+        gauge_cols = np.array([self._vt_real, self._vt_imag])
+        gauge_values = np.array([-vt_imag, vt_real]) / vt_mag
+        
+        size = 2 * nv + 1
+        rhs = np.zeros((size, n_params))
+        rhs[:nv] = -t
+        rhs[nv:2 * nv] = -f_theta
+        
+        if self.sparse:
+            from scipy import sparse
+            from scipy.sparse.linalg import splu
+            coo = jac.tocoo()
+            diag = nv + np.arange(nv)
+            rows = np.concatenate([s_rows, coo.col, nv + coo.row, diag, gauge_cols, np.full(2, 2 * nv)])
+            cols = np.concatenate([s_cols, nv + coo.row, coo.col, diag, np.full(2, 2 * nv), gauge_cols])
+            data = np.concatenate([s_values, coo.data, coo.data, -np.ones(nv), gauge_values, gauge_values])
+            augmented = sparse.csc_matrix((data, (rows, cols)), shape=(size, size))
+            solution = splu(augmented).solve(rhs)
+        else:
+            from scipy.linalg import lu_factor, lu_solve
+            augmented = np.zeros((size, size))
+            np.add.at(augmented, (s_rows, s_cols), s_values)
+            augmented[:nv, nv:2 * nv] = jac.T
+            augmented[nv:2 * nv, :nv] = jac
+            augmented[nv:2 * nv, nv:2 * nv] = -np.eye(nv)
+            augmented[gauge_cols, 2 * nv] = gauge_values
+            augmented[2 * nv, gauge_cols] = gauge_values
+            solution = lu_solve(lu_factor(augmented), rhs)
+        return solution[:nv]
 
 def create_equation_system(generator1, generator2, load, vt_initial):
     """
@@ -21,105 +381,165 @@ def create_equation_system(generator1, generator2, load, vt_initial):
     callable
         Función que representa el sistema de ecuaciones
     """
+    return CompiledSystem([generator1, generator2], load).residual
+
+def create_equation_jacobian(generator1, generator2, load):
+    """
+    Crea la matriz jacobiana analítica del sistema de ecuaciones
     
-    def equations(variables):
-        """
-        Sistema de ecuaciones no lineales
-        
-        Variables:
-        - variables[0], variables[1]: Parte real e imaginaria de IA1
-        - variables[2], variables[3]: Parte real e imaginaria de IA2
-        - variables[4], variables[5]: Parte real e imaginaria de VT
-        - variables[6]: Ángulo delta1
-        - variables[7]: Ángulo delta2
-        """
-        # Extraer variables
-        ia1_real, ia1_imag = variables[0], variables[1]
-        ia2_real, ia2_imag = variables[2], variables[3]
-        vt_real, vt_imag = variables[4], variables[5]
-        delta1, delta2 = variables[6], variables[7]
-        
-        # Formar números complejos
-        ia1 = complex(ia1_real, ia1_imag)
-        ia2 = complex(ia2_real, ia2_imag)
-        vt = complex(vt_real, vt_imag)
-        
-        # Calcular EA1 y EA2 usando las curvas de magnetización
-        ea1_mag = generator1.get_ea_from_if(generator1.if_op)
-        ea2_mag = generator2.get_ea_from_if(generator2.if_op)
-        
-        # Convertir a forma compleja usando los ángulos delta
-        ea1 = ea1_mag * np.exp(1j * delta1)
-        ea2 = ea2_mag * np.exp(1j * delta2)
-        
-        # Calcular impedancias
-        z1 = complex(generator1.ra, generator1.xs)
-        z2 = complex(generator2.ra, generator2.xs)
-        
-        # Ecuaciones fasoriales
-        eq1_real = (ea1 - vt - z1 * ia1).real
-        eq1_imag = (ea1 - vt - z1 * ia1).imag
-        
-        eq2_real = (ea2 - vt - z2 * ia2).real
-        eq2_imag = (ea2 - vt - z2 * ia2).imag
-        
-        # Corriente de carga
-        i_load = load.calculate_current(vt)
-        
-        # Ley de Kirchhoff para corrientes
-        eq5_real = (ia1 + ia2 - i_load).real
-        eq5_imag = (ia1 + ia2 - i_load).imag
-        
-        # Ecuaciones de potencia (simplificadas para mejorar convergencia)
-        # Usamos restricciones más suaves para ayudar a la convergencia
-        p1 = (ea1 * np.conj(ia1)).real
-        p2 = (ea2 * np.conj(ia2)).real
+    Las derivadas se obtienen directamente de las ecuaciones fasoriales,
+    de la ley de Kirchhoff y de las restricciones de potencia, de modo que
+    los métodos de scipy no tengan que aproximarlas por diferencias finitas.
+    
+    Parameters:
+    -----------
+    generator1 : SynchronousGenerator
+        Primer generador síncrono
+    generator2 : SynchronousGenerator
+        Segundo generador síncrono
+    load : Load
+        Carga conectada a los generadores
         
-        # En lugar de restricciones estrictas, usamos desviaciones respecto a los valores deseados
-        p1_target = generator1.p_motor * 0.9  # Objetivo ligeramente menor para facilitar convergencia
-        p2_target = generator2.p_motor * 0.9
+    Returns:
+    --------
+    callable
+        Función que retorna la jacobiana 8x8 evaluada en las variables
+    """
+    return CompiledSystem([generator1, generator2], load).jacobian
+
+def check_jacobian(generators, load, variables, eps=1e-6, sparse=None):
+    """
+    Compara la jacobiana analítica con una aproximación por diferencias finitas
+    
+    Parameters:
+    -----------
+    generators : list of SynchronousGenerator
+        Generadores conectados al bus
+    load : Load
+        Carga conectada a los generadores
+    variables : array_like
+        Punto donde se evalúan ambas jacobianas
+    eps : float
+        Paso relativo de las diferencias finitas centradas
+    sparse : bool, optional
+        Forma de la jacobiana analítica (ver CompiledSystem); por defecto
+        según el número de generadores
         
-        eq7 = (p1 - p1_target) / max(1.0, abs(p1_target))  # Normalizado
-        eq8 = (p2 - p2_target) / max(1.0, abs(p2_target))
+    Returns:
+    --------
+    float
+        Máximo error relativo entre ambas jacobianas
+    """
+    variables = np.asarray(variables, dtype=float)
+    compiled = CompiledSystem(generators, load, sparse=sparse)
+    
+    jacobian = compiled.jacobian(variables)
+    analytic = jacobian.toarray() if compiled.sparse else jacobian.copy()
+    numeric = np.zeros_like(analytic)
+    for j in range(len(variables)):
+        h = eps * max(1.0, abs(variables[j]))
+        forward = variables.copy()
+        backward = variables.copy()
+        forward[j] += h
+        backward[j] -= h
+        f_forward = compiled.residual(forward).copy()
+        f_backward = compiled.residual(backward).copy()
+        numeric[:, j] = (f_forward - f_backward) / (2 * h)
+    
+    scale = np.maximum(1.0, np.abs(numeric))
+    return float(np.max(np.abs(analytic - numeric) / scale))
+
+def default_initial_guess(generators):
+    """
+    Estimación inicial heurística a partir de los valores nominales
+    
+    Parameters:
+    -----------
+    generators : list of SynchronousGenerator
+        Generadores conectados al bus
         
-        return [eq1_real, eq1_imag, eq2_real, eq2_imag, eq5_real, eq5_imag, eq7, eq8]
+    Returns:
+    --------
+    ndarray
+        Vector de variables en el orden de CompiledSystem
+    """
+    n = len(generators)
+    
+    # Valor inicial para VT (tensión de fase del primer generador, en voltios)
+    vt_magnitude = generators[0].v_nom / np.sqrt(3)
     
-    return equations
+    guess = np.zeros(3 * n + 2)
+    for k, generator in enumerate(generators):
+        # Corriente nominal aproximada
+        i_nom = generator.s_nom / (3 * vt_magnitude)
+        guess[2 * k] = i_nom * 0.5
+    
+    guess[2 * n] = vt_magnitude
+    
+    # Estimación pequeña para los ángulos de potencia (en radianes)
+    guess[2 * n + 2:] = 0.2
+    return guess
 
-def solve_system(generator1, generator2, load, initial_guess=None):
+def solve_system(generator1, generator2, load, initial_guess=None, engine="newton", full_output=False,
+                 telemetry=None, selector=None):
     """
     Resuelve el sistema de ecuaciones no lineales usando múltiples intentos
     con diferentes configuraciones si es necesario.
+    
+    Parameters:
+    -----------
+    engine : str
+        "newton" usa el Newton-Raphson amortiguado como método principal y
+        la cascada de métodos de scipy solo como respaldo; "scipy" usa
+        únicamente la cascada
+    full_output : bool
+        Si es True retorna el OptimizeResult completo del método que tuvo
+        éxito (con el atributo adicional method) en lugar de solo el vector
+    telemetry : callable, optional
+        Callback que recibe un SolveRecord con los intentos de la cascada
+        (método, tiempo, nfev/njev, norma del residuo, éxito); por defecto
+        el instalado con solvers.telemetry.set_telemetry, si lo hay
+    selector : MethodSelector, optional
+        Ordena la cascada según el historial de la región de parámetros y
+        registra el resultado de cada intento; por defecto el instalado con
+        solvers.method_selector.set_method_selector, si lo hay
+    """
+    return solve_generators(
+        [generator1, generator2], load,
+        initial_guess=initial_guess, engine=engine, full_output=full_output,
+        telemetry=telemetry, selector=selector
+    )
+
+def solve_generators(generators, load, initial_guess=None, engine="newton", full_output=False,
+                     telemetry=None, selector=None):
     """
-    # Valor inicial para VT (en voltios)
-    vt_magnitude = generator1.v_nom / np.sqrt(3)  # Tensión de fase
-    vt_initial = complex(vt_magnitude, 0)
+    Resuelve el sistema de N generadores en paralelo sobre una carga común
     
-    # Crear el sistema de ecuaciones
-    system = create_equation_system(generator1, generator2, load, vt_initial)
+    Parameters:
+    -----------
+    generators : list of SynchronousGenerator
+        Generadores conectados al bus
+    load : Load
+        Carga conectada a los generadores
+    initial_guess : array_like, optional
+        Estimación inicial en el orden de CompiledSystem
+    engine, full_output, telemetry, selector :
+        Igual que en solve_system
+    """
+    # Crear el sistema de ecuaciones (cantidades invariantes precalculadas)
+    compiled = CompiledSystem(generators, load)
+    system = compiled.residual
+    jacobian = compiled.jacobian
+    
+    # Los métodos de MINPACK requieren la jacobiana densa
+    if compiled.sparse:
+        dense_jacobian = lambda variables: compiled.jacobian(variables).toarray()
+    else:
+        dense_jacobian = jacobian
     
     # Si no se proporciona una estimación inicial, creamos una razonable
     if initial_guess is None:
-        # Estimación para corrientes de armadura basada en potencia nominal
-        s1_nom = generator1.s_nom
-        s2_nom = generator2.s_nom
-        v_nom = vt_magnitude
-        
-        # Corriente nominal aproximada
-        i1_nom = s1_nom / (3 * v_nom)
-        i2_nom = s2_nom / (3 * v_nom)
-        
-        # Estimación para ángulos de potencia
-        delta1_est = 0.2  # Estimación pequeña para delta (en radianes)
-        delta2_est = 0.2
-        
-        # Vector de estimación inicial
-        initial_guess = [
-            i1_nom * 0.5, 0,  # IA1 (real, imag)
-            i2_nom * 0.5, 0,  # IA2 (real, imag)
-            vt_magnitude, 0,  # VT (real, imag)
-            delta1_est, delta2_est  # Ángulos delta
-        ]
+        initial_guess = default_initial_guess(generators)
     
     # Lista de métodos y opciones para probar
     methods_to_try = [
@@ -130,24 +550,80 @@ def solve_system(generator1, generator2, load, initial_guess=None):
         ('broyden1', {'tol': 1e-3})
     ]
     
+    if engine == "newton":
+        methods_to_try.insert(0, ('newton', {}))
+    elif engine != "scipy":
+        raise ValueError(f"Motor de solución desconocido: {engine}")
+    
+    # Métodos que aprovechan la jacobiana analítica
+    methods_with_jac = ('hybr', 'lm')
+    
+    # Selector adaptativo: reordena la cascada según el historial de la región
+    if selector is None:
+        selector = get_method_selector()
+    region = None
+    if selector is not None:
+        region = selector.region(generators, load)
+        methods_to_try = selector.order(region, methods_to_try)
+    
+    # Telemetría y selector: sin ninguno de los dos no se mide nada
+    if telemetry is None:
+        telemetry = get_telemetry()
+    measure = telemetry is not None or selector is not None
+    if measure:
+        attempts = []
+        solve_start = attempt_start = perf_counter()
+    
     # Intentar con diferentes métodos hasta que uno funcione
     solution = None
     last_error = None
     
     for method, options in methods_to_try:
+        if measure:
+            label = method_label(method, options)
         try:
-            print(f"Intentando con método: {method}")
-            solution = optimize.root(system, initial_guess, method=method, options=options)
+            if method == 'newton':
+                if compiled.sparse:
+                    options = dict(options, ordering=compiled.augmented_ordering())
+                solution = newton_raphson(system, initial_guess, jacobian, **options)
+            else:
+                # scipy.optimize se importa solo si se llega a la cascada de respaldo
+                from scipy import optimize
+                jac = dense_jacobian if method in methods_with_jac else None
+                solution = optimize.root(system, initial_guess, method=method, jac=jac, options=options)
+            
+            if measure:
+                now = perf_counter()
+                attempts.append(attempt_from_result(label, now - attempt_start, solution))
+                attempt_start = now
             
             if solution.success:
-                print(f"Éxito con método: {method}")
+                if measure:
+                    _report(telemetry, selector, region,
+                            SolveRecord(tuple(attempts), label, now - solve_start, True, len(generators)))
+                if full_output:
+                    solution.method = method
+                    return solution
                 return solution.x
             else:
-                print(f"Método {method} falló: {solution.message}")
                 last_error = solution.message
         except Exception as e:
-            print(f"Error con método {method}: {str(e)}")
             last_error = str(e)
+            if measure:
+                now = perf_counter()
+                attempts.append(SolveAttempt(label, now - attempt_start, 0, 0, 0, float("nan"), False, last_error))
+                attempt_start = now
+    
+    if measure:
+        _report(telemetry, selector, region,
+                SolveRecord(tuple(attempts), None, perf_counter() - solve_start, False, len(generators)))
     
     # Si llegamos aquí, ningún método funcionó
-    raise ValueError(f"No se pudo encontrar una solución después de probar varios métodos. Último error: {last_error}")
\ No newline at end of file
+    raise ValueError(f"No se pudo encontrar una solución después de probar varios métodos. Último error: {last_error}")
+
+def _report(telemetry, selector, region, record):
+    """Entrega el registro de una solución a la telemetría y al selector"""
+    if selector is not None:
+        selector.update(region, record.attempts)
+    if telemetry is not None:
+        telemetry(record)
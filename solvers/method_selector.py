@@ -0,0 +1,227 @@
+import json
+import os
+import threading
+import time
+
+import numpy as np
+
+_selector = None
+
+# Rango del ángulo de carga de region(); las estadísticas guardadas con
+# otro rango (versiones con el ángulo en [0°, 90°]) no son comparables
+ANGLE_RANGE = "signed"
+
+def get_method_selector():
+    """Retorna el selector de métodos global (None si no hay)"""
+    return _selector
+
+def set_method_selector(selector):
+    """
+    Instala un selector de métodos global para solve_generators
+
+    Returns:
+    --------
+    MethodSelector o None
+        El selector anterior
+    """
+    global _selector
+    previous, _selector = _selector, selector
+    return previous
+
+def method_label(method, options):
+    """Nombre de una entrada de la cascada, p. ej. "lm(ftol=1e-05)\""""
+    if not options:
+        return method
+    return f"{method}(" + ",".join(f"{k}={v}" for k, v in sorted(options.items())) + ")"
+
+
+class MethodSelector:
+    """
+    Ordena la cascada de métodos de solve_generators según el historial
+
+    Los sistemas se agrupan en regiones del espacio de parámetros según el
+    ángulo de la impedancia de carga (de -90° capacitiva a 90° inductiva,
+    normalizado a [0, 1]) y la relación de carga (suma de las metas de
+    potencia activa del solucionador / potencia nominal total). Para cada
+    región y método se guardan los intentos, los éxitos y el tiempo
+    acumulado; los métodos se prueban en orden de costo esperado
+    (tiempo medio / probabilidad de éxito). Los métodos que nunca han
+    funcionado en una región después de min_trials intentos pasan al final
+    de la cascada (no se eliminan, para no perder una solución posible).
+
+    update(), merge() y save() se pueden llamar desde varios hilos (p. ej.
+    las sesiones de Streamlit que comparten el selector).
+    """
+
+    def __init__(self, path=None, angle_bins=4, ratio_bins=8, max_ratio=2.0, min_trials=3):
+        """
+        Parameters:
+        -----------
+        path : str, optional
+            Archivo JSON donde se guardan las estadísticas; si existe se
+            cargan al crear el selector
+        angle_bins : int
+            Número de intervalos del ángulo de carga en [-90°, 90°]
+        ratio_bins : int
+            Número de intervalos de la relación de carga en [0, max_ratio]
+        max_ratio : float
+            Relación de carga máxima (valores mayores van al último intervalo)
+        min_trials : int
+            Intentos necesarios antes de relegar un método sin éxitos
+        """
+        self.path = path
+        self.angle_bins = angle_bins
+        self.ratio_bins = ratio_bins
+        self.max_ratio = max_ratio
+        self.min_trials = min_trials
+        self.table = {}  # región -> método -> [intentos, éxitos, tiempo]
+        self._lock = threading.Lock()
+        self._dirty = False  # Estadísticas nuevas desde el último save()
+        self._saved_at = time.monotonic()
+        if path is not None and os.path.exists(path):
+            self.load(path)
+
+    def region(self, generators, load):
+        """
+        Región del espacio de parámetros de un sistema
+
+        Returns:
+        --------
+        str
+            Clave "a{i}_r{j}" con los índices de los intervalos de ángulo
+            de carga y relación de carga
+        """
+        # Ángulo con signo: las cargas capacitivas (X < 0) ocupan la mitad inferior
+        angle = (np.arctan2(load.x_load, load.r_load) / (np.pi / 2) + 1) / 2
+        s_nom = sum(g.s_nom for g in generators)
+        ratio = sum(g.power_target for g in generators) / s_nom if s_nom else 0.0
+        i = int(np.clip(angle * self.angle_bins, 0, self.angle_bins - 1))
+        j = int(np.clip(ratio / self.max_ratio * self.ratio_bins, 0, self.ratio_bins - 1))
+        return f"a{i}_r{j}"
+
+    def _cost(self, stats):
+        """Costo esperado de un método: tiempo medio / probabilidad de éxito"""
+        attempts, successes, elapsed = stats
+        p_success = (successes + 1) / (attempts + 2)
+        return (elapsed / attempts) / p_success
+
+    def order(self, region, methods):
+        """
+        Ordena la cascada para una región
+
+        Parameters:
+        -----------
+        region : str
+            Clave de region()
+        methods : list of tuple
+            Cascada (método, opciones) en el orden por defecto
+
+        Returns:
+        --------
+        list of tuple
+            La misma cascada reordenada. Los métodos sin historial conservan
+            su posición relativa después de los que tienen historial
+        """
+        stats = self.table.get(region)
+        if not stats:
+            return list(methods)
+
+        def key(item):
+            position, (method, options) = item
+            entry = stats.get(method_label(method, options))
+            if entry is None:
+                return (1, 0.0, position)
+            if entry[0] >= self.min_trials and entry[1] == 0:
+                return (2, 0.0, position)
+            return (0, self._cost(entry), position)
+
+        return [entry for _, entry in sorted(enumerate(methods), key=key)]
+
+    def update(self, region, attempts):
+        """
+        Registra los intentos de una solución
+
+        Parameters:
+        -----------
+        region : str
+            Clave de region()
+        attempts : iterable of SolveAttempt
+            Intentos de la cascada (con el nombre de método de method_label)
+        """
+        with self._lock:
+            stats = self.table.setdefault(region, {})
+            for attempt in attempts:
+                entry = stats.setdefault(attempt.method, [0, 0, 0.0])
+                entry[0] += 1
+                entry[1] += bool(attempt.success)
+                entry[2] += attempt.wall_time
+            self._dirty = True
+
+    def merge(self, table):
+        """
+        Suma a las estadísticas las de otra tabla (p. ej. la de un proceso
+        de trabajo), con el formato región -> método -> [intentos, éxitos,
+        tiempo]
+        """
+        with self._lock:
+            for region, stats in table.items():
+                merged = self.table.setdefault(region, {})
+                for method, (attempts, successes, elapsed) in stats.items():
+                    entry = merged.setdefault(method, [0, 0, 0.0])
+                    entry[0] += attempts
+                    entry[1] += successes
+                    entry[2] += elapsed
+            self._dirty = True
+
+    def save(self, path=None):
+        """Guarda las estadísticas en JSON (por defecto en self.path)"""
+        path = path or self.path
+        if path is None:
+            raise ValueError("No se indicó el archivo de estadísticas")
+        with self._lock:
+            data = {
+                "angle_range": ANGLE_RANGE,
+                "angle_bins": self.angle_bins,
+                "ratio_bins": self.ratio_bins,
+                "max_ratio": self.max_ratio,
+                "table": self.table
+            }
+            temporary = path + ".tmp"
+            with open(temporary, "w") as f:
+                json.dump(data, f, indent=1, sort_keys=True)
+            os.replace(temporary, path)
+            self._dirty = False
+            self._saved_at = time.monotonic()
+
+    def save_pending(self, min_interval=0.0):
+        """
+        Guarda las estadísticas solo si cambiaron desde el último guardado
+        y pasaron al menos min_interval segundos desde él
+
+        Returns:
+        --------
+        bool
+            True si se escribió el archivo
+        """
+        if not self._dirty or time.monotonic() - self._saved_at < min_interval:
+            return False
+        self.save()
+        return True
+
+    def load(self, path):
+        """
+        Carga estadísticas guardadas con save()
+
+        Si el archivo usa otra discretización de regiones se ignora (las
+        claves no serían comparables).
+        """
+        with open(path) as f:
+            data = json.load(f)
+        grid = (data.get("angle_range"), data.get("angle_bins"), data.get("ratio_bins"),
+                data.get("max_ratio"))
+        if grid != (ANGLE_RANGE, self.angle_bins, self.ratio_bins, self.max_ratio):
+            return
+        self.table = {
+            region: {method: [int(a), int(s), float(t)] for method, (a, s, t) in stats.items()}
+            for region, stats in data["table"].items()
+        }
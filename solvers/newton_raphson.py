@@ -0,0 +1,198 @@
+import numpy as np
+
+def _sparse_damped_step(jacobian, f, damping, ordering=None):
+    """
+    Paso regularizado con jacobiana dispersa
+
+    Resuelve (J^T J + D) dx = -J^T F mediante el sistema aumentado
+    [[D, J^T], [J, -I]] [dx; r] = [0; -F], que conserva la dispersión de J
+    (formar J^T J acoplaría todas las corrientes a través de la ley de
+    Kirchhoff). Si se da una permutación simétrica (ordering) se factoriza
+    en ese orden con pivoteo diagonal; en otro caso SuperLU elige el orden.
+    """
+    from scipy import sparse
+    from scipy.sparse.linalg import splu
+
+    n_eq, n_var = jacobian.shape
+    size = n_var + n_eq
+    coo = jacobian.tocoo()
+    diag_var = np.arange(n_var)
+    diag_eq = n_var + np.arange(n_eq)
+    rows = np.concatenate([diag_var, coo.col, n_var + coo.row, diag_eq])
+    cols = np.concatenate([diag_var, n_var + coo.row, coo.col, diag_eq])
+    data = np.concatenate([damping, coo.data, coo.data, -np.ones(n_eq)])
+    rhs = np.concatenate([np.zeros(n_var), -f])
+
+    if ordering is None:
+        augmented = sparse.csc_matrix((data, (rows, cols)), shape=(size, size))
+        return splu(augmented).solve(rhs)[:n_var]
+
+    position = np.empty(size, dtype=np.intp)
+    position[ordering] = np.arange(size)
+    augmented = sparse.csc_matrix((data, (position[rows], position[cols])), shape=(size, size))
+    lu = splu(augmented, permc_spec='NATURAL', diag_pivot_thresh=0.0,
+              options=dict(SymmetricMode=True))
+    solution = np.empty(size)
+    solution[ordering] = lu.solve(rhs[ordering])
+    return solution[:n_var]
+
+def newton_raphson(fun, x0, jac, tol=1e-8, xtol=1e-10, ftol=1.49e-8, gtol=1e-8, max_iter=50,
+                   armijo=1e-4, min_step=0.25, mu_min=1e-6, mu_max=1e8,
+                   ordering=None):
+    """
+    Resuelve F(x) = 0 con el método de Newton-Raphson amortiguado
+
+    El paso de Newton se regulariza al estilo Levenberg-Marquardt,
+    (J^T J + mu*diag(J^T J)) dx = -J^T F, porque la jacobiana del sistema de
+    generadores es singular en la solución (invariancia ante una rotación
+    común de los fasores) y porque las metas de potencia pueden no tener
+    raíz exacta. Con mu pequeño el paso coincide con el de Newton; mu crece
+    solo cuando la búsqueda lineal de Armijo sobre 0.5*||F||^2 falla.
+
+    Cuando el residuo no se anula (mínimo de mínimos cuadrados), un paso o
+    una reducción prevista pequeños solo cuentan como convergencia si el
+    punto es estacionario, es decir, si el coseno entre F y cada columna
+    de J, |J_j^T F| / (||J_j|| ||F||), es menor que gtol (criterio de
+    MINPACK). En otro caso se sigue iterando; si ya no se puede avanzar el
+    resultado se marca como estancado (status 5, sin éxito).
+
+    Parameters:
+    -----------
+    fun : callable
+        Función del sistema, fun(x) -> array de residuos
+    x0 : array_like
+        Estimación inicial
+    jac : callable
+        Jacobiana analítica, jac(x) -> matriz (ecuaciones x variables),
+        densa o dispersa (scipy.sparse)
+    tol : float
+        Tolerancia sobre la norma del residuo
+    xtol : float
+        Tolerancia relativa sobre el tamaño del paso
+    ftol : float
+        Tolerancia sobre la reducción relativa del residuo que predice el
+        modelo lineal (convergencia a un mínimo de mínimos cuadrados)
+    gtol : float
+        Tolerancia sobre el gradiente escalado ||J^T F|| que exigen los
+        criterios de xtol y ftol
+    max_iter : int
+        Número máximo de iteraciones
+    armijo : float
+        Constante de decrecimiento suficiente de la búsqueda lineal
+    min_step : float
+        Factor de amortiguamiento mínimo antes de aumentar la regularización
+    mu_min, mu_max : float
+        Límites del parámetro de regularización
+    ordering : array_like, optional
+        Permutación simétrica del sistema aumentado (tamaño variables +
+        ecuaciones) usada cuando la jacobiana es dispersa; agrupar las
+        variables acopladas mantiene el llenado lineal en su tamaño
+
+    Returns:
+    --------
+    OptimizeResult
+        Resultado con el mismo formato que scipy.optimize.root, más el
+        historial de la norma del residuo por iteración (residual_history).
+        status: 0 máximo de iteraciones, 1 residuo < tol, 2 paso < xtol,
+        3 reducción < ftol (2 y 3 en un punto estacionario), 4 búsqueda
+        lineal fallida, 5 estancado con gradiente no despreciable
+    """
+    x = np.array(x0, dtype=float)
+    f = np.array(fun(x), dtype=float)
+    nfev, njev = 1, 0
+    norm2 = float(f @ f)
+    history = [np.sqrt(norm2)]
+    mu = mu_min
+
+    status, message = 0, "Se alcanzó el número máximo de iteraciones"
+    nit = 0
+
+    while True:
+        if history[-1] <= tol:
+            status, message = 1, "La norma del residuo es menor que la tolerancia"
+            break
+        if nit >= max_iter:
+            break
+        nit += 1
+
+        jacobian = jac(x)
+        njev += 1
+        gradient = jacobian.T @ f
+        if not isinstance(jacobian, np.ndarray):
+            # Jacobiana dispersa (scipy.sparse)
+            normal = None
+            scaling = np.asarray(jacobian.multiply(jacobian).sum(axis=0)).ravel()
+        else:
+            normal = jacobian.T @ jacobian
+            scaling = np.diag(normal)
+        scaling = np.maximum(scaling, np.finfo(float).tiny)
+        # Coseno entre F y cada columna de J (0 en un mínimo de mínimos cuadrados)
+        stationary = np.max(np.abs(gradient) / np.sqrt(scaling * norm2)) <= gtol
+
+        accepted = stalled = False
+        while mu <= mu_max:
+            if normal is None:
+                step = _sparse_damped_step(jacobian, f, mu * scaling, ordering)
+            else:
+                step = np.linalg.solve(normal + mu * np.diag(scaling), -gradient)
+
+            # Reducción que predice el modelo lineal para el paso completo
+            predicted = f + jacobian @ step
+            decrease = norm2 - float(predicted @ predicted)
+            if decrease <= ftol * norm2:
+                if stationary:
+                    break
+                # Lejos del mínimo: se intenta el paso de todos modos
+                stalled = True
+
+            # Búsqueda lineal con retroceso (Armijo)
+            slope = float(gradient @ step)
+            t = 1.0
+            while t >= min_step:
+                x_trial = x + t * step
+                f_trial = np.array(fun(x_trial), dtype=float)
+                nfev += 1
+                norm2_trial = float(f_trial @ f_trial)
+                if norm2_trial <= norm2 + 2 * armijo * t * slope:
+                    accepted = True
+                    break
+                t *= 0.5
+
+            if accepted:
+                # Actualización de Nielsen según la razón reducción real/predicha
+                rho = (norm2 - norm2_trial) / decrease if decrease > 0 else 0.0
+                mu = max(mu * max(1 / 3, 1 - (2 * rho - 1) ** 3), mu_min)
+                break
+            if stalled:
+                # Aumentar mu solo reduciría más la reducción prevista
+                break
+            mu *= 10
+
+        if not accepted:
+            if stalled:
+                status, message = 5, "El método se estancó con un gradiente mayor que gtol"
+            elif mu > mu_max:
+                status, message = 4, "La búsqueda lineal no logró reducir el residuo"
+            else:
+                status, message = 3, "La reducción relativa del residuo es menor que ftol"
+            break
+
+        x, f, norm2 = x_trial, f_trial, norm2_trial
+        history.append(np.sqrt(norm2))
+
+        if stationary and t * np.linalg.norm(step) <= xtol * (np.linalg.norm(x) + xtol):
+            status, message = 2, "El tamaño del paso es menor que xtol"
+            break
+
+    from scipy.optimize import OptimizeResult
+    return OptimizeResult(
+        x=x,
+        fun=f,
+        success=status in (1, 2, 3),
+        status=status,
+        message=message,
+        nit=nit,
+        nfev=nfev,
+        njev=njev,
+        residual_history=np.array(history)
+    )
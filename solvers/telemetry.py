@@ -0,0 +1,211 @@
+import logging
+from collections import namedtuple
+from contextlib import contextmanager
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+# Un intento de un método dentro de la cascada de solve_generators
+SolveAttempt = namedtuple(
+    "SolveAttempt",
+    ["method", "wall_time", "nfev", "njev", "nit", "residual_norm", "success", "message"]
+)
+
+# Una llamada completa a solve_generators
+SolveRecord = namedtuple(
+    "SolveRecord",
+    ["attempts", "method", "wall_time", "success", "n_generators"]
+)
+
+# Bordes por defecto de los histogramas de tiempo (1 µs a 10 s, escala logarítmica)
+TIME_BINS = np.logspace(-6, 1, 43)
+
+_callback = None
+
+def get_telemetry():
+    """Retorna el callback de telemetría global (None si está desactivada)"""
+    return _callback
+
+def set_telemetry(callback):
+    """
+    Instala un callback de telemetría global
+
+    Parameters:
+    -----------
+    callback : callable o None
+        Se llama como callback(record) con un SolveRecord al terminar cada
+        llamada a solve_generators; None desactiva la telemetría
+
+    Returns:
+    --------
+    callable o None
+        El callback anterior
+    """
+    global _callback
+    previous, _callback = _callback, callback
+    return previous
+
+@contextmanager
+def telemetry(callback=None):
+    """
+    Activa la telemetría dentro de un bloque with
+
+    Si no se indica un callback se crea un TelemetryCollector, que es el
+    valor entregado por el with.
+    """
+    if callback is None:
+        callback = TelemetryCollector()
+    previous = set_telemetry(callback)
+    try:
+        yield callback
+    finally:
+        set_telemetry(previous)
+
+def attempt_from_result(method, wall_time, solution):
+    """Construye un SolveAttempt a partir del OptimizeResult de un método"""
+    fun = solution.get("fun")
+    residual_norm = float(np.linalg.norm(fun)) if fun is not None else float("nan")
+    return SolveAttempt(
+        method,
+        wall_time,
+        int(solution.get("nfev", 0)),
+        int(solution.get("njev", 0)),
+        int(solution.get("nit", 0)),
+        residual_norm,
+        bool(solution.success),
+        str(solution.get("message", ""))
+    )
+
+def log_record(record):
+    """
+    Callback que envía cada solución al módulo logging (nivel DEBUG)
+
+    Reemplaza los mensajes que antes se imprimían en la salida estándar.
+    """
+    for attempt in record.attempts:
+        if attempt.success:
+            logger.debug("Éxito con método %s (%.3g ms, nfev=%d)",
+                         attempt.method, attempt.wall_time * 1e3, attempt.nfev)
+        else:
+            logger.debug("Método %s falló: %s", attempt.method, attempt.message)
+
+
+class TelemetryCollector:
+    """
+    Acumula métricas de las soluciones: intentos, éxitos, tiempo y número
+    de evaluaciones por método
+
+    Los agregados por método se actualizan en cada llamada; los registros
+    individuales se guardan (hasta max_records) para calcular histogramas.
+    """
+
+    def __init__(self, keep_records=True, max_records=100000):
+        """
+        Parameters:
+        -----------
+        keep_records : bool
+            Si es True guarda cada SolveRecord
+        max_records : int
+            Número máximo de registros guardados (los más antiguos se descartan)
+        """
+        self.keep_records = keep_records
+        self.max_records = max_records
+        self.clear()
+
+    def clear(self):
+        """Reinicia los contadores y los registros"""
+        self.records = []
+        self.solves = 0
+        self.failures = 0
+        self.wall_time = 0.0
+        self.methods = {}
+
+    def __call__(self, record):
+        self.solves += 1
+        self.failures += not record.success
+        self.wall_time += record.wall_time
+
+        for attempt in record.attempts:
+            stats = self.methods.get(attempt.method)
+            if stats is None:
+                stats = self.methods[attempt.method] = {
+                    "attempts": 0, "successes": 0, "wins": 0,
+                    "wall_time": 0.0, "nfev": 0, "njev": 0
+                }
+            stats["attempts"] += 1
+            stats["successes"] += attempt.success
+            stats["wall_time"] += attempt.wall_time
+            stats["nfev"] += attempt.nfev
+            stats["njev"] += attempt.njev
+        if record.method is not None:
+            self.methods[record.method]["wins"] += 1
+
+        if self.keep_records:
+            self.records.append(record)
+            if len(self.records) > self.max_records:
+                del self.records[:len(self.records) - self.max_records]
+
+    def summary(self):
+        """
+        Resumen por método
+
+        Returns:
+        --------
+        dict
+            Método -> intentos, éxitos, veces que resolvió el sistema (wins),
+            fracción de victorias, tiempo medio por intento y nfev/njev medios
+        """
+        summary = {}
+        for method, stats in self.methods.items():
+            attempts = stats["attempts"]
+            summary[method] = dict(
+                stats,
+                win_rate=stats["wins"] / self.solves if self.solves else 0.0,
+                mean_time=stats["wall_time"] / attempts,
+                mean_nfev=stats["nfev"] / attempts,
+                mean_njev=stats["njev"] / attempts
+            )
+        return summary
+
+    def values(self, field="wall_time", method=None):
+        """
+        Arreglo con un campo de los registros guardados
+
+        Parameters:
+        -----------
+        field : str
+            Campo de SolveAttempt ("wall_time", "nfev", "residual_norm", ...)
+            o, con method=None, "wall_time" de la solución completa
+        method : str, optional
+            Si se indica, toma los intentos de ese método
+        """
+        if method is None and field == "wall_time":
+            return np.array([record.wall_time for record in self.records])
+        return np.array([
+            getattr(attempt, field)
+            for record in self.records
+            for attempt in record.attempts
+            if method is None or attempt.method == method
+        ], dtype=float)
+
+    def histogram(self, field="wall_time", method=None, bins=None):
+        """
+        Histograma de un campo de los registros guardados
+
+        Parameters:
+        -----------
+        field, method :
+            Igual que en values()
+        bins : int o array_like, optional
+            Bordes o número de intervalos; por defecto TIME_BINS para los
+            tiempos y 20 intervalos para los demás campos
+
+        Returns:
+        --------
+        counts, edges : ndarray
+            Resultado de np.histogram
+        """
+        if bins is None:
+            bins = TIME_BINS if field == "wall_time" else 20
+        return np.histogram(self.values(field, method), bins=bins)
@@ -0,0 +1,275 @@
+import os
+
+import numpy as np
+from models.results_store import ResultsStore
+
+FORMATS = ("parquet", "arrow", "csv")
+
+_SUFFIXES = {
+    ".parquet": "parquet",
+    ".pq": "parquet",
+    ".arrow": "arrow",
+    ".feather": "arrow",
+    ".ipc": "arrow",
+    ".csv": "csv"
+}
+
+def _import_pyarrow():
+    """Importa pyarrow solo cuando se necesita (dependencia opcional)"""
+    try:
+        import pyarrow
+        import pyarrow.ipc
+        import pyarrow.parquet
+    except ImportError:
+        return None
+    return pyarrow
+
+def export_fields(n_generators):
+    """
+    Cantidades exportadas, en orden: primero las de cada generador (gK_*) y
+    luego las del sistema. Los alias de ResultsStore (gK_il, gK_tap,
+    gK_vt, gK_vf) no se repiten porque son iguales a otra columna.
+
+    Returns:
+    --------
+    list of tuple
+        (clave, dtype) de cada cantidad
+    """
+    store = ResultsStore(0, n_generators)
+    fields = []
+    for k in range(1, n_generators + 1):
+        fields += [(f"g{k}_{name}", column.dtype) for name, column in store.generator_columns.items()]
+    fields += [(name, column.dtype) for name, column in store.system_columns.items()]
+    return fields
+
+def _column_names(fields):
+    """Nombres de las columnas planas (las complejas se dividen en _re e _im)"""
+    names = []
+    for key, dtype in fields:
+        if np.issubdtype(dtype, np.complexfloating):
+            names += [key + "_re", key + "_im"]
+        else:
+            names.append(key)
+    return names
+
+def _count_generators(batch):
+    """Número de generadores de un lote (ResultsStore, arreglo estructurado o dict)"""
+    if isinstance(batch, ResultsStore):
+        return batch.n_generators
+    keys = batch.dtype.names if isinstance(batch, np.ndarray) else batch.keys()
+    n = 0
+    while f"g{n + 1}_p" in keys:
+        n += 1
+    return n
+
+
+class ResultsWriter:
+    """
+    Exporta resultados por bloques a Parquet, Arrow IPC o CSV
+
+    Cada bloque se escribe en cuanto llega (un grupo de filas de Parquet,
+    un lote de registros de Arrow o un tramo del CSV), por lo que la
+    memoria usada no depende del número total de puntos. Las columnas
+    conservan su tipo (float64, int, bool); las cantidades complejas se
+    guardan como dos columnas float64 con sufijos _re e _im.
+
+    pyarrow se importa solo al abrir un archivo Parquet o Arrow. Con
+    format="auto" se usa Parquet si está disponible y, si no, CSV.
+    """
+
+    def __init__(self, path, format="auto", row_group_size=65536, compression="zstd"):
+        """
+        Parameters:
+        -----------
+        path : str
+            Archivo de salida (con format="auto" se cambia la extensión a
+            .csv si no hay pyarrow)
+        format : str
+            "parquet", "arrow", "csv" o "auto" (según la extensión; Parquet
+            si no es reconocida)
+        row_group_size : int
+            Filas máximas por grupo de filas / lote
+        compression : str
+            Compresión de Parquet (se ignora en los demás formatos)
+        """
+        if format == "auto":
+            format = _SUFFIXES.get(os.path.splitext(path)[1].lower(), "parquet")
+            if format != "csv" and _import_pyarrow() is None:
+                format = "csv"
+                path = os.path.splitext(path)[0] + ".csv"
+        if format not in FORMATS:
+            raise ValueError(f"Formato desconocido: {format}")
+        if format != "csv" and _import_pyarrow() is None:
+            raise ImportError(f"Se necesita pyarrow para exportar en formato {format}")
+
+        self.path = path
+        self.format = format
+        self.row_group_size = int(row_group_size)
+        self.compression = compression
+        self.rows_written = 0
+
+        self._fields = None
+        self._writer = None
+        self._n_generators = None
+        self._buffer = None  # ResultsStore reutilizado para los diccionarios
+        self._buffered = 0
+        self._leading_failures = 0
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def _open(self, n_generators):
+        """Crea el archivo con el esquema de n_generators generadores"""
+        self._n_generators = n_generators
+        self._fields = export_fields(n_generators)
+        names = _column_names(self._fields)
+        self._open_file(names)
+
+        # Puntos fallidos recibidos antes de conocer el esquema
+        failures, self._leading_failures = self._leading_failures, 0
+        for _ in range(failures):
+            self._append(None)
+
+    def _open_file(self, names):
+        """Abre el archivo de salida y escribe el encabezado o el esquema"""
+        if self.format == "csv":
+            self._writer = open(self.path, "w", newline="")
+            self._writer.write(",".join(names) + "\n")
+            return
+
+        pa = _import_pyarrow()
+        types = []
+        for _, dtype in self._fields:
+            if np.issubdtype(dtype, np.complexfloating):
+                types += [pa.float64(), pa.float64()]
+            else:
+                types.append(pa.from_numpy_dtype(dtype))
+        self._schema = pa.schema(list(zip(names, types)))
+        if self.format == "parquet":
+            self._writer = pa.parquet.ParquetWriter(self.path, self._schema, compression=self.compression)
+        else:
+            self._sink = pa.OSFile(self.path, "wb")
+            self._writer = pa.ipc.new_file(self._sink, self._schema)
+
+    def _columns(self, batch, rows):
+        """Columnas planas de las filas rows de un lote"""
+        columns = []
+        for key, dtype in self._fields:
+            values = batch[key][rows]
+            if np.issubdtype(dtype, np.complexfloating):
+                columns += [values.real, values.imag]
+            else:
+                columns.append(values)
+        return columns
+
+    def _write_rows(self, batch, rows):
+        columns = self._columns(batch, rows)
+        if self.format == "csv":
+            table = np.column_stack([c.astype(float) for c in columns])
+            np.savetxt(self._writer, table, delimiter=",", fmt="%.17g")
+        else:
+            pa = _import_pyarrow()
+            record_batch = pa.RecordBatch.from_arrays(
+                [pa.array(np.ascontiguousarray(c)) for c in columns], schema=self._schema
+            )
+            self._writer.write_batch(record_batch)
+        self.rows_written += len(columns[0])
+
+    def write(self, batch):
+        """
+        Escribe un lote de puntos
+
+        Parameters:
+        -----------
+        batch : ResultsStore, ndarray estructurado o dict
+            Resultados de solve_batch/sweep (ResultsStore o arreglo
+            estructurado de batch_result_dtype) o el diccionario de un
+            solo punto de solve(). Los diccionarios se acumulan y se
+            escriben cada row_group_size puntos
+        """
+        if isinstance(batch, dict):
+            self.write_point(batch)
+            return
+        if self._writer is None:
+            self._open(_count_generators(batch))
+        if isinstance(batch, np.ndarray):
+            batch = batch.reshape(-1)
+        self._flush()
+        for start in range(0, len(batch), self.row_group_size):
+            self._write_rows(batch, slice(start, start + self.row_group_size))
+
+    def write_point(self, results):
+        """Agrega el diccionario de resultados de un punto (None si no convergió)"""
+        if self._writer is None:
+            if results is None:
+                # Aún no se conoce el número de generadores
+                self._leading_failures += 1
+                return
+            self._open(_count_generators(results))
+        self._append(results)
+
+    def _append(self, results):
+        if self._buffer is None:
+            self._buffer = ResultsStore(self.row_group_size, self._n_generators)
+        self._buffer.write(self._buffered, results)
+        self._buffered += 1
+        if self._buffered == self.row_group_size:
+            self._flush()
+
+    def write_points(self, points):
+        """Escribe los resultados de un iterable de diccionarios (p. ej. SweepRunner.imap)"""
+        for point in points:
+            if isinstance(point, tuple):
+                point = point[1]  # (índice, resultados)
+            self.write_point(point)
+
+    def _flush(self):
+        # El contenedor intermedio se reutiliza: cada fila se sobrescribe completa
+        if self._buffered:
+            self._write_rows(self._buffer, slice(0, self._buffered))
+            self._buffered = 0
+
+    def close(self):
+        """Escribe los puntos pendientes y cierra el archivo"""
+        if self._writer is None:
+            if self._leading_failures:
+                raise ValueError("Ningún punto convergió; no se puede determinar el esquema")
+            return
+        self._flush()
+        self._writer.close()
+        if self.format == "arrow":
+            self._sink.close()
+        self._writer = None
+
+def export_results(batches, path, format="auto", row_group_size=65536, compression="zstd"):
+    """
+    Exporta una secuencia de lotes o de resultados puntuales a un archivo
+
+    Parameters:
+    -----------
+    batches : iterable
+        ResultsStore, arreglos estructurados, diccionarios de solve() o
+        tuplas (índice, diccionario) de SweepRunner.imap; también se
+        acepta un solo ResultsStore o arreglo estructurado
+    path : str
+        Archivo de salida
+    format, row_group_size, compression :
+        Igual que en ResultsWriter
+
+    Returns:
+    --------
+    tuple
+        (ruta final, formato usado, número de filas escritas)
+    """
+    if isinstance(batches, (ResultsStore, np.ndarray, dict)):
+        batches = [batches]
+    with ResultsWriter(path, format, row_group_size, compression) as writer:
+        for batch in batches:
+            if batch is None or isinstance(batch, tuple):
+                writer.write_points([batch])
+            else:
+                writer.write(batch)
+    return writer.path, writer.format, writer.rows_written